@@ -18,16 +18,7 @@ if len(orgs) > 0:
 else:
     print("Something went wrong with getting org info")
     exit(1)
-per_page = 100
-response = sdk.repos.get(org_slug, per_page=per_page)
-next_page = response.get("nextPage")
-repos = response.get("results")
-while next_page is not None and next_page != 0:
-    response = sdk.repos.get(org_slug, per_page=per_page, page=next_page)
-    next_page = response.get("nextPage")
-    repos.extend(response.get("results"))
-    if len(response.get("results", [])) == 0:
-        break
+repos = list(sdk.repos.iter_repos(org_slug, page_size=100))
 
 # repos = repos[:20]
 head_full_scans_ids = []
@@ -1,5 +1,7 @@
 import logging
 from urllib.parse import urlencode
+from typing import Iterator, Optional
+from socketdev.core.pagination import Paginator
 
 log = logging.getLogger("socketdev")
 
@@ -31,3 +33,35 @@ class Alerts:
         log.error(f"Error getting alerts: {response.status_code}")
         log.error(response.text)
         return {}
+
+    def iter_alerts(
+        self,
+        org_slug: str,
+        page_size: Optional[int] = None,
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+        **query_params,
+    ) -> Iterator[dict]:
+        """
+        Iterate over the alerts of an organization, following the cursor automatically.
+
+        Args:
+            org_slug: Organization slug
+            page_size: Alerts requested per page, sent as ``limit``; the server default if None
+            max_items: Stop after this many alerts
+            prefetch: Fetch the next page in the background while the current one is consumed
+            **query_params: Additional query parameters for filtering
+
+        Returns:
+            Iterator over alerts
+        """
+        return iter(
+            Paginator(
+                lambda params: self.get(org_slug, **params),
+                query_params,
+                page_size,
+                max_items,
+                prefetch,
+                page_size_param="limit",
+            )
+        )
@@ -1,5 +1,7 @@
 import logging
 import json
+from typing import Iterator, Optional
+from socketdev.core.pagination import Paginator
 
 log = logging.getLogger("socketdev")
 
@@ -54,6 +56,24 @@ class ApiTokens:
         log.error(response.text)
         return {}
 
+    def iter_tokens(
+        self, org_slug: str, page_size: Optional[int] = None, max_items: Optional[int] = None, prefetch: bool = True, **kwargs
+    ) -> Iterator[dict]:
+        """
+        Iterate over the API tokens of an organization, following pagination automatically.
+
+        Args:
+            org_slug: Organization slug
+            page_size: Tokens requested per page; the server default if None
+            max_items: Stop after this many tokens
+            prefetch: Fetch the next page in the background while the current one is consumed
+            **kwargs: Additional query parameters
+
+        Returns:
+            Iterator over API tokens
+        """
+        return iter(Paginator(lambda params: self.list(org_slug, **params), kwargs, page_size, max_items, prefetch))
+
     def update(self, org_slug: str, token_id: str = None, **kwargs) -> dict:
         """
         Update an API token.
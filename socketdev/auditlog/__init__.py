@@ -1,4 +1,6 @@
 import logging
+from typing import Iterator, Optional
+from socketdev.core.pagination import Paginator
 
 log = logging.getLogger("socketdev")
 
@@ -28,3 +30,30 @@ class AuditLog:
         log.error(f"Error getting audit log: {response.status_code}")
         log.error(response.text)
         return {"results": []}
+
+    def iter_events(
+        self, org_slug: str, page_size: Optional[int] = None, max_items: Optional[int] = None, prefetch: bool = True, **kwargs
+    ) -> Iterator[dict]:
+        """
+        Iterate over audit log entries, following pagination automatically.
+
+        Args:
+            org_slug: Organization slug
+            page_size: Entries requested per page, sent as ``limit``; the server default if None
+            max_items: Stop after this many entries
+            prefetch: Fetch the next page in the background while the current one is consumed
+            **kwargs: Additional query parameters
+
+        Returns:
+            Iterator over audit log entries
+        """
+        return iter(
+            Paginator(
+                lambda params: self.get(org_slug, **params),
+                kwargs,
+                page_size,
+                max_items,
+                prefetch,
+                page_size_param="limit",
+            )
+        )
@@ -0,0 +1,237 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from socketdev.core import issues
+from socketdev.core.cache import default_cache_dir
+from socketdev.log import log
+
+SCHEMA_VERSION = 1
+DEFAULT_LANGUAGE = "en-US"
+# Keeps each IN (...) lookup under SQLite's bound-parameter limit.
+_QUERY_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS alert_types (
+    language TEXT NOT NULL,
+    type TEXT NOT NULL,
+    metadata TEXT,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (language, type)
+) WITHOUT ROWID;
+"""
+
+
+@dataclass
+class AlertTypeCacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    requests: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self):
+        data = asdict(self)
+        data["hits"] = self.hits
+        data["hit_rate"] = self.hit_rate
+        return data
+
+
+def _metadata_by_type(response: Any) -> Dict[str, dict]:
+    """Key an ``AlertTypes.get`` response by alert type."""
+    if isinstance(response, Mapping):
+        for key in ("alertTypes", "results", "data"):
+            if isinstance(response.get(key), (list, Mapping)):
+                return _metadata_by_type(response[key])
+        return {key: value for key, value in response.items() if isinstance(value, Mapping)}
+    records = {}
+    for record in response or ():
+        if isinstance(record, Mapping):
+            alert_type = record.get("type") or record.get("alertType") or record.get("id")
+            if alert_type:
+                records[alert_type] = record
+    return records
+
+
+def builtin_title(alert_type: str) -> Optional[str]:
+    """Return the title bundled in ``socketdev.core.issues``, if the type is known there."""
+    if alert_type == "AllIssues" or alert_type not in issues.__all__:
+        return None
+    return getattr(issues, alert_type)().title
+
+
+class AlertTypeCache:
+    """
+    Alert type metadata cached in memory and in a SQLite file shared between processes.
+
+    ``get_many`` answers from memory, then from disk, and sends the types still missing
+    to ``AlertTypes.get`` in a single request. Entries are keyed by alert type and
+    language and expire after ``ttl`` seconds. Types the API does not know are
+    remembered for ``negative_ttl`` so they are not requested on every lookup.
+    Concurrent lookups in one process share a fetch; separate processes share the file.
+
+    ``titles`` renders alert titles for a whole scan from one lookup of its unique
+    types, falling back to the titles bundled in ``socketdev.core.issues``.
+    """
+
+    def __init__(
+        self,
+        alerttypes=None,
+        path: Optional[str] = None,
+        ttl: float = 7 * 24 * 3600,
+        negative_ttl: float = 3600,
+    ):
+        self.alerttypes = alerttypes
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.path = path or os.path.join(default_cache_dir(), "alert-types.sqlite3")
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.stats = AlertTypeCacheStats()
+        self._memory: Dict[Tuple[str, str], Tuple[float, Optional[dict]]] = {}
+        self._lock = threading.RLock()
+        self._fetch_lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version not in (0, SCHEMA_VERSION):
+                # A cache from another format is simply refetched.
+                self._conn.execute("DROP TABLE IF EXISTS alert_types")
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _fresh(self, fetched_at: float, metadata: Optional[dict], now: float) -> bool:
+        return now - fetched_at <= (self.ttl if metadata is not None else self.negative_ttl)
+
+    def get_many(self, alert_types: Iterable[str], language: str = DEFAULT_LANGUAGE) -> Dict[str, Optional[dict]]:
+        """
+        Return metadata for each alert type, fetching only what is not cached
+        :param alert_types: Alert types such as "envVars"; duplicates are looked up once
+        :param language: Language of the metadata
+        :return: Dict of alert type to metadata, None where none is available
+        """
+        types = list(dict.fromkeys(alert_type for alert_type in alert_types if alert_type))
+        found = self._from_memory(types, language)
+        missing = [alert_type for alert_type in types if alert_type not in found]
+        if missing:
+            found.update(self._from_disk(missing, language))
+            missing = [alert_type for alert_type in missing if alert_type not in found]
+        if missing and self.alerttypes is not None:
+            with self._fetch_lock:
+                # Another thread may have fetched these while this one waited.
+                found.update(self._from_memory(missing, language))
+                missing = [alert_type for alert_type in missing if alert_type not in found]
+                if missing:
+                    found.update(self._fetch(missing, language))
+        with self._lock:
+            self.stats.misses += sum(1 for alert_type in types if alert_type not in found)
+        return {alert_type: found.get(alert_type) for alert_type in types}
+
+    def get(self, alert_type: str, language: str = DEFAULT_LANGUAGE) -> Optional[dict]:
+        """Return metadata for one alert type, or None."""
+        return self.get_many([alert_type], language).get(alert_type)
+
+    def title(self, alert_type: str, language: str = DEFAULT_LANGUAGE) -> str:
+        """Return the display title of an alert type."""
+        return self.titles([{"type": alert_type}], language)[0]
+
+    def titles(self, alerts: Iterable[Any], language: str = DEFAULT_LANGUAGE) -> List[str]:
+        """
+        Render the title of every alert with one cache lookup per unique type
+        :param alerts: Alert dicts or ``SocketAlert`` objects; only ``type`` is read
+        :param language: Language of the titles
+        :return: Titles in input order. Unknown types fall back to the bundled title, then the type itself
+        """
+        types = [alert["type"] for alert in alerts]
+        rendered = {}
+        for alert_type, metadata in self.get_many(set(types), language).items():
+            title = metadata.get("title") if metadata else None
+            rendered[alert_type] = title or builtin_title(alert_type) or alert_type
+        return [rendered.get(alert_type) or alert_type for alert_type in types]
+
+    def _from_memory(self, types: List[str], language: str) -> Dict[str, Optional[dict]]:
+        now = time.time()
+        found = {}
+        with self._lock:
+            for alert_type in types:
+                entry = self._memory.get((language, alert_type))
+                if entry is not None and self._fresh(entry[0], entry[1], now):
+                    found[alert_type] = entry[1]
+            self.stats.memory_hits += len(found)
+        return found
+
+    def _from_disk(self, types: List[str], language: str) -> Dict[str, Optional[dict]]:
+        now = time.time()
+        found = {}
+        with self._lock:
+            for start in range(0, len(types), _QUERY_CHUNK):
+                chunk = types[start : start + _QUERY_CHUNK]
+                rows = self._conn.execute(
+                    "SELECT type, metadata, fetched_at FROM alert_types WHERE language = ? AND type IN ("
+                    + ",".join("?" * len(chunk))
+                    + ")",
+                    [language, *chunk],
+                ).fetchall()
+                for alert_type, raw, fetched_at in rows:
+                    metadata = json.loads(raw) if raw is not None else None
+                    if self._fresh(fetched_at, metadata, now):
+                        self._memory[(language, alert_type)] = (fetched_at, metadata)
+                        found[alert_type] = metadata
+            self.stats.disk_hits += len(found)
+        return found
+
+    def _fetch(self, types: List[str], language: str) -> Dict[str, Optional[dict]]:
+        with self._lock:
+            self.stats.requests += 1
+        try:
+            response = self.alerttypes.get(types, language=language)
+        except Exception as error:
+            log.error(f"Failed to fetch metadata for {len(types)} alert types: {error}")
+            return {}
+        if not response:
+            # The request failed; nothing is cached so the types are retried next time.
+            return {}
+        records = _metadata_by_type(response)
+        fetched_at = time.time()
+        found = {alert_type: records.get(alert_type) for alert_type in types}
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO alert_types (language, type, metadata, fetched_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (language, type) DO UPDATE SET metadata = excluded.metadata, fetched_at = excluded.fetched_at",
+                (
+                    (language, alert_type, json.dumps(metadata) if metadata is not None else None, fetched_at)
+                    for alert_type, metadata in found.items()
+                ),
+            )
+            for alert_type, metadata in found.items():
+                self._memory[(language, alert_type)] = (fetched_at, metadata)
+        return found
+
+    def clear(self) -> None:
+        """Drop every cached entry from memory and disk."""
+        with self._lock, self._conn:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM alert_types")
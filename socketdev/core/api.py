@@ -17,9 +17,29 @@ from socketdev.exceptions import (
 )
 from socketdev.version import __version__
 from requests.exceptions import Timeout, ConnectionError
+from dataclasses import dataclass, asdict
+from threading import Event, Lock
 import time
 
 
+@dataclass
+class SingleFlightStats:
+    requests: int = 0
+    collapsed: int = 0
+
+    def to_dict(self):
+        return asdict(self)
+
+
+class _InFlightRequest:
+    __slots__ = ("done", "response", "error")
+
+    def __init__(self):
+        self.done = Event()
+        self.response = None
+        self.error = None
+
+
 class API:
     def __init__(self):
         self.encoded_key = None
@@ -27,6 +47,10 @@ class API:
         self.request_timeout = 30
         self.allow_unverified = False
         self.user_agent = None
+        self.single_flight = False
+        self.single_flight_stats = SingleFlightStats()
+        self._in_flight = {}
+        self._in_flight_lock = Lock()
 
     def encode_key(self, token: str):
         self.encoded_key = base64.b64encode(token.encode()).decode("ascii")
@@ -40,6 +64,9 @@ class API:
     def set_user_agent(self, user_agent: str):
         self.user_agent = user_agent
 
+    def set_single_flight(self, enabled: bool):
+        self.single_flight = enabled
+
     def do_request(
         self,
         path: str,
@@ -47,6 +74,54 @@ class API:
         payload: [dict, str] = None,
         files: list = None,
         method: str = "GET",
+        stream: bool = False,
+    ) -> Response:
+        """Send a request to the Socket API.
+
+        With ``set_single_flight(True)``, identical GET requests (same path, headers
+        and credentials, no body) that are in flight at the same time share one network
+        call: the first caller sends it and the others wait for its response, or its
+        exception. Each ``json()`` call still parses the body into a new object, so a
+        caller that mutates its result does not affect the others.
+        ``single_flight_stats`` counts the GETs sent and the calls collapsed into them.
+        """
+        if not self.single_flight or method.upper() != "GET" or payload is not None or files is not None or stream:
+            return self._send_request(path, headers, payload, files, method, stream)
+
+        key = (self.api_url, path, self.encoded_key, tuple(sorted(headers.items())) if headers else None)
+        with self._in_flight_lock:
+            in_flight = self._in_flight.get(key)
+            leader = in_flight is None
+            if leader:
+                in_flight = self._in_flight[key] = _InFlightRequest()
+            else:
+                self.single_flight_stats.collapsed += 1
+        if not leader:
+            in_flight.done.wait()
+            if in_flight.error is not None:
+                raise in_flight.error
+            return in_flight.response
+
+        try:
+            in_flight.response = self._send_request(path, headers, payload, files, method, stream)
+            return in_flight.response
+        except BaseException as error:
+            in_flight.error = error
+            raise
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
+                self.single_flight_stats.requests += 1
+            in_flight.done.set()
+
+    def _send_request(
+        self,
+        path: str,
+        headers: dict | None,
+        payload: [dict, str],
+        files: list,
+        method: str,
+        stream: bool,
     ) -> Response:
         if self.encoded_key is None or self.encoded_key == "":
             raise APIKeyMissing
@@ -64,11 +139,12 @@ class API:
             return "\n".join(f"{k}: {v}" for k, v in headers_dict.items())
 
         start_time = time.time()
+        response = None
         try:
             
             response = requests.request(
                 method.upper(), url, headers=headers, data=payload, files=files, 
-                timeout=self.request_timeout, verify=not self.allow_unverified
+                timeout=self.request_timeout, verify=not self.allow_unverified, stream=stream
             )
             request_duration = time.time() - start_time
 
@@ -146,9 +222,14 @@ class API:
             APIInsufficientPermissions,
             APIOrganizationNotAllowed,
         ):
-            # Let all our custom exceptions propagate up unchanged
+            # Let all our custom exceptions propagate up unchanged. An error response is
+            # never returned, so release its connection; streamed bodies are still unread.
+            if response is not None:
+                response.close()
             raise
         except Exception as error:
             # Only truly unexpected errors get wrapped in a generic APIFailure
             log.error(f"Unexpected error: {error}")
+            if response is not None:
+                response.close()
             raise APIFailure()
@@ -0,0 +1,66 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Any, Optional
+from socketdev.log import log
+
+
+def default_cache_dir() -> str:
+    """Return the directory used for the SDK's on-disk caches.
+
+    ``SOCKET_SDK_CACHE_DIR`` wins, then ``$XDG_CACHE_HOME/socketdev``, then
+    ``~/.cache/socketdev``.
+    """
+    override = os.getenv("SOCKET_SDK_CACHE_DIR")
+    if override:
+        return override
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "socketdev")
+
+
+def cache_key(*parts: Any) -> str:
+    """Build a filesystem-safe key from arbitrary parts."""
+    joined = "\x1f".join("" if part is None else str(part) for part in parts)
+    return hashlib.sha256(joined.encode("utf-8")).hexdigest()
+
+
+def read_json(path: str, max_age: Optional[float] = None) -> Optional[Any]:
+    """Read a cached JSON document, or None if it is missing, stale or unreadable.
+
+    Args:
+        path: Cache file path
+        max_age: Maximum age in seconds based on the file's mtime. None disables expiry.
+    """
+    try:
+        if max_age is not None and time.time() - os.path.getmtime(path) > max_age:
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as error:
+        log.debug(f"Ignoring unreadable cache file {path}: {error}")
+        return None
+
+
+def write_json(path: str, data: Any) -> None:
+    """Atomically write a JSON document so concurrent readers never see a partial file.
+
+    Cache writes are best effort: failures are logged and swallowed.
+    """
+    directory = os.path.dirname(path) or "."
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    except OSError as error:
+        log.debug(f"Failed to write cache file {path}: {error}")
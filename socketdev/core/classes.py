@@ -1,4 +1,5 @@
 import json
+from functools import cached_property
 
 
 class Score:
@@ -48,13 +49,14 @@ class Package:
     def __init__(self, **kwargs):
         if kwargs:
             for key, value in kwargs.items():
-                setattr(self, key, value)
+                # url and purl are always derived from type, name and version.
+                if key != "url" and key != "purl":
+                    setattr(self, key, value)
         if not hasattr(self, "direct"):
             self.direct = False
         else:
             if str(self.direct).lower() == "true":
                 self.direct = True
-        self.url = f"https://socket.dev/{self.type}/package/{self.name}/overview/{self.version}"
         if hasattr(self, 'score'):
             self.scores = Score(**self.score)
         if not hasattr(self, "alerts"):
@@ -80,8 +82,21 @@ class Package:
             self.license = "NoLicenseFound"
         if not hasattr(self, "license_text"):
             self.license_text = ""
-        self.url = f"https://socket.dev/{self.type}/package/{self.name}/overview/{self.version}"
-        self.purl = f"{self.type}/{self.name}@{self.version}"
+
+    @cached_property
+    def url(self) -> str:
+        return f"https://socket.dev/{self.type}/package/{self.name}/overview/{self.version}"
+
+    @cached_property
+    def purl(self) -> str:
+        return f"{self.type}/{self.name}@{self.version}"
+
+    def to_dict(self) -> dict:
+        """Return the package's attributes, including url and purl even if not yet computed."""
+        data = dict(self.__dict__)
+        data["url"] = self.url
+        data["purl"] = self.purl
+        return data
 
 
 class Dependency:
@@ -1,5 +1,6 @@
 from collections import defaultdict
 from typing import Dict, List, Any
+from socketdev.core.packageurl import build_purl
 from socketdev.log import log
 
 
@@ -90,10 +91,7 @@ class Dedupe:
                 base["purl"] = f"{base['inputPurl']}@{version}"
             else:
                 # Construct complete purl from components
-                if namespace:
-                    base["purl"] = f"pkg:{purl_type}/{namespace}/{name}@{version}"
-                else:
-                    base["purl"] = f"pkg:{purl_type}/{name}@{version}"
+                base["purl"] = build_purl(purl_type, name, namespace=namespace, version=version)
         
         return base
 
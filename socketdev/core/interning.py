@@ -0,0 +1,99 @@
+import threading
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Tuple
+
+# Fields that describe where a package sits in one scan rather than the package itself.
+LINK_FIELDS = frozenset({"direct", "manifestFiles", "topLevelAncestors", "dependencies", "batchIndex", "artifact"})
+# Short top-level string values repeated across most artifacts.
+STRING_FIELDS = ("type", "namespace", "name", "version", "release", "license")
+
+_MISSING = object()
+
+
+@dataclass
+class InternStats:
+    artifacts: int = 0
+    unique: int = 0
+    shared_artifacts: int = 0
+    shared_fields: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.shared_artifacts / self.artifacts if self.artifacts else 0.0
+
+    def to_dict(self):
+        data = asdict(self)
+        data["hit_rate"] = self.hit_rate
+        return data
+
+
+class ArtifactInterner:
+    """
+    Shares identical artifact payloads across full scans.
+
+    Pass one interner to every ``FullScans.stream`` call (or set ``fullscans.interner``).
+    An artifact identical to one already seen, keyed by id, name and version, is replaced
+    by the stored dict. If only its position in the scan differs (``direct``,
+    ``manifestFiles``, ``topLevelAncestors``, ``dependencies``), it gets a new dict whose
+    alerts, license details, attribution text and scores are the stored objects. Dict
+    keys and common string values are interned as well, so memory grows with the number
+    of unique packages rather than with total occurrences.
+
+    Interned artifacts are shared between scans and must be treated as read-only.
+    """
+
+    def __init__(self, max_variants: int = 4):
+        self.max_variants = max_variants
+        self.stats = InternStats()
+        self._variants: Dict[Tuple, List[dict]] = {}
+        self._strings: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._variants)
+
+    def _string(self, value):
+        if type(value) is str:
+            return self._strings.setdefault(value, value)
+        return value
+
+    def intern(self, artifact: dict) -> dict:
+        """Return the shared copy of ``artifact``, storing it if this payload is new."""
+        if not isinstance(artifact, dict):
+            return artifact
+        key = (artifact.get("id"), artifact.get("name"), artifact.get("version"))
+        with self._lock:
+            self.stats.artifacts += 1
+            variants = self._variants.get(key)
+            if variants:
+                for variant in variants:
+                    if variant == artifact:
+                        self.stats.shared_artifacts += 1
+                        return variant
+                base = variants[0]
+            else:
+                base = None
+                variants = self._variants[key] = []
+                self.stats.unique += 1
+
+            strings = self._strings
+            interned = {}
+            for field, value in artifact.items():
+                field = strings.setdefault(field, field)
+                if base is not None and field not in LINK_FIELDS:
+                    stored = base.get(field, _MISSING)
+                    if stored is not value and stored == value:
+                        value = stored
+                        self.stats.shared_fields += 1
+                elif field in STRING_FIELDS:
+                    value = self._string(value)
+                interned[field] = value
+            if len(variants) < self.max_variants:
+                variants.append(interned)
+            return interned
+
+    def clear(self) -> None:
+        with self._lock:
+            self._variants.clear()
+            self._strings.clear()
+            self.stats = InternStats()
@@ -0,0 +1,357 @@
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, asdict, field
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional
+from socketdev.core.cache import default_cache_dir
+from socketdev.core.packageurl import artifact_purl, package_filter, package_identity, purl_key
+from socketdev.log import log
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (
+    org_slug TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    head_full_scan_id TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (org_slug, repo)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS repo_packages (
+    org_slug TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    purl TEXT NOT NULL,
+    artifact_id TEXT,
+    direct INTEGER NOT NULL DEFAULT 0,
+    type TEXT,
+    namespace TEXT,
+    name TEXT,
+    version TEXT,
+    PRIMARY KEY (org_slug, repo, purl)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS repo_manifests (
+    org_slug TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    purl TEXT NOT NULL,
+    file TEXT NOT NULL,
+    PRIMARY KEY (org_slug, repo, purl, file)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS repo_packages_purl ON repo_packages (purl);
+CREATE INDEX IF NOT EXISTS repo_packages_name ON repo_packages (name, type, namespace);
+"""
+
+class _PackageRow(NamedTuple):
+    artifact_id: Optional[str]
+    direct: int
+    type: str
+    namespace: str
+    name: str
+    version: Optional[str]
+    manifest_files: FrozenSet[str]
+
+
+@dataclass
+class RepoDelta:
+    repo: str
+    previous_head: Optional[str]
+    head: Optional[str]
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass
+class InventoryDelta:
+    org_slug: str
+    repos: List[RepoDelta] = field(default_factory=list)
+    unchanged: int = 0
+    failed: List[str] = field(default_factory=list)
+    elapsed_sec: float = 0.0
+
+    @property
+    def added(self) -> int:
+        return sum(len(delta.added) for delta in self.repos)
+
+    @property
+    def removed(self) -> int:
+        return sum(len(delta.removed) for delta in self.repos)
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def to_dict(self):
+        data = asdict(self)
+        data["added"] = self.added
+        data["removed"] = self.removed
+        return data
+
+
+@dataclass
+class PackageUsage:
+    org_slug: str
+    repo: str
+    head_full_scan_id: str
+    purl: str
+    version: Optional[str]
+    direct: bool
+    manifest_files: List[str] = field(default_factory=list)
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def _repo_name(repo: dict) -> Optional[str]:
+    return repo.get("slug") or repo.get("name")
+
+
+def _manifest_files(artifact: dict) -> FrozenSet[str]:
+    return frozenset(
+        ref["file"] for ref in artifact.get("manifestFiles") or () if isinstance(ref, dict) and ref.get("file")
+    )
+
+
+def _artifact_rows(artifacts) -> Dict[str, _PackageRow]:
+    """Map each purl in a stream result to its index row."""
+    items = artifacts.values() if isinstance(artifacts, dict) else artifacts
+    items = [artifact for artifact in items if isinstance(artifact, dict) and artifact.get("type")]
+    # Transitive dependencies usually carry no manifestFiles of their own; they are
+    # declared by the manifests of their top-level ancestors.
+    declared = {artifact.get("id"): _manifest_files(artifact) for artifact in items}
+    rows = {}
+    for artifact in items:
+        purl = purl_key(artifact_purl(artifact))
+        direct = 1 if str(artifact.get("direct")).lower() == "true" else 0
+        files = declared[artifact.get("id")]
+        if not files:
+            files = frozenset().union(*(declared.get(ancestor, ()) for ancestor in artifact.get("topLevelAncestors") or ()))
+        previous = rows.get(purl)
+        if previous:
+            direct = max(direct, previous.direct)
+            files = files | previous.manifest_files
+        rows[purl] = _PackageRow(artifact.get("id"), direct, *package_identity(artifact), files)
+    return rows
+
+
+class InventoryStore:
+    """
+    SQLite record of every repository's head full scan and the packages in it.
+
+    ``sync`` lists an organization's repositories, streams only the head scans that
+    changed since the last sync, and returns an ``InventoryDelta`` with the packages
+    added and removed per repository. Unchanged repositories cost one row comparison,
+    so a nightly sync is proportional to what changed, not to the size of the org.
+
+    The same tables index packages in reverse: ``who_uses`` finds every repository
+    whose head scan contains a package, and the manifest files that declare it,
+    without streaming any scans.
+
+    The database defaults to ``inventory.sqlite3`` in the SDK cache directory. A store
+    can be shared between threads; writes are serialized.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(default_cache_dir(), "inventory.sqlite3")
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version not in (0, SCHEMA_VERSION):
+                # The inventory only mirrors the API; the next sync streams every head scan again.
+                log.warning(f"Rebuilding {self.path}: schema version {version} is not {SCHEMA_VERSION}")
+                for table in ("repos", "repo_packages", "repo_manifests"):
+                    self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def heads(self, org_slug: str) -> Dict[str, str]:
+        """Return the recorded head full scan id of every repository in ``org_slug``."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT repo, head_full_scan_id FROM repos WHERE org_slug = ?", (org_slug,)
+            ).fetchall()
+        return dict(rows)
+
+    def packages(self, org_slug: str, repo: str) -> List[str]:
+        """Return the sorted purls recorded for a repository's head scan."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT purl FROM repo_packages WHERE org_slug = ? AND repo = ? ORDER BY purl", (org_slug, repo)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def who_uses(
+        self,
+        package: str,
+        version: Optional[str] = None,
+        type: Optional[str] = None,
+        namespace: Optional[str] = None,
+        org_slug: Optional[str] = None,
+    ) -> List[PackageUsage]:
+        """
+        Find the repositories whose head scan contains a package
+        :param package: Package name, or a purl such as "pkg:npm/lodash@4.17.21". Matched with
+            ``socketdev.core.packageurl.package_filter``, so a purl without a version matches every version
+        :param version: Optional exact version when ``package`` is a name
+        :param type: Optional ecosystem such as "npm" or "pypi" when ``package`` is a name
+        :param namespace: Optional namespace or scope when ``package`` is a name
+        :param org_slug: Optional organization filter
+        :return: List of PackageUsage, one per repository and purl, with the manifest files that declare it
+        """
+        clauses, params = [], []
+        for column, value in package_filter(package, version, type, namespace).items():
+            clauses.append(f"p.{column} = ?")
+            params.append(value)
+        if org_slug is not None:
+            clauses.append("p.org_slug = ?")
+            params.append(org_slug)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT p.org_slug, p.repo, r.head_full_scan_id, p.purl, p.version, p.direct, "
+                "group_concat(m.file, char(10)) "
+                "FROM repo_packages p JOIN repos r ON r.org_slug = p.org_slug AND r.repo = p.repo "
+                "LEFT JOIN repo_manifests m ON m.org_slug = p.org_slug AND m.repo = p.repo AND m.purl = p.purl "
+                "WHERE " + " AND ".join(clauses) + " GROUP BY p.org_slug, p.repo, p.purl ORDER BY p.org_slug, p.repo, p.purl",
+                params,
+            ).fetchall()
+        return [
+            PackageUsage(org, repo, head, purl, version, bool(direct), sorted(files.split("\n")) if files else [])
+            for org, repo, head, purl, version, direct, files in rows
+        ]
+
+    def apply(self, org_slug: str, repo: str, head_full_scan_id: str, artifacts) -> RepoDelta:
+        """
+        Record ``artifacts`` as the contents of ``repo`` at ``head_full_scan_id``.
+
+        ``artifacts`` is a ``FullScans.stream`` result or an iterable of artifact dicts.
+        Returns the purls added and removed relative to the previously recorded head.
+        """
+        rows = _artifact_rows(artifacts)
+        with self._lock, self._conn:
+            previous = self._conn.execute(
+                "SELECT head_full_scan_id FROM repos WHERE org_slug = ? AND repo = ?", (org_slug, repo)
+            ).fetchone()
+            old = {
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT purl FROM repo_packages WHERE org_slug = ? AND repo = ?", (org_slug, repo)
+                )
+            }
+            removed = old - rows.keys()
+            added = rows.keys() - old
+            self._conn.executemany(
+                "DELETE FROM repo_packages WHERE org_slug = ? AND repo = ? AND purl = ?",
+                ((org_slug, repo, purl) for purl in removed),
+            )
+            self._conn.executemany(
+                "INSERT INTO repo_packages (org_slug, repo, purl, artifact_id, direct, type, namespace, name, version) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (org_slug, repo, purl) DO UPDATE SET artifact_id = excluded.artifact_id, direct = excluded.direct, "
+                "type = excluded.type, namespace = excluded.namespace, name = excluded.name, version = excluded.version",
+                ((org_slug, repo, purl, *row[:6]) for purl, row in rows.items()),
+            )
+            self._conn.execute("DELETE FROM repo_manifests WHERE org_slug = ? AND repo = ?", (org_slug, repo))
+            self._conn.executemany(
+                "INSERT INTO repo_manifests (org_slug, repo, purl, file) VALUES (?, ?, ?, ?)",
+                ((org_slug, repo, purl, file) for purl, row in rows.items() for file in row.manifest_files),
+            )
+            self._conn.execute(
+                "INSERT INTO repos (org_slug, repo, head_full_scan_id, synced_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (org_slug, repo) DO UPDATE SET head_full_scan_id = excluded.head_full_scan_id, "
+                "synced_at = excluded.synced_at",
+                (org_slug, repo, head_full_scan_id, time.time()),
+            )
+        return RepoDelta(repo, previous[0] if previous else None, head_full_scan_id, sorted(added), sorted(removed))
+
+    def remove_repo(self, org_slug: str, repo: str) -> RepoDelta:
+        """Forget a repository, reporting all of its packages as removed."""
+        with self._lock, self._conn:
+            previous = self._conn.execute(
+                "SELECT head_full_scan_id FROM repos WHERE org_slug = ? AND repo = ?", (org_slug, repo)
+            ).fetchone()
+            removed = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT purl FROM repo_packages WHERE org_slug = ? AND repo = ? ORDER BY purl", (org_slug, repo)
+                )
+            ]
+            self._conn.execute("DELETE FROM repo_packages WHERE org_slug = ? AND repo = ?", (org_slug, repo))
+            self._conn.execute("DELETE FROM repo_manifests WHERE org_slug = ? AND repo = ?", (org_slug, repo))
+            self._conn.execute("DELETE FROM repos WHERE org_slug = ? AND repo = ?", (org_slug, repo))
+        return RepoDelta(repo, previous[0] if previous else None, None, [], removed)
+
+    def sync(self, sdk, org_slug: str, concurrency: int = 4, repos: Optional[Iterable[dict]] = None) -> InventoryDelta:
+        """
+        Bring the inventory for ``org_slug`` up to date and report what changed.
+
+        :param sdk: A ``socketdev`` client; ``repos.list_all`` and ``fullscans.stream`` are used
+        :param org_slug: The organization to sync
+        :param concurrency: Number of repository pages and head scans fetched at once
+        :param repos: Optional repository listing to use instead of calling ``repos.list_all``
+        :return: InventoryDelta with one RepoDelta per new, changed or removed repository
+
+        A head scan that streams no artifacts is treated as a failed fetch: the repository
+        is listed in ``failed`` and retried on the next sync. If the repository listing
+        comes back empty, nothing is removed.
+        """
+        start = time.monotonic()
+        listing = list(repos) if repos is not None else sdk.repos.list_all(org_slug, concurrency=concurrency)
+        current = {}
+        for repo in listing:
+            name = _repo_name(repo)
+            if name and repo.get("head_full_scan_id"):
+                current[name] = repo["head_full_scan_id"]
+        stored = self.heads(org_slug)
+        changed = {name: head for name, head in current.items() if stored.get(name) != head}
+        delta = InventoryDelta(org_slug, unchanged=len(current) - len(changed))
+
+        if changed:
+            with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(changed)))) as executor:
+                futures = {
+                    executor.submit(sdk.fullscans.stream, org_slug, head): (name, head) for name, head in changed.items()
+                }
+                for future in as_completed(futures):
+                    name, head = futures[future]
+                    try:
+                        artifacts = future.result()
+                    except Exception as error:
+                        log.error(f"Failed to stream head scan {head} for {name}: {error}")
+                        artifacts = None
+                    if not artifacts:
+                        delta.failed.append(name)
+                        continue
+                    delta.repos.append(self.apply(org_slug, name, head, artifacts))
+
+        if listing:
+            for name in sorted(stored.keys() - current.keys()):
+                delta.repos.append(self.remove_repo(org_slug, name))
+        elif stored:
+            log.warning(f"No repositories listed for {org_slug}; keeping the {len(stored)} recorded repositories")
+
+        delta.repos.sort(key=lambda repo_delta: repo_delta.repo)
+        delta.failed.sort()
+        delta.elapsed_sec = time.monotonic() - start
+        return delta
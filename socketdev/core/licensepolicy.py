@@ -0,0 +1,375 @@
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple
+from socketdev.log import log
+
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_MAX_WORKERS = 4
+EXPRESSION_CACHE_SIZE = 16384
+
+# Expressions that state no license at all.
+_NO_LICENSE = frozenset({"", "NOASSERTION", "NONE", "UNKNOWN", "UNLICENSED"})
+_TOKEN = re.compile(r"\(|\)|[^\s()]+")
+# Metadata list fields whose values can be named in a policy like license ids.
+_TAG_FIELDS = ("classes", "categories", "tags", "tiers")
+
+
+class LicenseVerdict(str, Enum):
+    ALLOW = "allow"
+    WARN = "warn"
+    DENY = "deny"
+    UNKNOWN = "unknown"
+
+
+# OR picks the most permissive branch and AND the most restrictive term.
+_RANK = {LicenseVerdict.ALLOW: 0, LicenseVerdict.WARN: 1, LicenseVerdict.UNKNOWN: 2, LicenseVerdict.DENY: 3}
+
+
+@dataclass
+class LicenseViolation:
+    verdict: LicenseVerdict
+    expression: str
+    artifact: Any
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def to_dict(self):
+        artifact = self.artifact.to_dict() if hasattr(self.artifact, "to_dict") else self.artifact
+        return {"verdict": self.verdict.value, "expression": self.expression, "artifact": artifact}
+
+
+@dataclass
+class LicenseReport:
+    evaluated: int = 0
+    expressions: int = 0
+    counts: Dict[str, int] = field(default_factory=lambda: {verdict.value: 0 for verdict in LicenseVerdict})
+    violations: List[LicenseViolation] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not self.counts.get(LicenseVerdict.DENY.value)
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def to_dict(self):
+        return {
+            "evaluated": self.evaluated,
+            "expressions": self.expressions,
+            "counts": dict(self.counts),
+            "violations": [violation.to_dict() for violation in self.violations],
+            "passed": self.passed,
+        }
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def parse_spdx(expression: str) -> Tuple:
+    """
+    Parse an SPDX license expression into a tree of tuples.
+
+    Leaves are ``("license", id, exception)``; branches are ``("and", children)`` and
+    ``("or", children)``. ``WITH`` binds tighter than ``AND``, which binds tighter than
+    ``OR``. Operators are case-insensitive. Results are cached.
+
+    Raises:
+        ValueError: if the expression is empty or malformed.
+    """
+    tokens = _TOKEN.findall(expression)
+    if not tokens:
+        raise ValueError("empty license expression")
+    tree, position = _parse_or(tokens, 0)
+    if position != len(tokens):
+        raise ValueError(f"unexpected {tokens[position]!r} in license expression {expression!r}")
+    return tree
+
+
+def _parse_or(tokens: List[str], position: int) -> Tuple[Tuple, int]:
+    children = []
+    while True:
+        child, position = _parse_and(tokens, position)
+        children.append(child)
+        if position < len(tokens) and tokens[position].upper() == "OR":
+            position += 1
+            continue
+        return (children[0] if len(children) == 1 else ("or", tuple(children))), position
+
+
+def _parse_and(tokens: List[str], position: int) -> Tuple[Tuple, int]:
+    children = []
+    while True:
+        child, position = _parse_term(tokens, position)
+        children.append(child)
+        if position < len(tokens) and tokens[position].upper() == "AND":
+            position += 1
+            continue
+        return (children[0] if len(children) == 1 else ("and", tuple(children))), position
+
+
+def _parse_term(tokens: List[str], position: int) -> Tuple[Tuple, int]:
+    if position >= len(tokens):
+        raise ValueError("license expression ends early")
+    token = tokens[position]
+    if token == "(":
+        tree, position = _parse_or(tokens, position + 1)
+        if position >= len(tokens) or tokens[position] != ")":
+            raise ValueError("unbalanced parentheses in license expression")
+        return tree, position + 1
+    if token == ")" or token.upper() in ("AND", "OR", "WITH"):
+        raise ValueError(f"unexpected {token!r} in license expression")
+    exception = None
+    if position + 1 < len(tokens) and tokens[position + 1].upper() == "WITH":
+        if position + 2 >= len(tokens) or tokens[position + 2] in ("(", ")"):
+            raise ValueError("WITH must be followed by an exception id")
+        exception = tokens[position + 2]
+        return ("license", token, exception), position + 3
+    return ("license", token, exception), position + 1
+
+
+def license_ids(tree: Tuple) -> Set[str]:
+    """Return the license ids referenced by a parsed expression, without exceptions or ``+``."""
+    if tree[0] == "license":
+        return {tree[1][:-1] if tree[1].endswith("+") else tree[1]}
+    ids = set()
+    for child in tree[1]:
+        ids |= license_ids(child)
+    return ids
+
+
+def artifact_license(artifact: Any) -> str:
+    """Return an artifact's license expression, falling back to its ``licenseDetails``."""
+    get = artifact.get if isinstance(artifact, Mapping) else lambda key: getattr(artifact, key, None)
+    expression = get("license")
+    if expression:
+        return expression
+    disjunctions = []
+    for detail in get("licenseDetails") or ():
+        detail = detail.to_dict() if hasattr(detail, "to_dict") else detail
+        for conjunction in detail.get("spdxDisj") or ():
+            ids = [term.get("licenseId") for term in conjunction if isinstance(term, Mapping) and term.get("licenseId")]
+            if ids:
+                disjunctions.append(ids[0] if len(ids) == 1 else "(" + " AND ".join(ids) + ")")
+    return " OR ".join(dict.fromkeys(disjunctions))
+
+
+def _entries(value: Any) -> FrozenSet[str]:
+    if isinstance(value, Mapping):
+        value = [key for key, enabled in value.items() if enabled]
+    return frozenset(str(entry).lower() for entry in value or ())
+
+
+def _metadata_tags(metadata: Optional[dict]) -> FrozenSet[str]:
+    if not metadata:
+        return frozenset()
+    tags = set()
+    for key, value in metadata.items():
+        if value is True:
+            tags.add(key.lower())
+        elif key in _TAG_FIELDS and isinstance(value, list):
+            tags.update(str(tag).lower() for tag in value)
+    return frozenset(tags)
+
+
+def _metadata_records(response: Any) -> Dict[str, dict]:
+    """Key a ``LicenseMetadata.post`` response by license id."""
+    if isinstance(response, Mapping):
+        if isinstance(response.get("licenses"), list):
+            response = response["licenses"]
+        else:
+            return {key: value for key, value in response.items() if isinstance(value, Mapping)}
+    records = {}
+    for record in response or ():
+        if isinstance(record, Mapping):
+            license_id = record.get("licenseId") or record.get("spdxId") or record.get("id")
+            if license_id:
+                records[license_id] = record
+    return records
+
+
+class LicensePolicy:
+    """
+    An organization license policy evaluated locally against scan artifacts.
+
+    Policy entries are SPDX license ids or metadata tags (for example ``osiApproved``,
+    or a class listed in the license metadata), matched case-insensitively. A license
+    on the ``deny`` list is denied and one on the ``warn`` list warns. If an ``allow``
+    list is set, only the licenses on it are allowed and anything else is denied;
+    without one, unlisted licenses are allowed. ``OR`` expressions take the most
+    permissive branch and ``AND`` the most restrictive term. Artifacts with no license,
+    or an expression that cannot be parsed, are ``unknown``.
+
+    When a ``licensemetadata`` client is given, ``evaluate_artifacts`` collects every
+    license id in the scan and resolves the ones not seen before with batched
+    ``LicenseMetadata.post`` calls. Parsed expressions, metadata and verdicts are
+    cached on the policy, so reuse one instance across scans.
+    """
+
+    def __init__(
+        self,
+        allow: Optional[Iterable[str]] = None,
+        warn: Optional[Iterable[str]] = None,
+        deny: Optional[Iterable[str]] = None,
+        licensemetadata=None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.allow = _entries(allow) if allow is not None else None
+        self.warn = _entries(warn)
+        self.deny = _entries(deny)
+        self.licensemetadata = licensemetadata
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.metadata: Dict[str, Optional[dict]] = {}
+        self._tags: Dict[str, FrozenSet[str]] = {}
+        self._verdicts: Dict[str, LicenseVerdict] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: dict, licensemetadata=None, **kwargs) -> "LicensePolicy":
+        """Build a policy from ``Settings.get_license_policy`` output."""
+        policy = settings.get("license_policy") or settings.get("licensePolicy") or settings
+        return cls(policy.get("allow"), policy.get("warn"), policy.get("deny"), licensemetadata, **kwargs)
+
+    @classmethod
+    def fetch(cls, sdk, org_slug: str, **kwargs) -> Optional["LicensePolicy"]:
+        """
+        Fetch an organization's license policy
+        :param sdk: A ``socketdev`` client; ``settings.get_license_policy`` and ``licensemetadata`` are used
+        :param org_slug: The organization whose policy to load
+        :param kwargs: ``batch_size`` and ``max_workers`` for metadata lookups
+        :return: LicensePolicy, or None if the policy could not be fetched
+        """
+        settings = sdk.settings.get_license_policy(org_slug)
+        if not settings:
+            log.error(f"Could not load the license policy for {org_slug}")
+            return None
+        return cls.from_settings(settings, sdk.licensemetadata, **kwargs)
+
+    def resolve(self, ids: Iterable[str]) -> Dict[str, Optional[dict]]:
+        """
+        Fetch license metadata for the ids not already cached
+        :param ids: SPDX license ids
+        :return: The cached metadata for each requested id, None where the API has none
+        """
+        ids = list(dict.fromkeys(ids))
+        with self._lock:
+            missing = [license_id for license_id in ids if license_id not in self.metadata]
+        if missing and self.licensemetadata is not None:
+            batches = [missing[i : i + self.batch_size] for i in range(0, len(missing), self.batch_size)]
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+                responses = list(executor.map(self._post, batches))
+            with self._lock:
+                for batch, response in zip(batches, responses):
+                    if not response:
+                        # A failed batch is retried on the next lookup rather than cached.
+                        continue
+                    records = _metadata_records(response)
+                    lowered = {key.lower(): value for key, value in records.items()}
+                    for license_id in batch:
+                        self.metadata[license_id] = records.get(license_id) or lowered.get(license_id.lower())
+                        self._tags.pop(license_id, None)
+                # Verdicts may depend on metadata tags that just arrived.
+                self._verdicts.clear()
+        with self._lock:
+            return {license_id: self.metadata.get(license_id) for license_id in ids}
+
+    def _post(self, batch: List[str]) -> Any:
+        try:
+            return self.licensemetadata.post(batch)
+        except Exception as error:
+            log.error(f"Failed to fetch license metadata for {len(batch)} licenses: {error}")
+            return {}
+
+    def _term_verdict(self, license_id: str, exception: Optional[str]) -> LicenseVerdict:
+        names = {license_id.lower()}
+        base = license_id[:-1] if license_id.endswith("+") else license_id
+        names.add(base.lower())
+        if exception:
+            names.add(f"{license_id} with {exception}".lower())
+        tags = self._tags.get(base)
+        if tags is None:
+            tags = self._tags[base] = _metadata_tags(self.metadata.get(base))
+        names |= tags
+        if names & self.deny:
+            return LicenseVerdict.DENY
+        if names & self.warn:
+            return LicenseVerdict.WARN
+        if self.allow is None or names & self.allow:
+            return LicenseVerdict.ALLOW
+        return LicenseVerdict.DENY
+
+    def _tree_verdict(self, tree: Tuple) -> LicenseVerdict:
+        if tree[0] == "license":
+            return self._term_verdict(tree[1], tree[2])
+        verdicts = [self._tree_verdict(child) for child in tree[1]]
+        pick = min if tree[0] == "or" else max
+        return pick(verdicts, key=_RANK.__getitem__)
+
+    def evaluate_expression(self, expression: Optional[str]) -> LicenseVerdict:
+        """Return the verdict for one SPDX expression, resolving metadata for it if needed."""
+        return self._verdict((expression or "").strip(), True)
+
+    def _verdict(self, expression: str, resolve: bool) -> LicenseVerdict:
+        verdict = self._verdicts.get(expression)
+        if verdict is not None:
+            return verdict
+        if expression.upper() in _NO_LICENSE:
+            verdict = LicenseVerdict.UNKNOWN
+        else:
+            try:
+                tree = parse_spdx(expression)
+            except ValueError:
+                log.debug(f"Unparseable license expression {expression!r}")
+                verdict = LicenseVerdict.UNKNOWN
+            else:
+                ids = license_ids(tree)
+                if resolve:
+                    self.resolve(ids)
+                verdict = self._tree_verdict(tree)
+                if self.licensemetadata is not None and not ids <= self.metadata.keys():
+                    # Metadata for some ids failed to load; decide again once it does.
+                    return verdict
+        self._verdicts[expression] = verdict
+        return verdict
+
+    def evaluate_artifacts(self, artifacts: Any) -> LicenseReport:
+        """
+        Evaluate the license of every artifact in a scan
+        :param artifacts: A ``FullScans.stream`` result, ``FullScanStreamResponse`` or iterable of artifacts
+        :return: LicenseReport with per-verdict counts and the denied, warned and unknown artifacts
+        """
+        if hasattr(artifacts, "artifacts"):
+            artifacts = artifacts.artifacts or {}
+        if isinstance(artifacts, Mapping):
+            artifacts = artifacts.values()
+        pairs = [(artifact, artifact_license(artifact).strip()) for artifact in artifacts]
+
+        # Resolve the metadata for every license in the scan up front, in as few
+        # batched requests as possible, before evaluating each unique expression once.
+        unique = dict.fromkeys(expression for _, expression in pairs)
+        ids = set()
+        for expression in unique:
+            if expression not in self._verdicts and expression.upper() not in _NO_LICENSE:
+                try:
+                    ids |= license_ids(parse_spdx(expression))
+                except ValueError:
+                    pass
+        self.resolve(ids)
+        verdicts = {expression: self._verdict(expression, False) for expression in unique}
+
+        report = LicenseReport(evaluated=len(pairs), expressions=len(unique))
+        counts = report.counts
+        for artifact, expression in pairs:
+            verdict = verdicts[expression]
+            counts[verdict.value] += 1
+            if verdict is not LicenseVerdict.ALLOW:
+                report.violations.append(LicenseViolation(verdict, expression, artifact))
+        return report
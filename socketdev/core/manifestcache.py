@@ -0,0 +1,183 @@
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from threading import Lock
+from typing import Iterable, List, Optional, Tuple
+from socketdev.core.cache import cache_key, default_cache_dir, read_json, write_json
+from socketdev.log import log
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path: str) -> Tuple[str, int]:
+    """Return the sha256 hex digest and size of a file."""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(_HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def fingerprint_files(files: Iterable[Tuple[str, str]], max_workers: int = 8) -> Tuple[str, int]:
+    """Compute a fingerprint for a manifest set.
+
+    Args:
+        files: (upload key, file path) pairs. The key is part of the fingerprint, so
+               moving or renaming a manifest counts as a change.
+        max_workers: Number of files hashed concurrently (hashlib releases the GIL)
+
+    Returns:
+        (fingerprint, total bytes hashed)
+    """
+    files = sorted(set(files))
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        hashes = list(pool.map(lambda item: hash_file(item[1]), files))
+    combined = hashlib.sha256()
+    total_bytes = 0
+    for (key, _), (file_hash, size) in zip(files, hashes):
+        combined.update(key.encode("utf-8"))
+        combined.update(b"\0")
+        combined.update(file_hash.encode("ascii"))
+        combined.update(b"\n")
+        total_bytes += size
+    return combined.hexdigest(), total_bytes
+
+
+@dataclass
+class ManifestCacheStats:
+    hits: int = 0
+    misses: int = 0
+    bytes_saved: int = 0
+    seconds_saved: float = 0.0
+    hash_seconds: float = 0.0
+
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass
+class ManifestCacheEntry:
+    fingerprint: str
+    bytes: int
+    upload_seconds: float = 0.0
+    tar_hash: Optional[str] = None
+    full_scan: Optional[dict] = None
+    scan_params: Optional[str] = None
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ManifestCacheEntry":
+        return cls(
+            fingerprint=data["fingerprint"],
+            bytes=data.get("bytes", 0),
+            upload_seconds=data.get("upload_seconds", 0.0),
+            tar_hash=data.get("tar_hash"),
+            full_scan=data.get("full_scan"),
+            scan_params=data.get("scan_params"),
+        )
+
+
+class ManifestFingerprintStore:
+    """
+    Local store of manifest-set fingerprints keyed by org, repo and branch.
+
+    Pass a store to ``UploadManifests.upload_manifest_files`` or ``FullScans.post``.
+    When the manifests hash to the same fingerprint as the last recorded upload for
+    that repo and branch, the previous tarHash is returned and nothing is uploaded.
+    A recorded full scan is only reused if the scan parameters (commit, pull request,
+    ...) are the same as well. ``stats`` keeps a running total of hits, bytes and time saved.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_workers: int = 8):
+        self.cache_dir = os.path.join(cache_dir or default_cache_dir(), "manifest-fingerprints")
+        self.max_workers = max_workers
+        self.stats = ManifestCacheStats()
+        self._lock = Lock()
+
+    def _path(self, org_slug: str, repo: str, branch: Optional[str]) -> str:
+        return os.path.join(self.cache_dir, f"{cache_key(org_slug, repo, branch)}.json")
+
+    def fingerprint(self, files: List[Tuple[str, str]]) -> Tuple[str, int]:
+        """Fingerprint (key, path) pairs and record the hashing time in ``stats``."""
+        start_time = time.time()
+        result = fingerprint_files(files, self.max_workers)
+        with self._lock:
+            self.stats.hash_seconds += time.time() - start_time
+        return result
+
+    def lookup(
+        self,
+        org_slug: str,
+        repo: str,
+        branch: Optional[str],
+        fingerprint: str,
+        require: str = "tar_hash",
+        scan_params: Optional[str] = None,
+    ) -> Optional[ManifestCacheEntry]:
+        """Return the recorded entry if it matches ``fingerprint`` and has ``require`` set.
+
+        When ``scan_params`` is given, the recorded entry must also have been created
+        with the same scan parameters. Counts a hit (with bytes and upload time saved)
+        or a miss in ``stats``.
+        """
+        entry = self._read(org_slug, repo, branch)
+        if (
+            entry is None
+            or entry.fingerprint != fingerprint
+            or getattr(entry, require) is None
+            or (scan_params is not None and entry.scan_params != scan_params)
+        ):
+            entry = None
+        with self._lock:
+            if entry is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+                self.stats.bytes_saved += entry.bytes
+                self.stats.seconds_saved += entry.upload_seconds
+        if entry is not None:
+            log.info(
+                f"Manifests unchanged for {org_slug}/{repo}@{branch}; "
+                f"skipped uploading {entry.bytes} bytes (~{entry.upload_seconds:.2f}s)"
+            )
+        return entry
+
+    def record(self, org_slug: str, repo: str, branch: Optional[str], entry: ManifestCacheEntry) -> None:
+        """Store the result of an upload for the next lookup.
+
+        Fields left unset on ``entry`` keep their recorded value when the fingerprint
+        is unchanged, so a tarHash and a full scan for the same manifests coexist.
+        """
+        previous = self._read(org_slug, repo, branch)
+        if previous is not None and previous.fingerprint == entry.fingerprint:
+            if entry.tar_hash is None:
+                entry.tar_hash = previous.tar_hash
+            if entry.full_scan is None:
+                entry.full_scan = previous.full_scan
+                entry.scan_params = previous.scan_params
+        write_json(self._path(org_slug, repo, branch), entry.to_dict())
+
+    def _read(self, org_slug: str, repo: str, branch: Optional[str]) -> Optional[ManifestCacheEntry]:
+        data = read_json(self._path(org_slug, repo, branch))
+        if not isinstance(data, dict):
+            return None
+        try:
+            return ManifestCacheEntry.from_dict(data)
+        except KeyError:
+            return None
+
+    def clear(self, org_slug: str, repo: str, branch: Optional[str]) -> None:
+        """Forget the recorded upload for a repo and branch."""
+        try:
+            os.remove(self._path(org_slug, repo, branch))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,280 @@
+import re
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
+from urllib.parse import quote, unquote
+
+PURL_CACHE_SIZE = 1 << 16
+
+# Types whose namespace and name are case-insensitive per the purl spec. npm is left
+# out: legacy npm packages such as JSONStream and jsonstream are distinct.
+_LOWERCASE_TYPES = frozenset({"apk", "bitbucket", "composer", "deb", "github", "hex", "pypi"})
+_NEEDS_QUOTING = re.compile(r"[^A-Za-z0-9.\-_~:]")
+_QUALIFIER_NEEDS_QUOTING = re.compile(r"[^A-Za-z0-9.\-_~:/]")
+_PATH_NEEDS_QUOTING = _QUALIFIER_NEEDS_QUOTING
+_new_tuple = tuple.__new__
+
+
+def _unquote(value: str) -> str:
+    if "%" not in value:
+        return value
+    # "%40" (an npm scope's "@") is by far the most common escape; skip the
+    # general decoder when it is the only one.
+    decoded = value.replace("%40", "@")
+    return unquote(decoded) if "%" in decoded else decoded
+
+
+def _quote(value: str) -> str:
+    return quote(value, safe=":") if _NEEDS_QUOTING.search(value) else value
+
+
+def _quote_qualifier(value: str) -> str:
+    return quote(value, safe=":/") if _QUALIFIER_NEEDS_QUOTING.search(value) else value
+
+
+class PackageURL(NamedTuple):
+    """Parsed package URL. Qualifiers are stored as sorted ``(key, value)`` pairs."""
+
+    type: str
+    name: str
+    namespace: Optional[str] = None
+    version: Optional[str] = None
+    qualifiers: Tuple[Tuple[str, str], ...] = ()
+    subpath: Optional[str] = None
+
+    def to_string(self) -> str:
+        """Format the purl, percent-encoding each component as the spec requires."""
+        name = _quote(self.name)
+        namespace = self.namespace
+        if namespace:
+            if _PATH_NEEDS_QUOTING.search(namespace):
+                namespace = "/".join(_quote(segment) for segment in namespace.split("/"))
+            purl = f"pkg:{self.type}/{namespace}/{name}"
+        else:
+            purl = f"pkg:{self.type}/{name}"
+        if self.version:
+            purl += "@" + _quote(self.version)
+        if self.qualifiers:
+            purl += "?" + "&".join(f"{key}={_quote_qualifier(value)}" for key, value in self.qualifiers)
+        if self.subpath:
+            purl += "#" + "/".join(_quote(segment) for segment in self.subpath.split("/"))
+        return purl
+
+    def __str__(self) -> str:
+        return self.to_string()
+
+
+@lru_cache(maxsize=PURL_CACHE_SIZE)
+def parse_purl(purl: str) -> PackageURL:
+    """Parse and normalize a purl string.
+
+    Normalization follows the purl spec: the type and qualifier keys are lowercased,
+    qualifiers are sorted and empty ones dropped, empty, ``.`` and ``..`` subpath
+    segments are removed, and the namespace and name are lowercased for
+    case-insensitive types (with ``_`` folded to ``-`` for pypi). Results are cached,
+    so repeated inputs cost a dict lookup.
+
+    Raises:
+        ValueError: if ``purl`` is not a string of the form ``pkg:type/name``.
+    """
+    return _parse(purl)
+
+
+def _parse(purl: str) -> PackageURL:
+    if not isinstance(purl, str):
+        raise ValueError(f"Invalid purl {purl!r}: expected a string")
+    return _parse_simple(purl) or _parse_full(purl)
+
+
+def _normalize_case(purl_type: str, namespace: str, name: str) -> Tuple[str, str]:
+    if purl_type in _LOWERCASE_TYPES:
+        name = name.lower()
+        namespace = namespace.lower()
+        if purl_type == "pypi":
+            name = name.replace("_", "-")
+    return namespace, name
+
+
+def _parse_qualifiers(raw_qualifiers: str) -> Tuple[Tuple[str, str], ...]:
+    pairs = {}
+    for pair in raw_qualifiers.split("&"):
+        key, _, value = pair.partition("=")
+        value = _unquote(value)
+        if key and value:
+            pairs[key.lower()] = value
+    return tuple(sorted(pairs.items()))
+
+
+def _parse_simple(purl: str) -> Optional[PackageURL]:
+    """Parse the common ``pkg:type/namespace/name@version?qualifiers`` shape.
+
+    Returns None for anything else (subpaths, uppercase schemes or types, extra
+    or empty slashes) so the caller falls back to :func:`_parse_full`, which yields
+    the same result for every input this accepts.
+    """
+    if not purl.startswith("pkg:"):
+        return None
+    rest = purl[4:]
+    if "#" in rest or "//" in rest:
+        return None
+    qualifiers = ()
+    if "?" in rest:
+        rest, _, raw_qualifiers = rest.rpartition("?")
+        qualifiers = _parse_qualifiers(raw_qualifiers)
+    purl_type, sep, path = rest.partition("/")
+    if not sep or not purl_type.islower() or not path or path[0] == "/" or path[-1] == "/":
+        return None
+    at = path.rfind("@")
+    if at > path.rfind("/") + 1:
+        version = path[at + 1 :] or None
+        path = path[:at]
+        if version:
+            version = _unquote(version) or None
+    else:
+        version = None
+    namespace, _, name = path.rpartition("/")
+    if "%" in path:
+        name = _unquote(name)
+        namespace = "/".join(_unquote(segment) for segment in namespace.split("/")) if namespace else ""
+    namespace, name = _normalize_case(purl_type, namespace, name)
+    return _new_tuple(PackageURL, (purl_type, name, namespace or None, version, qualifiers, None))
+
+
+def _parse_full(purl: str) -> PackageURL:
+    scheme, sep, remainder = purl.partition(":")
+    if not sep or scheme.lower() != "pkg":
+        raise ValueError(f"Invalid purl {purl!r}: missing 'pkg:' scheme")
+    remainder = remainder.lstrip("/")
+
+    subpath = None
+    if "#" in remainder:
+        remainder, _, raw_subpath = remainder.rpartition("#")
+        segments = [_unquote(s) for s in raw_subpath.split("/") if s not in ("", ".", "..")]
+        subpath = "/".join(segments) or None
+
+    qualifiers = ()
+    if "?" in remainder:
+        remainder, _, raw_qualifiers = remainder.rpartition("?")
+        qualifiers = _parse_qualifiers(raw_qualifiers)
+
+    purl_type, sep, remainder = remainder.partition("/")
+    if not purl_type or not sep:
+        raise ValueError(f"Invalid purl {purl!r}: missing type or name")
+    purl_type = purl_type.lower()
+    remainder = remainder.strip("/")
+
+    version = None
+    at = remainder.rfind("@")
+    if at > remainder.rfind("/") + 1:
+        version = _unquote(remainder[at + 1 :]) or None
+        remainder = remainder[:at]
+
+    segments = [s for s in remainder.split("/") if s]
+    if not segments:
+        raise ValueError(f"Invalid purl {purl!r}: missing name")
+    namespace, name = _normalize_case(
+        purl_type, "/".join(_unquote(s) for s in segments[:-1]), _unquote(segments[-1])
+    )
+    return PackageURL(purl_type, name, namespace or None, version, qualifiers, subpath)
+
+
+@lru_cache(maxsize=PURL_CACHE_SIZE)
+def canonicalize_purl(purl: str) -> str:
+    """Return the canonical string form of ``purl``.
+
+    Raises:
+        ValueError: if ``purl`` cannot be parsed.
+    """
+    # Parse uncached: canonicalize_purl has its own cache, and filling both
+    # with the same inputs would only halve the number of entries each holds.
+    return _parse(purl).to_string()
+
+
+def purl_key(purl: str) -> str:
+    """Canonical form of ``purl`` for use as a dedupe or cache key.
+
+    Unparseable input is returned unchanged, so it still only matches itself.
+    """
+    try:
+        return canonicalize_purl(purl)
+    except ValueError:
+        return purl
+
+
+def build_purl(
+    purl_type: str,
+    name: str,
+    namespace: Optional[str] = None,
+    version: Optional[str] = None,
+    qualifiers: Optional[dict] = None,
+    subpath: Optional[str] = None,
+) -> str:
+    """Format a purl from its components with spec-compliant percent-encoding."""
+    qualifier_pairs = tuple(sorted((k.lower(), v) for k, v in (qualifiers or {}).items() if v))
+    return PackageURL(purl_type.lower(), name, namespace or None, version or None, qualifier_pairs, subpath or None).to_string()
+
+
+def artifact_purl(artifact: dict) -> str:
+    """Format the purl of a Socket artifact dict (type, namespace, name, version, release, subpath)."""
+    qualifiers = {"release": artifact["release"]} if artifact.get("release") else None
+    return build_purl(
+        artifact["type"],
+        artifact.get("name") or "",
+        namespace=artifact.get("namespace"),
+        version=artifact.get("version"),
+        qualifiers=qualifiers,
+        subpath=artifact.get("subpath"),
+    )
+
+
+def package_identity(artifact: dict) -> Tuple[str, str, str, Optional[str]]:
+    """Canonical ``(type, namespace, name, version)`` of a Socket artifact dict. The namespace is "" when absent."""
+    try:
+        parsed = parse_purl(artifact_purl(artifact))
+    except ValueError:
+        # No usable name; keep the fields as given so the row still only matches itself.
+        return artifact["type"].lower(), artifact.get("namespace") or "", artifact.get("name") or "", artifact.get("version")
+    return parsed.type, parsed.namespace or "", parsed.name, parsed.version
+
+
+def package_filter(
+    package: str,
+    version: Optional[str] = None,
+    purl_type: Optional[str] = None,
+    namespace: Optional[str] = None,
+) -> Dict[str, str]:
+    """Equality filters on ``package_identity`` fields that select a package given by name or purl.
+
+    A purl supplies the type, namespace, name and version itself. Without a version it
+    matches every version, and qualifiers and subpath are ignored. A name is matched as
+    given, together with whichever of ``version``, ``purl_type`` and ``namespace`` are
+    passed. When the type is known, the name and namespace are normalized as in a purl.
+
+    Raises:
+        ValueError: if ``package`` starts with ``pkg:`` but cannot be parsed.
+    """
+    if package.startswith("pkg:"):
+        parsed = parse_purl(package)
+        filters = {"type": parsed.type, "namespace": parsed.namespace or "", "name": parsed.name}
+        if parsed.version:
+            filters["version"] = parsed.version
+        return filters
+    name = package
+    filters = {}
+    if purl_type is not None:
+        purl_type = purl_type.lower()
+        normalized_namespace, name = _normalize_case(purl_type, namespace or "", name)
+        if namespace is not None:
+            namespace = normalized_namespace
+        filters["type"] = purl_type
+    if namespace is not None:
+        filters["namespace"] = namespace
+    filters["name"] = name
+    if version is not None:
+        filters["version"] = version
+    return filters
+
+
+def clear_purl_cache() -> None:
+    """Drop all cached parse results."""
+    parse_purl.cache_clear()
+    canonicalize_purl.cache_clear()
@@ -0,0 +1,121 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Response fields that carry the next-page token, with the query parameter the token
+# is sent back as. Socket endpoints use one of these styles.
+NEXT_PAGE_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("nextPage", "page"),
+    ("nextPageCursor", "page_cursor"),
+    ("endCursor", "startAfterCursor"),
+    ("nextCursor", "cursor"),
+)
+ITEM_FIELDS: Tuple[str, ...] = ("results", "items", "tokens", "data")
+
+
+class Paginator:
+    """
+    Iterate every item of a paginated endpoint.
+
+    ``fetch`` is called with the query parameters for one page and returns the decoded
+    response, normally by calling the module's existing list method, so errors are logged
+    and handled exactly as they are there. An empty or error response ends iteration.
+
+    The items are read from ``items_key`` or the first list among ``ITEM_FIELDS``. The
+    next-page token is read from the first field of ``NEXT_PAGE_FIELDS`` that is set and
+    sent back as the matching query parameter. Iteration stops when there is no token, the
+    token repeats, a page is empty, or ``max_items`` items have been returned.
+
+    With ``prefetch`` enabled the next page is requested on a background thread as soon
+    as the current one arrives, so the network round trip overlaps the caller's work.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[Dict[str, Any]], Any],
+        params: Optional[Dict[str, Any]] = None,
+        page_size: Optional[int] = None,
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+        page_size_param: str = "per_page",
+        items_key: Optional[str] = None,
+    ):
+        if page_size is not None and page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        if max_items is not None and max_items < 0:
+            raise ValueError("max_items cannot be negative")
+        self.fetch = fetch
+        self.params = dict(params or {})
+        if page_size is not None:
+            self.params[page_size_param] = page_size
+        self.max_items = max_items
+        self.prefetch = prefetch
+        self.items_key = items_key
+        self.pages_fetched = 0
+
+    def page_items(self, page: Any) -> List[Any]:
+        if not isinstance(page, dict):
+            return []
+        if self.items_key is not None:
+            items = page.get(self.items_key)
+            return items if isinstance(items, list) else []
+        for key in ITEM_FIELDS:
+            if isinstance(page.get(key), list):
+                return page[key]
+        return []
+
+    @staticmethod
+    def next_params(page: Any, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the query parameters for the page after ``page``, or None if it was the last."""
+        if not isinstance(page, dict):
+            return None
+        for field, param in NEXT_PAGE_FIELDS:
+            token = page.get(field)
+            if token in (None, "", 0):
+                continue
+            if params.get(param) == token:
+                # The server handed back the cursor we just used; stop instead of looping.
+                return None
+            return {**params, param: token}
+        return None
+
+    def pages(self) -> Iterator[Any]:
+        """Yield each raw page response in order."""
+        if self.max_items == 0:
+            return
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="socketdev-page") if self.prefetch else None
+        pending: Optional[Future] = None
+        params: Optional[Dict[str, Any]] = self.params
+        item_count = 0
+        try:
+            while params is not None:
+                page = pending.result() if pending is not None else self.fetch(params)
+                pending = None
+                self.pages_fetched += 1
+                items = self.page_items(page)
+                item_count += len(items)
+                params = self.next_params(page, params) if items else None
+                if params is not None and self.max_items is not None and item_count >= self.max_items:
+                    params = None
+                if params is not None and executor is not None:
+                    pending = executor.submit(self.fetch, params)
+                yield page
+        finally:
+            if pending is not None:
+                pending.cancel()
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def __iter__(self) -> Iterator[Any]:
+        remaining = self.max_items
+        for page in self.pages():
+            for item in self.page_items(page):
+                if remaining is not None:
+                    if remaining <= 0:
+                        return
+                    remaining -= 1
+                yield item
+
+
+def paginate(fetch: Callable[[Dict[str, Any]], Any], params: Optional[Dict[str, Any]] = None, **kwargs) -> Iterator[Any]:
+    """Shorthand for ``iter(Paginator(fetch, params, **kwargs))``."""
+    return iter(Paginator(fetch, params, **kwargs))
@@ -0,0 +1,191 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+from socketdev.settings import OrgSecurityPolicyResponse, SecurityAction, SecurityPolicyRule
+from socketdev.log import log
+
+# Actions reported individually; every other action is only counted.
+REPORTED_ACTIONS = (SecurityAction.ERROR, SecurityAction.WARN)
+
+
+@dataclass
+class PolicyViolation:
+    action: SecurityAction
+    type: str
+    alert: Any
+    artifact: Optional[Any] = None
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def to_dict(self):
+        alert = self.alert.to_dict() if hasattr(self.alert, "to_dict") else self.alert
+        artifact = self.artifact.to_dict() if hasattr(self.artifact, "to_dict") else self.artifact
+        return {"action": self.action.value, "type": self.type, "alert": alert, "artifact": artifact}
+
+
+@dataclass
+class PolicyResult:
+    evaluated: int = 0
+    counts: Dict[str, int] = field(default_factory=dict)
+    violations: List[PolicyViolation] = field(default_factory=list)
+    stopped_early: bool = False
+
+    @property
+    def errors(self) -> List[PolicyViolation]:
+        return [violation for violation in self.violations if violation.action is SecurityAction.ERROR]
+
+    @property
+    def warnings(self) -> List[PolicyViolation]:
+        return [violation for violation in self.violations if violation.action is SecurityAction.WARN]
+
+    @property
+    def passed(self) -> bool:
+        return not self.counts.get(SecurityAction.ERROR.value)
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def to_dict(self):
+        return {
+            "evaluated": self.evaluated,
+            "counts": dict(self.counts),
+            "violations": [violation.to_dict() for violation in self.violations],
+            "stopped_early": self.stopped_early,
+            "passed": self.passed,
+        }
+
+
+def _action(rule: Any) -> SecurityAction:
+    if isinstance(rule, SecurityPolicyRule):
+        return rule.action
+    if isinstance(rule, Mapping):
+        rule = rule["action"]
+    return SecurityAction(rule)
+
+
+def _artifact_alerts(artifact: Any) -> Iterable[Any]:
+    alerts = artifact.get("alerts") if isinstance(artifact, Mapping) else getattr(artifact, "alerts", None)
+    return alerts or ()
+
+
+class SecurityPolicy:
+    """
+    An organization security policy compiled to an alert type -> action table.
+
+    Build one from ``Settings.get`` output (a dict or ``OrgSecurityPolicyResponse``),
+    from a plain ``{alert_type: action}`` mapping, or with ``SecurityPolicy.fetch``.
+    Alert types missing from the policy, and rules set to ``defer``, resolve to
+    ``default``. Evaluation is a dict lookup per alert, so whole scans can be checked
+    locally; pass ``stop_on_error=True`` to return at the first ``error`` alert.
+    """
+
+    def __init__(
+        self,
+        rules: Optional[Mapping[str, Any]] = None,
+        default: Union[SecurityAction, str] = SecurityAction.IGNORE,
+    ):
+        self.default = SecurityAction(default)
+        if self.default is SecurityAction.DEFER:
+            raise ValueError("default action cannot be defer")
+        self.actions: Dict[str, SecurityAction] = {}
+        for alert_type, rule in (rules or {}).items():
+            action = _action(rule)
+            if action is not SecurityAction.DEFER:
+                self.actions[alert_type] = action
+        # Every listed type maps to its action if it is reported and to None if it is only
+        # counted; unlisted types fall back to the default on the same lookup.
+        self._reported = {
+            alert_type: action if action in REPORTED_ACTIONS else None for alert_type, action in self.actions.items()
+        }
+        self._fallback = self.default if self.default in REPORTED_ACTIONS else None
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: Union[dict, OrgSecurityPolicyResponse],
+        default: Union[SecurityAction, str] = SecurityAction.IGNORE,
+    ) -> "SecurityPolicy":
+        """Compile the output of ``Settings.get``."""
+        if isinstance(settings, OrgSecurityPolicyResponse):
+            rules = settings.securityPolicyRules
+        else:
+            rules = settings.get("securityPolicyRules")
+        return cls(rules, default)
+
+    @classmethod
+    def fetch(
+        cls,
+        sdk,
+        org_slug: str,
+        custom_rules_only: bool = False,
+        default: Union[SecurityAction, str] = SecurityAction.IGNORE,
+    ) -> Optional["SecurityPolicy"]:
+        """
+        Fetch and compile an organization's security policy
+        :param sdk: A ``socketdev`` client; ``settings.get`` is used
+        :param org_slug: The organization whose policy to compile
+        :param custom_rules_only: Only compile the organization's custom rules
+        :param default: Action for alert types the policy does not list
+        :return: SecurityPolicy, or None if the policy could not be fetched
+        """
+        settings = sdk.settings.get(org_slug, custom_rules_only=custom_rules_only)
+        if not settings:
+            log.error(f"Could not compile the security policy for {org_slug}")
+            return None
+        return cls.from_settings(settings, default)
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def action(self, alert_type: str) -> SecurityAction:
+        """Return the action the policy takes for an alert type."""
+        return self.actions.get(alert_type, self.default)
+
+    def evaluate(self, alerts: Iterable[Any], stop_on_error: bool = False) -> PolicyResult:
+        """
+        Evaluate alerts against the policy
+        :param alerts: Alert dicts or ``SocketAlert`` objects; only ``type`` is read
+        :param stop_on_error: Return as soon as an alert resolves to ``error``
+        :return: PolicyResult with per-action counts and the error and warn alerts
+        """
+        return self._evaluate(((alert, None) for alert in alerts), stop_on_error)
+
+    def evaluate_artifacts(self, artifacts: Any, stop_on_error: bool = False) -> PolicyResult:
+        """
+        Evaluate the alerts of full scan or diff artifacts against the policy
+        :param artifacts: A ``FullScans.stream`` result, ``FullScanStreamResponse`` or iterable of artifacts
+        :param stop_on_error: Return as soon as an alert resolves to ``error``
+        :return: PolicyResult whose violations carry the artifact each alert belongs to
+        """
+        if hasattr(artifacts, "artifacts"):
+            artifacts = artifacts.artifacts or {}
+        if isinstance(artifacts, Mapping):
+            artifacts = artifacts.values()
+        return self._evaluate(
+            ((alert, artifact) for artifact in artifacts for alert in _artifact_alerts(artifact)), stop_on_error
+        )
+
+    def _evaluate(self, pairs, stop_on_error: bool) -> PolicyResult:
+        result = PolicyResult()
+        violations = result.violations
+        reported = self._reported.get
+        fallback = self._fallback
+        # Tally alert types and resolve them to actions once at the end; only the
+        # error and warn alerts are materialized as violations.
+        tally: Dict[str, int] = {}
+        tally_get = tally.get
+        for alert, artifact in pairs:
+            alert_type = alert["type"]
+            tally[alert_type] = tally_get(alert_type, 0) + 1
+            action = reported(alert_type, fallback)
+            if action is not None:
+                violations.append(PolicyViolation(action, alert_type, alert, artifact))
+                if stop_on_error and action is SecurityAction.ERROR:
+                    result.stopped_early = True
+                    break
+        counts = dict.fromkeys((action.value for action in SecurityAction if action is not SecurityAction.DEFER), 0)
+        for alert_type, count in tally.items():
+            counts[self.actions.get(alert_type, self.default).value] += count
+        result.counts = counts
+        result.evaluated = sum(tally.values())
+        return result
@@ -0,0 +1,168 @@
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from threading import Lock
+from typing import List, Optional, Tuple
+from socketdev.core.cache import cache_key, default_cache_dir, read_json, write_json
+from socketdev.core.packageurl import purl_key
+
+NEGATIVE_ALERT_TYPES = {"notFound"}
+UNCACHEABLE_ALERT_TYPES = {"pendingScan"}
+
+
+def _alert_types(row: dict) -> set:
+    alerts = row.get("alerts") if isinstance(row, dict) else None
+    if not isinstance(alerts, list):
+        return set()
+    return {alert.get("type") for alert in alerts if isinstance(alert, dict)}
+
+
+def is_negative_result(rows: List[dict]) -> bool:
+    """True when every row for a purl only reports that the package was not found."""
+    return bool(rows) and all(_alert_types(row) and _alert_types(row) <= NEGATIVE_ALERT_TYPES for row in rows)
+
+
+def is_cacheable_result(rows: List[dict]) -> bool:
+    """Rows still waiting on analysis are never cached; their answer is about to change."""
+    return bool(rows) and not any(_alert_types(row) & UNCACHEABLE_ALERT_TYPES for row in rows)
+
+
+@dataclass
+class PurlCacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self):
+        data = asdict(self)
+        data["hits"] = self.hits
+        data["hit_rate"] = self.hit_rate
+        return data
+
+
+class PurlResultCache:
+    """
+    Two-tier cache of batch purl results keyed by org, canonical input purl, license and
+    alerts flags.
+
+    Pass a cache to ``Purl.post`` or ``Purl.bulk``: purls with a fresh entry are answered
+    locally and only the misses are sent. Entries live in an in-memory LRU of
+    ``max_entries`` and, unless ``persist=False``, in a JSON file per purl under the SDK
+    cache directory so results survive across processes and CI jobs.
+
+    Package versions are immutable, but alert data is not, so entries expire after
+    ``ttl`` seconds. ``notFound`` results are cached for ``negative_ttl`` instead, and
+    ``pendingScan`` results are never cached.
+
+    The memory tier holds rows as JSON text, like the disk tier, so every ``get``
+    returns rows that callers can modify without affecting the cache.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 3600,
+        negative_ttl: float = 300,
+        max_entries: int = 10000,
+        cache_dir: Optional[str] = None,
+        persist: bool = True,
+    ):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.cache_dir = os.path.join(cache_dir or default_cache_dir(), "purl-results") if persist else None
+        self.stats = PurlCacheStats()
+        self._memory: "OrderedDict[str, Tuple[float, bool, str]]" = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def key(org_slug: Optional[str], purl: str, license, alerts) -> str:
+        return cache_key(org_slug, purl_key(purl), license, alerts)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _fresh(self, stored_at: float, negative: bool) -> bool:
+        return time.time() - stored_at <= (self.negative_ttl if negative else self.ttl)
+
+    def get(self, org_slug: Optional[str], purl: str, license, alerts) -> Optional[List[dict]]:
+        """Return a copy of the cached rows for ``purl``, or None on a miss."""
+        key = self.key(org_slug, purl, license, alerts)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and self._fresh(entry[0], entry[1]):
+                self._memory.move_to_end(key)
+                self.stats.memory_hits += 1
+                if entry[1]:
+                    self.stats.negative_hits += 1
+                return json.loads(entry[2])
+            if entry is not None:
+                del self._memory[key]
+
+        entry = self._read_disk(key)
+        with self._lock:
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            self.stats.disk_hits += 1
+            if entry[1]:
+                self.stats.negative_hits += 1
+            self._remember(key, entry)
+        return json.loads(entry[2])
+
+    def put(self, org_slug: Optional[str], purl: str, license, alerts, rows: List[dict]) -> bool:
+        """Cache the rows returned for ``purl``. Returns False if they are not cacheable."""
+        if not is_cacheable_result(rows):
+            return False
+        key = self.key(org_slug, purl, license, alerts)
+        entry = (time.time(), is_negative_result(rows), json.dumps(rows, separators=(",", ":")))
+        with self._lock:
+            self._remember(key, entry)
+            self.stats.stores += 1
+        if self.cache_dir is not None:
+            write_json(self._path(key), {"stored_at": entry[0], "negative": entry[1], "rows": json.loads(entry[2])})
+        return True
+
+    def _remember(self, key: str, entry: Tuple[float, bool, str]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _read_disk(self, key: str) -> Optional[Tuple[float, bool, str]]:
+        if self.cache_dir is None:
+            return None
+        data = read_json(self._path(key))
+        if not isinstance(data, dict) or not isinstance(data.get("rows"), list):
+            return None
+        stored_at, negative = data.get("stored_at", 0), bool(data.get("negative"))
+        if not self._fresh(stored_at, negative):
+            return None
+        return stored_at, negative, json.dumps(data["rows"], separators=(",", ":"))
+
+    def clear(self) -> None:
+        """Drop every cached entry from memory and disk."""
+        with self._lock:
+            self._memory.clear()
+        if self.cache_dir is None or not os.path.isdir(self.cache_dir):
+            return
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                try:
+                    os.remove(os.path.join(root, name))
+                except OSError:
+                    pass
@@ -0,0 +1,418 @@
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote
+from socketdev.core.cache import default_cache_dir
+from socketdev.core.packageurl import parse_purl
+from socketdev.core.pagination import ITEM_FIELDS, NEXT_PAGE_FIELDS, Paginator
+
+SCHEMA_VERSION = 1
+DEFAULT_PAGE_SIZE = 100
+# Threat feed order that makes a stored cursor resume where the last sync stopped.
+DEFAULT_SYNC_PARAMS = {"sort": "updated_at", "direction": "asc"}
+_CURSOR_PARAMS = tuple(param for _, param in NEXT_PAGE_FIELDS)
+_QUERY_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS threats (
+    feed TEXT NOT NULL,
+    id TEXT NOT NULL,
+    purl TEXT NOT NULL,
+    package_key TEXT NOT NULL,
+    threat_type TEXT,
+    updated_at TEXT,
+    PRIMARY KEY (feed, id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS threats_package ON threats (package_key);
+CREATE TABLE IF NOT EXISTS cursors (
+    feed TEXT NOT NULL,
+    query TEXT NOT NULL,
+    cursor TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (feed, query)
+) WITHOUT ROWID;
+"""
+
+# (id, purl, threat_type)
+ThreatRow = Tuple[str, str, Optional[str]]
+
+
+def package_key(purl: str) -> str:
+    """
+    Reduce a purl to a cheap, case-folded ``pkg:type/namespace/name`` key.
+
+    The key drops the version, qualifiers and subpath and undoes percent-encoding
+    without a full parse, so it can be computed for every dependency of a build. It is
+    only used to find candidate threats; matches are confirmed on the parsed purl.
+    """
+    if "?" in purl:
+        purl = purl.split("?", 1)[0]
+    if "#" in purl:
+        purl = purl.split("#", 1)[0]
+    at = purl.find("@", purl.rfind("/") + 1)
+    if at != -1:
+        purl = purl[:at]
+    if "%" in purl:
+        purl = purl.replace("%40", "@")
+        if "%" in purl:
+            purl = unquote(purl)
+    return purl.lower().replace("_", "-")
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    Sized for ``capacity`` keys at ``false_positive_rate``. Positions come from Python's
+    string hash, so a filter is only meaningful within the process that built it.
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float = 0.001):
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("false_positive_rate must be between 0 and 1")
+        capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, key: str) -> None:
+        value = hash(key) & 0xFFFFFFFFFFFFFFFF
+        position, step = value & 0xFFFFFFFF, (value >> 32) | 1
+        size, bits = self.size, self.bits
+        for _ in range(self.hashes):
+            bit = position % size
+            bits[bit >> 3] |= 1 << (bit & 7)
+            position += step
+
+    def __contains__(self, key: str) -> bool:
+        value = hash(key) & 0xFFFFFFFFFFFFFFFF
+        position, step = value & 0xFFFFFFFF, (value >> 32) | 1
+        size, bits = self.size, self.bits
+        for _ in range(self.hashes):
+            bit = position % size
+            if not bits[bit >> 3] & (1 << (bit & 7)):
+                return False
+            position += step
+        return True
+
+
+@dataclass
+class ThreatMatch:
+    purl: str
+    threat_purl: str
+    threat_type: Optional[str]
+    id: str
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass
+class ThreatFeedDelta:
+    feed: Optional[str]
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    pages: int = 0
+    total: int = 0
+    elapsed_sec: float = 0.0
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def _identity(purl: str) -> Optional[Tuple[str, Optional[str], str, Optional[str]]]:
+    try:
+        parsed = parse_purl(purl)
+    except ValueError:
+        return None
+    return parsed.type, parsed.namespace, parsed.name, parsed.version
+
+
+class ThreatIndex:
+    """
+    In-memory membership index over threat feed purls.
+
+    The index holds only the ``package_key`` of each threatened package, in a hash set
+    or, with ``bloom=True``, in a much smaller ``BloomFilter``. Each dependency is reduced
+    to its key and looked up; only the rare hits are confirmed, by fetching the threat
+    rows for those keys through ``lookup`` and comparing parsed purls. A threat purl
+    without a version matches every version of the package.
+
+    ``ThreatFeedStore.index`` builds an index backed by the store. ``from_rows`` builds
+    one from ``(id, purl, threat_type)`` rows held in memory.
+    """
+
+    def __init__(
+        self,
+        keys: Iterable[str],
+        lookup: Callable[[List[str]], Iterable[ThreatRow]],
+        bloom: bool = False,
+        false_positive_rate: float = 0.001,
+    ):
+        self.lookup = lookup
+        keys = keys if isinstance(keys, (set, frozenset)) else set(keys)
+        self._count = len(keys)
+        if bloom:
+            self._members = BloomFilter(len(keys), false_positive_rate)
+            for key in keys:
+                self._members.add(key)
+        else:
+            self._members = keys
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[ThreatRow], bloom: bool = False, false_positive_rate: float = 0.001) -> "ThreatIndex":
+        """Build an index over ``(id, purl, threat_type)`` rows kept in memory."""
+        threats: Dict[str, List[ThreatRow]] = {}
+        for row in rows:
+            threats.setdefault(package_key(row[1]), []).append(row)
+        return cls(
+            set(threats), lambda keys: [row for key in keys for row in threats.get(key, ())], bloom, false_positive_rate
+        )
+
+    def __len__(self) -> int:
+        """Number of distinct threatened packages."""
+        return self._count
+
+    def __contains__(self, purl: str) -> bool:
+        return bool(self.check([purl]))
+
+    def check(self, purls: Iterable[str]) -> List[ThreatMatch]:
+        """
+        Screen dependencies against the threat feed
+        :param purls: Dependency purls
+        :return: ThreatMatch for each dependency that matches a threat, in input order
+        """
+        members = self._members
+        candidates = []
+        for purl in purls:
+            if purl:
+                key = package_key(purl)
+                if key in members:
+                    candidates.append((key, purl))
+        if not candidates:
+            return []
+
+        threats: Dict[str, list] = {}
+        for threat_id, threat_purl, threat_type in self.lookup(list({key for key, _ in candidates})):
+            identity = _identity(threat_purl)
+            if identity is not None:
+                threats.setdefault(package_key(threat_purl), []).append((identity, threat_purl, threat_type, threat_id))
+        matches = []
+        for key, purl in candidates:
+            identity = _identity(purl) if key in threats else None
+            if identity is None:
+                continue
+            for threat_identity, threat_purl, threat_type, threat_id in threats[key]:
+                if threat_identity[:3] == identity[:3] and threat_identity[3] in (None, identity[3]):
+                    matches.append(ThreatMatch(purl, threat_purl, threat_type, str(threat_id)))
+                    break
+        return matches
+
+
+class ThreatFeedStore:
+    """
+    SQLite copy of the threat feed, kept current by incremental syncs.
+
+    ``sync`` pages through the feed in ``updated_at`` order starting from the cursor
+    stored by the previous sync, so only new and changed entries are downloaded.
+    Entries with ``removedAt`` set are deleted. Each page is committed with the cursor
+    that follows it, so an interrupted sync resumes where it stopped. Only the id, purl,
+    threat type and update time of each entry are stored.
+
+    ``index`` builds a ``ThreatIndex`` for screening dependencies without API calls.
+    The database defaults to ``threat-feed.sqlite3`` in the SDK cache directory.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(default_cache_dir(), "threat-feed.sqlite3")
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM threats").fetchone()[0]
+
+    def cursor(self, org_slug: Optional[str] = None, **params) -> Optional[dict]:
+        """Return the stored resume cursor for a feed and query, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cursor FROM cursors WHERE feed = ? AND query = ?", (org_slug or "", self._query(params))
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    @staticmethod
+    def _query(params: Dict[str, Any]) -> str:
+        query = {**DEFAULT_SYNC_PARAMS, **params}
+        return json.dumps({key: query[key] for key in sorted(query) if key not in _CURSOR_PARAMS and key != "per_page"})
+
+    def sync(
+        self,
+        sdk,
+        org_slug: Optional[str] = None,
+        per_page: int = DEFAULT_PAGE_SIZE,
+        full: bool = False,
+        max_pages: Optional[int] = None,
+        **params,
+    ) -> ThreatFeedDelta:
+        """
+        Download threat feed entries added or changed since the last sync
+        :param sdk: A ``socketdev`` client; ``threatfeed.get_page`` is used
+        :param org_slug: Organization slug; None syncs the deprecated global feed
+        :param per_page: Entries requested per page
+        :param full: Ignore the stored cursor and page through the whole feed
+        :param max_pages: Stop after this many pages; the next sync continues from there
+        :param params: Additional query parameters such as a threat type filter
+        :return: ThreatFeedDelta with the entries added, updated and removed
+        :raises APIFailure: if a page cannot be fetched. Pages before it stay synced, and
+            the stored cursor points at the failed page so the next sync retries it
+        """
+        start = time.monotonic()
+        feed = org_slug or ""
+        query_key = self._query(params)
+        query = {**DEFAULT_SYNC_PARAMS, **params, "per_page": per_page}
+        stored = None if full else self.cursor(org_slug, **params)
+        page_params = {**query, **(stored or {})}
+        delta = ThreatFeedDelta(org_slug)
+        while True:
+            page = sdk.threatfeed.get_page(org_slug, **page_params)
+            items = self._page_items(page)
+            next_params = Paginator.next_params(page, page_params) if items else None
+            # The last page is read again next time, since new entries are appended to it.
+            resume = next_params if next_params is not None else page_params
+            self._apply(feed, items, query_key, {k: resume[k] for k in _CURSOR_PARAMS if k in resume}, delta)
+            delta.pages += 1
+            if next_params is None or (max_pages is not None and delta.pages >= max_pages):
+                break
+            page_params = next_params
+        with self._lock:
+            delta.total = self._conn.execute("SELECT COUNT(*) FROM threats WHERE feed = ?", (feed,)).fetchone()[0]
+        delta.elapsed_sec = time.monotonic() - start
+        return delta
+
+    @staticmethod
+    def _page_items(page: Any) -> List[dict]:
+        if not isinstance(page, dict):
+            return []
+        for key in ITEM_FIELDS:
+            if isinstance(page.get(key), list):
+                return [item for item in page[key] if isinstance(item, dict)]
+        return []
+
+    def _apply(self, feed: str, items: List[dict], query_key: str, cursor: dict, delta: ThreatFeedDelta) -> None:
+        upserts, removals = {}, set()
+        for item in items:
+            threat_id = item.get("id")
+            if threat_id is None:
+                continue
+            threat_id = str(threat_id)
+            if item.get("removedAt"):
+                removals.add(threat_id)
+                upserts.pop(threat_id, None)
+            elif item.get("purl"):
+                upserts[threat_id] = item
+                removals.discard(threat_id)
+        with self._lock, self._conn:
+            existing = {}
+            ids = list(upserts) + list(removals)
+            for start in range(0, len(ids), _QUERY_CHUNK):
+                chunk = ids[start : start + _QUERY_CHUNK]
+                existing.update(
+                    self._conn.execute(
+                        "SELECT id, updated_at FROM threats WHERE feed = ? AND id IN (" + ",".join("?" * len(chunk)) + ")",
+                        [feed, *chunk],
+                    ).fetchall()
+                )
+            for threat_id, item in upserts.items():
+                if threat_id not in existing:
+                    delta.added += 1
+                elif existing[threat_id] != item.get("updatedAt"):
+                    delta.updated += 1
+            delta.removed += sum(1 for threat_id in removals if threat_id in existing)
+            self._conn.executemany(
+                "INSERT INTO threats (feed, id, purl, package_key, threat_type, updated_at) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (feed, id) DO UPDATE SET purl = excluded.purl, package_key = excluded.package_key, "
+                "threat_type = excluded.threat_type, updated_at = excluded.updated_at",
+                (
+                    (feed, threat_id, item["purl"], package_key(item["purl"]), item.get("threatType"), item.get("updatedAt"))
+                    for threat_id, item in upserts.items()
+                ),
+            )
+            self._conn.executemany(
+                "DELETE FROM threats WHERE feed = ? AND id = ?", ((feed, threat_id) for threat_id in removals)
+            )
+            self._conn.execute(
+                "INSERT INTO cursors (feed, query, cursor, synced_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (feed, query) DO UPDATE SET cursor = excluded.cursor, synced_at = excluded.synced_at",
+                (feed, query_key, json.dumps(cursor), time.time()),
+            )
+
+    def rows(self, org_slug: Optional[str] = None) -> List[ThreatRow]:
+        """Return every stored ``(id, purl, threat_type)`` entry of a feed."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, purl, threat_type FROM threats WHERE feed = ?", (org_slug or "",)
+            ).fetchall()
+
+    def lookup(self, keys: List[str], org_slug: Optional[str] = None) -> List[ThreatRow]:
+        """Return the stored entries whose ``package_key`` is one of ``keys``."""
+        rows = []
+        with self._lock:
+            for start in range(0, len(keys), _QUERY_CHUNK):
+                chunk = keys[start : start + _QUERY_CHUNK]
+                rows.extend(
+                    self._conn.execute(
+                        "SELECT id, purl, threat_type FROM threats WHERE feed = ? AND package_key IN ("
+                        + ",".join("?" * len(chunk))
+                        + ")",
+                        [org_slug or "", *chunk],
+                    )
+                )
+        return rows
+
+    def index(
+        self, org_slug: Optional[str] = None, bloom: bool = False, false_positive_rate: float = 0.001
+    ) -> ThreatIndex:
+        """
+        Build a membership index over the stored feed
+        :param org_slug: The feed to index; None for the global feed
+        :param bloom: Hold the package keys in a Bloom filter instead of a hash set
+        :param false_positive_rate: Bloom filter false positive rate
+        :return: ThreatIndex
+        """
+        with self._lock:
+            keys = {
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT DISTINCT package_key FROM threats WHERE feed = ?", (org_slug or "",)
+                )
+            }
+        return ThreatIndex(keys, lambda candidates: self.lookup(candidates, org_slug), bloom, false_positive_rate)
@@ -0,0 +1,375 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from socketdev.core.cache import default_cache_dir
+from socketdev.core.packageurl import artifact_purl, package_filter, package_identity, purl_key
+from socketdev.export.local import ArtifactSource, iter_artifacts
+from socketdev.log import log
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    scan_id TEXT PRIMARY KEY,
+    org_slug TEXT NOT NULL,
+    repo TEXT,
+    branch TEXT,
+    commit_hash TEXT,
+    ingested_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS licenses (
+    license_id INTEGER PRIMARY KEY,
+    expression TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    artifact_id TEXT PRIMARY KEY,
+    purl TEXT NOT NULL,
+    type TEXT NOT NULL,
+    namespace TEXT,
+    name TEXT NOT NULL,
+    version TEXT,
+    license_id INTEGER REFERENCES licenses (license_id),
+    score_overall REAL,
+    size INTEGER
+);
+CREATE TABLE IF NOT EXISTS scan_artifacts (
+    scan_id TEXT NOT NULL REFERENCES scans (scan_id) ON DELETE CASCADE,
+    artifact_id TEXT NOT NULL REFERENCES artifacts (artifact_id),
+    direct INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (scan_id, artifact_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS manifest_refs (
+    scan_id TEXT NOT NULL REFERENCES scans (scan_id) ON DELETE CASCADE,
+    artifact_id TEXT NOT NULL,
+    file TEXT NOT NULL,
+    start INTEGER,
+    "end" INTEGER
+);
+CREATE TABLE IF NOT EXISTS alerts (
+    scan_id TEXT NOT NULL REFERENCES scans (scan_id) ON DELETE CASCADE,
+    artifact_id TEXT NOT NULL,
+    key TEXT,
+    type TEXT NOT NULL,
+    severity TEXT,
+    category TEXT,
+    action TEXT,
+    file TEXT,
+    props TEXT
+);
+CREATE INDEX IF NOT EXISTS scans_repo ON scans (org_slug, repo, ingested_at);
+CREATE INDEX IF NOT EXISTS artifacts_purl ON artifacts (purl);
+CREATE INDEX IF NOT EXISTS artifacts_name ON artifacts (name, version);
+CREATE INDEX IF NOT EXISTS scan_artifacts_artifact ON scan_artifacts (artifact_id);
+CREATE INDEX IF NOT EXISTS manifest_refs_scan ON manifest_refs (scan_id, artifact_id);
+CREATE INDEX IF NOT EXISTS alerts_scan ON alerts (scan_id);
+CREATE INDEX IF NOT EXISTS alerts_type ON alerts (type);
+CREATE INDEX IF NOT EXISTS alerts_severity ON alerts (severity);
+"""
+
+# The most recently ingested scan of each repository; scans ingested without a repo stand on their own.
+_LATEST_SCANS = """
+SELECT scan_id FROM (
+    SELECT scan_id, ROW_NUMBER() OVER (
+        PARTITION BY org_slug, COALESCE(repo, scan_id) ORDER BY ingested_at DESC
+    ) AS rank FROM scans
+) WHERE rank = 1
+"""
+
+
+def _direct(value) -> int:
+    return 1 if str(value).lower() == "true" else 0
+
+
+class ScanWarehouse:
+    """
+    Embedded SQLite store of streamed full scans for fast org-wide queries.
+
+    ``ingest`` writes one scan's artifacts, alerts, license expressions and manifest
+    references in a single transaction. Package rows are shared between scans, and the
+    tables are indexed on purl, name, alert type, severity and repository. Queries such as
+    ``repos_using`` and ``alerts`` then answer without re-streaming anything.
+
+    Queries look at the most recently ingested scan of each repository unless
+    ``latest_only=False``. The database defaults to ``warehouse.sqlite3`` in the SDK
+    cache directory. A warehouse can be shared between threads; access is serialized.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(default_cache_dir(), "warehouse.sqlite3")
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            # Unlike a cache, ingested scans cannot simply be refetched, so the file is left alone.
+            self._conn.close()
+            raise ValueError(
+                f"{self.path} is a scan warehouse of schema version {version}; this SDK reads version {SCHEMA_VERSION}"
+            )
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def ingest(
+        self,
+        org_slug: str,
+        scan_id: str,
+        artifacts: ArtifactSource,
+        repo: Optional[str] = None,
+        branch: Optional[str] = None,
+        commit_hash: Optional[str] = None,
+    ) -> int:
+        """
+        Store one full scan, replacing any earlier copy of the same scan
+        :param org_slug: The organization the scan belongs to
+        :param scan_id: The full scan id
+        :param artifacts: FullScans.stream() result, iterable of artifacts, or NDJSON path
+        :param repo: Repository the scan belongs to; used by repo filters and latest_only
+        :param branch: Optional branch name
+        :param commit_hash: Optional commit hash
+        :return: Number of artifacts stored
+        """
+        package_rows = []
+        scan_rows = []
+        manifest_rows = []
+        alert_rows = []
+        expressions = {}
+        for artifact in iter_artifacts(artifacts):
+            artifact_id = str(artifact["id"])
+            license_expression = artifact.get("license") or None
+            if license_expression:
+                expressions[license_expression] = None
+            score = artifact.get("score") or {}
+            purl_type, namespace, name, version = package_identity(artifact)
+            package_rows.append(
+                (
+                    artifact_id,
+                    purl_key(artifact_purl(artifact)),
+                    purl_type,
+                    namespace or None,
+                    name,
+                    version,
+                    license_expression,
+                    score.get("overall") if isinstance(score, dict) else None,
+                    artifact.get("size"),
+                )
+            )
+            scan_rows.append((scan_id, artifact_id, _direct(artifact.get("direct"))))
+            for ref in artifact.get("manifestFiles") or []:
+                manifest_rows.append((scan_id, artifact_id, ref.get("file"), ref.get("start"), ref.get("end")))
+            for alert in artifact.get("alerts") or []:
+                alert_rows.append(
+                    (
+                        scan_id,
+                        artifact_id,
+                        alert.get("key"),
+                        alert.get("type") or "",
+                        getattr(alert.get("severity"), "value", alert.get("severity")),
+                        getattr(alert.get("category"), "value", alert.get("category")),
+                        alert.get("action"),
+                        alert.get("file"),
+                        json.dumps(alert["props"], separators=(",", ":")) if alert.get("props") else None,
+                    )
+                )
+
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM scans WHERE scan_id = ?", (scan_id,))
+            self._conn.execute(
+                "INSERT INTO scans (scan_id, org_slug, repo, branch, commit_hash, ingested_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (scan_id, org_slug, repo, branch, commit_hash, time.time()),
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO licenses (expression) VALUES (?)", ((expression,) for expression in expressions)
+            )
+            license_ids = dict(self._conn.execute("SELECT expression, license_id FROM licenses").fetchall())
+            self._conn.executemany(
+                "INSERT INTO artifacts (artifact_id, purl, type, namespace, name, version, license_id, score_overall, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (artifact_id) DO UPDATE SET "
+                "license_id = excluded.license_id, score_overall = excluded.score_overall, size = excluded.size",
+                (row[:6] + (license_ids.get(row[6]),) + row[7:] for row in package_rows),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO scan_artifacts (scan_id, artifact_id, direct) VALUES (?, ?, ?)", scan_rows
+            )
+            self._conn.executemany(
+                'INSERT INTO manifest_refs (scan_id, artifact_id, file, start, "end") VALUES (?, ?, ?, ?, ?)', manifest_rows
+            )
+            self._conn.executemany(
+                "INSERT INTO alerts (scan_id, artifact_id, key, type, severity, category, action, file, props) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                alert_rows,
+            )
+        return len(package_rows)
+
+    def ingest_from_api(self, sdk, org_slug: str, scan_ids: Iterable[str], concurrency: int = 4) -> Dict[str, int]:
+        """
+        Stream full scans and their metadata from the API and ingest them
+        :param sdk: A ``socketdev`` client; ``fullscans.stream`` and ``fullscans.metadata`` are used
+        :param org_slug: The organization the scans belong to
+        :param scan_ids: Full scan ids to ingest
+        :param concurrency: Number of scans fetched at once; writes stay sequential
+        :return: Artifacts stored per scan id; scans that could not be fetched are left out
+        """
+        scan_ids = list(dict.fromkeys(scan_ids))
+
+        def fetch(scan_id):
+            return sdk.fullscans.metadata(org_slug, scan_id) or {}, sdk.fullscans.stream(org_slug, scan_id)
+
+        counts = {}
+        if not scan_ids:
+            return counts
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(scan_ids)))) as executor:
+            futures = {executor.submit(fetch, scan_id): scan_id for scan_id in scan_ids}
+            for future in as_completed(futures):
+                scan_id = futures[future]
+                try:
+                    metadata, artifacts = future.result()
+                except Exception as error:
+                    log.error(f"Failed to fetch full scan {scan_id}: {error}")
+                    continue
+                if not artifacts:
+                    log.error(f"Full scan {scan_id} returned no artifacts; not ingested")
+                    continue
+                counts[scan_id] = self.ingest(
+                    org_slug,
+                    scan_id,
+                    artifacts,
+                    repo=metadata.get("repo") or metadata.get("repository_slug"),
+                    branch=metadata.get("branch"),
+                    commit_hash=metadata.get("commit_hash"),
+                )
+        return counts
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[dict]:
+        """
+        Run a read-only SQL query against the warehouse tables and return dict rows
+        :raises sqlite3.OperationalError: if the statement would modify the database
+        """
+        with self._lock:
+            self._conn.execute("PRAGMA query_only=ON")
+            try:
+                return [dict(row) for row in self._conn.execute(sql, params).fetchall()]
+            finally:
+                self._conn.execute("PRAGMA query_only=OFF")
+
+    def _scope(self, clauses: List[str], params: List[Any], org_slug, repo, latest_only, scan_column="s.scan_id"):
+        if org_slug is not None:
+            clauses.append("s.org_slug = ?")
+            params.append(org_slug)
+        if repo is not None:
+            clauses.append("s.repo = ?")
+            params.append(repo)
+        if latest_only:
+            clauses.append(f"{scan_column} IN ({_LATEST_SCANS})")
+
+    def repos_using(
+        self,
+        name: str,
+        version: Optional[str] = None,
+        type: Optional[str] = None,
+        namespace: Optional[str] = None,
+        org_slug: Optional[str] = None,
+        latest_only: bool = True,
+    ) -> List[dict]:
+        """
+        Find the repositories and scans that contain a package
+        :param name: Package name, or a purl such as "pkg:npm/lodash@4.17.21". Matched with
+            ``socketdev.core.packageurl.package_filter``, so a purl is compared in canonical form
+            and a purl without a version matches every version
+        :param version: Optional exact version
+        :param type: Optional ecosystem such as "npm" or "pypi"
+        :param namespace: Optional namespace or scope
+        :param org_slug: Optional organization filter
+        :param latest_only: Only consider the most recently ingested scan of each repository
+        :return: Rows with repo, scan_id, branch, purl, version and direct
+        """
+        clauses, params = [], []
+        for column, value in package_filter(name, version, type, namespace).items():
+            clauses.append("COALESCE(a.namespace, '') = ?" if column == "namespace" else f"a.{column} = ?")
+            params.append(value)
+        self._scope(clauses, params, org_slug, None, latest_only)
+        return self.query(
+            "SELECT s.org_slug, s.repo, s.scan_id, s.branch, a.purl, a.version, sa.direct "
+            "FROM artifacts a JOIN scan_artifacts sa ON sa.artifact_id = a.artifact_id "
+            "JOIN scans s ON s.scan_id = sa.scan_id WHERE " + " AND ".join(clauses) + " ORDER BY s.repo, a.purl",
+            params,
+        )
+
+    def alerts(
+        self,
+        severity: Optional[str] = None,
+        type: Optional[str] = None,
+        repo: Optional[str] = None,
+        org_slug: Optional[str] = None,
+        action: Optional[str] = None,
+        latest_only: bool = True,
+        limit: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        List alerts across scans
+        :param severity: Optional severity such as "critical"
+        :param type: Optional alert type such as "criticalCVE"
+        :param repo: Optional repository filter
+        :param org_slug: Optional organization filter
+        :param action: Optional policy action such as "error"
+        :param latest_only: Only consider the most recently ingested scan of each repository
+        :param limit: Optional maximum number of rows
+        :return: Rows with repo, scan_id, purl, type, severity, category, action, file and props
+        """
+        clauses, params = ["1 = 1"], []
+        for column, value in (("severity", severity), ("type", type), ("action", action)):
+            if value is not None:
+                clauses.append(f"al.{column} = ?")
+                params.append(value)
+        self._scope(clauses, params, org_slug, repo, latest_only, "al.scan_id")
+        sql = (
+            "SELECT s.repo, al.scan_id, a.purl, al.key, al.type, al.severity, al.category, al.action, al.file, al.props "
+            "FROM alerts al JOIN scans s ON s.scan_id = al.scan_id JOIN artifacts a ON a.artifact_id = al.artifact_id "
+            "WHERE " + " AND ".join(clauses) + " ORDER BY s.repo, a.purl, al.type"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        rows = self.query(sql, params)
+        for row in rows:
+            row["props"] = json.loads(row["props"]) if row["props"] else None
+        return rows
+
+    def scan_packages(self, scan_id: str) -> List[dict]:
+        """Return every package in a scan with its license expression and manifest files."""
+        rows = self.query(
+            "SELECT a.artifact_id, a.purl, a.type, a.namespace, a.name, a.version, l.expression AS license, sa.direct "
+            "FROM scan_artifacts sa JOIN artifacts a ON a.artifact_id = sa.artifact_id "
+            "LEFT JOIN licenses l ON l.license_id = a.license_id WHERE sa.scan_id = ? ORDER BY a.purl",
+            (scan_id,),
+        )
+        manifests: Dict[str, List[str]] = {}
+        for ref in self.query("SELECT artifact_id, file FROM manifest_refs WHERE scan_id = ?", (scan_id,)):
+            manifests.setdefault(ref["artifact_id"], []).append(ref["file"])
+        for row in rows:
+            row["manifestFiles"] = manifests.get(row["artifact_id"], [])
+        return rows
+
+    def delete_scan(self, scan_id: str) -> None:
+        """Remove a scan and its alerts and manifest references; shared package rows are kept."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM scans WHERE scan_id = ?", (scan_id,))
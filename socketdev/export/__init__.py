@@ -1,10 +1,24 @@
+import codecs
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlencode
 from dataclasses import dataclass, asdict
-from typing import Optional
+from typing import Dict, Iterable, Optional
 import logging
+from socketdev.export.local import (
+    ArtifactSource,
+    Output,
+    open_output,
+    write_cdx_bom,
+    write_openvex_bom,
+    write_spdx_bom,
+)
 
 log = logging.getLogger("socketdev")
 
+EXPORT_FORMATS = ("cdx", "spdx", "openvex")
+
 
 @dataclass
 class ExportQueryParams:
@@ -23,6 +37,9 @@ class ExportQueryParams:
 
 
 class Export:
+    DEFAULT_CHUNK_SIZE = 1024 * 1024
+    DEFAULT_MAX_WORKERS = 4
+
     def __init__(self, api):
         self.api = api
 
@@ -98,3 +115,121 @@ class Export:
         log.error(response.text)
         return {}
 
+    def cdx_bom_local(
+        self, artifacts: ArtifactSource, output: Output, query_params: Optional[ExportQueryParams] = None
+    ) -> int:
+        """
+        Build a CycloneDX SBOM locally from full scan artifacts, without an API round trip
+        :param artifacts: The result of fullscans.stream(), an iterable of artifacts, or a path to cached NDJSON
+        :param output: Path or text file object the document is written to incrementally
+        :param query_params: Optional[ExportQueryParams] - author and project_* fields fill in the metadata
+        :return: int - Number of components written
+        """
+        return write_cdx_bom(artifacts, output, query_params)
+
+    def spdx_bom_local(
+        self, artifacts: ArtifactSource, output: Output, query_params: Optional[ExportQueryParams] = None
+    ) -> int:
+        """
+        Build an SPDX SBOM locally from full scan artifacts, without an API round trip
+        :param artifacts: The result of fullscans.stream(), an iterable of artifacts, or a path to cached NDJSON
+        :param output: Path or text file object the document is written to incrementally
+        :param query_params: Optional[ExportQueryParams] - author and project_name fill in the creation info
+        :return: int - Number of packages written
+        """
+        return write_spdx_bom(artifacts, output, query_params)
+
+    def openvex_bom_local(
+        self, artifacts: ArtifactSource, output: Output, query_params: Optional[ExportQueryParams] = None
+    ) -> int:
+        """
+        Build an OpenVEX document locally from the vulnerability alerts of full scan artifacts
+        :param artifacts: The result of fullscans.stream(), an iterable of artifacts, or a path to cached NDJSON
+        :param output: Path or text file object the document is written to incrementally
+        :param query_params: Optional[ExportQueryParams] - author is recorded as the document author
+        :return: int - Number of statements written
+        """
+        return write_openvex_bom(artifacts, output, query_params)
+
+    def download(
+        self,
+        format: str,
+        org_slug: str,
+        id: str,
+        output: Output,
+        query_params: Optional[ExportQueryParams] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """
+        Stream an export straight to a file without decoding it
+        :param format: String - One of "cdx", "spdx" or "openvex"
+        :param org_slug: String - The slug of the organization
+        :param id: String - The id of either a full scan or an sbom report
+        :param output: Path or file object; paths are written atomically
+        :param query_params: Optional[ExportQueryParams] - Query parameters for filtering
+        :param chunk_size: int - Bytes read from the response at a time
+        :return: int - Bytes written, or 0 if the export failed
+        """
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"format must be one of {', '.join(EXPORT_FORMATS)}, got {format!r}")
+        path = f"orgs/{org_slug}/export/{format}/{id}"
+        if query_params:
+            path += query_params.to_query_params()
+        response = self.api.do_request(path=path, stream=True)
+        try:
+            if response.status_code != 200:
+                log.error(f"Error exporting {format} BOM: {response.status_code}")
+                log.error(response.text)
+                return 0
+            written = 0
+            with open_output(output, binary=True) as out:
+                # Text streams get the body decoded incrementally; everything else gets raw bytes.
+                decoder = codecs.getincrementaldecoder("utf-8")() if isinstance(out, io.TextIOBase) else None
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if not chunk:
+                        continue
+                    out.write(decoder.decode(chunk) if decoder else chunk)
+                    written += len(chunk)
+                if decoder:
+                    out.write(decoder.decode(b"", final=True))
+            return written
+        finally:
+            response.close()
+
+    def download_many(
+        self,
+        format: str,
+        org_slug: str,
+        ids: Iterable[str],
+        output_dir: str,
+        query_params: Optional[ExportQueryParams] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> Dict[str, Optional[str]]:
+        """
+        Export several full scans or sbom reports concurrently, each to its own file
+        :param format: String - One of "cdx", "spdx" or "openvex"
+        :param org_slug: String - The slug of the organization
+        :param ids: Iterable[str] - Ids of full scans or sbom reports
+        :param output_dir: String - Directory for the "<id>.<format>.json" files; created if missing
+        :param query_params: Optional[ExportQueryParams] - Query parameters applied to every export
+        :param max_workers: int - Number of exports in flight at once
+        :return: dict - Maps each id to the file written, or None if its export failed
+        """
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"format must be one of {', '.join(EXPORT_FORMATS)}, got {format!r}")
+        ids = list(dict.fromkeys(ids))
+        os.makedirs(output_dir, exist_ok=True)
+
+        def export_one(export_id: str) -> Optional[str]:
+            target = os.path.join(output_dir, f"{export_id}.{format}.json")
+            try:
+                if self.download(format, org_slug, export_id, target, query_params):
+                    return target
+            except Exception as error:
+                log.error(f"Error exporting {format} BOM for {export_id}: {error}")
+            return None
+
+        if not ids:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(ids)))) as executor:
+            return dict(zip(ids, executor.map(export_one, ids)))
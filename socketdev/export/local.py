@@ -0,0 +1,288 @@
+"""
+Build CycloneDX, SPDX and OpenVEX documents locally from full-scan artifacts.
+
+The writers take the result of ``FullScans.stream`` (a dict of artifacts or a
+``FullScanStreamResponse``), any iterable of artifact dicts, or the path to a cached
+NDJSON stream, and write the document to a path or file object as they go. Only the
+current artifact is held in memory; sections that must follow the main array (such
+as CycloneDX ``dependencies``) are spooled to a temporary file and appended at the end.
+"""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from typing import IO, Any, Iterable, Iterator, List, Optional, Tuple, Union
+from socketdev.core.packageurl import artifact_purl
+from socketdev.version import __version__
+
+TOOL_NAME = "socketdev-python-sdk"
+CYCLONEDX_SPEC_VERSION = "1.5"
+SPDX_VERSION = "SPDX-2.3"
+OPENVEX_CONTEXT = "https://openvex.dev/ns/v0.2.0"
+
+_dumps = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+_SPDX_ID_INVALID = re.compile(r"[^A-Za-z0-9.\-]")
+
+ArtifactSource = Union[str, os.PathLike, dict, Iterable[Any], Any]
+Output = Union[str, os.PathLike, IO]
+
+
+def _read_ndjson(path: Union[str, os.PathLike]) -> Iterator[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip().strip('"').strip()
+            if line:
+                yield json.loads(line)
+
+
+def iter_artifacts(source: ArtifactSource) -> Iterator[dict]:
+    """
+    Yield artifact dicts from a stream result, an iterable of artifacts or an NDJSON file
+    :param source: FullScans.stream() result (dict or FullScanStreamResponse), iterable of artifacts, or NDJSON path
+    :return: Iterator of artifact dicts, deduplicated by id; summary and error lines are skipped
+    """
+    if isinstance(source, (str, os.PathLike)):
+        items = _read_ndjson(source)
+    else:
+        items = getattr(source, "artifacts", source)
+        if items is None:
+            return
+        if isinstance(items, dict):
+            items = items.values()
+    seen = set()
+    for item in items:
+        if not isinstance(item, dict):
+            item = item.to_dict()
+            item["type"] = getattr(item["type"], "value", item["type"])
+        artifact_id = item.get("id")
+        if not artifact_id or not item.get("type") or artifact_id in seen:
+            continue
+        seen.add(artifact_id)
+        yield item
+
+
+def _timestamp() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+def _param(query_params, name: str) -> Optional[str]:
+    return getattr(query_params, name, None) if query_params is not None else None
+
+
+@contextmanager
+def open_output(output: Output, binary: bool = False):
+    """Yield ``output`` if it is already a file object, else a temp file renamed onto the path on success."""
+    if hasattr(output, "write"):
+        yield output
+        return
+    # Write next to the destination and rename so readers never see a partial document.
+    directory = os.path.dirname(os.path.abspath(output))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "wb" if binary else "w", encoding=None if binary else "utf-8", buffering=1 << 20) as f:
+            yield f
+        os.replace(tmp_path, output)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _write_document(output: Output, header: dict, arrays: List[str], entries: Iterator[Tuple[int, Any]]) -> int:
+    """
+    Write ``header`` followed by one JSON array per name in ``arrays``.
+
+    ``entries`` yields ``(array_index, value)`` pairs. The first array is written straight
+    to the output; the others are spooled and appended once ``entries`` is exhausted.
+    Returns the number of values written to the first array.
+    """
+    spools = [tempfile.TemporaryFile("w+", encoding="utf-8") for _ in arrays[1:]]
+    counts = [0] * len(arrays)
+    try:
+        with open_output(output) as out:
+            out.write(_dumps(header)[:-1])
+            out.write(f',"{arrays[0]}":[')
+            targets = [out] + spools
+            for index, value in entries:
+                target = targets[index]
+                if counts[index]:
+                    target.write(",")
+                target.write(_dumps(value))
+                counts[index] += 1
+            out.write("]")
+            for name, spool in zip(arrays[1:], spools):
+                out.write(f',"{name}":[')
+                spool.seek(0)
+                shutil.copyfileobj(spool, out)
+                out.write("]")
+            out.write("}\n")
+    finally:
+        for spool in spools:
+            spool.close()
+    return counts[0]
+
+
+def write_cdx_bom(source: ArtifactSource, output: Output, query_params=None) -> int:
+    """
+    Write a CycloneDX 1.5 JSON SBOM for the artifacts in ``source``
+    :param source: FullScans.stream() result, iterable of artifacts, or NDJSON path
+    :param output: Path or text file object to write the document to
+    :param query_params: Optional ExportQueryParams; author and project_* fields fill in the metadata
+    :return: Number of components written
+    """
+    metadata = {
+        "timestamp": _timestamp(),
+        "tools": {"components": [{"type": "application", "name": TOOL_NAME, "version": __version__}]},
+    }
+    author = _param(query_params, "author")
+    if author:
+        metadata["authors"] = [{"name": author}]
+    project_name = _param(query_params, "project_name")
+    project_ref = None
+    if project_name:
+        project_ref = _param(query_params, "project_id") or "project"
+        project = {"type": "application", "bom-ref": project_ref, "name": project_name}
+        for key, name in (("version", "project_version"), ("group", "project_group")):
+            if _param(query_params, name):
+                project[key] = _param(query_params, name)
+        metadata["component"] = project
+    header = {
+        "bomFormat": "CycloneDX",
+        "specVersion": CYCLONEDX_SPEC_VERSION,
+        "serialNumber": f"urn:uuid:{uuid.uuid4()}",
+        "version": 1,
+        "metadata": metadata,
+    }
+
+    def entries():
+        direct = []
+        for artifact in iter_artifacts(source):
+            artifact_id = artifact["id"]
+            component = {"type": "library", "bom-ref": artifact_id, "name": artifact.get("name") or ""}
+            if artifact.get("namespace"):
+                component["group"] = artifact["namespace"]
+            if artifact.get("version"):
+                component["version"] = artifact["version"]
+            component["purl"] = artifact_purl(artifact)
+            if artifact.get("author"):
+                component["author"] = ", ".join(artifact["author"])
+            if artifact.get("license"):
+                component["licenses"] = [{"expression": artifact["license"]}]
+            yield 0, component
+            yield 1, {"ref": artifact_id, "dependsOn": artifact.get("dependencies") or []}
+            if artifact.get("direct"):
+                direct.append(artifact_id)
+        if project_ref is not None:
+            yield 1, {"ref": project_ref, "dependsOn": direct}
+
+    return _write_document(output, header, ["components", "dependencies"], entries())
+
+
+def _spdx_id(artifact_id: str) -> str:
+    return "SPDXRef-Package-" + _SPDX_ID_INVALID.sub("-", str(artifact_id))
+
+
+def write_spdx_bom(source: ArtifactSource, output: Output, query_params=None) -> int:
+    """
+    Write an SPDX 2.3 JSON SBOM for the artifacts in ``source``
+    :param source: FullScans.stream() result, iterable of artifacts, or NDJSON path
+    :param output: Path or text file object to write the document to
+    :param query_params: Optional ExportQueryParams; author and project_name fill in the creation info
+    :return: Number of packages written
+    """
+    creators = [f"Tool: {TOOL_NAME}-{__version__}"]
+    author = _param(query_params, "author")
+    if author:
+        creators.append(f"Person: {author}")
+    name = _param(query_params, "project_name") or "socket-sbom"
+    if _param(query_params, "project_version"):
+        name = f"{name}@{_param(query_params, 'project_version')}"
+    header = {
+        "spdxVersion": SPDX_VERSION,
+        "dataLicense": "CC0-1.0",
+        "SPDXID": "SPDXRef-DOCUMENT",
+        "name": name,
+        "documentNamespace": f"https://socket.dev/spdx/{uuid.uuid4()}",
+        "creationInfo": {"created": _timestamp(), "creators": creators},
+    }
+
+    def entries():
+        for artifact in iter_artifacts(source):
+            spdx_id = _spdx_id(artifact["id"])
+            package = {
+                "name": artifact.get("name") or "",
+                "SPDXID": spdx_id,
+                "versionInfo": artifact.get("version") or "NOASSERTION",
+                "downloadLocation": "NOASSERTION",
+                "filesAnalyzed": False,
+                "licenseConcluded": "NOASSERTION",
+                "licenseDeclared": artifact.get("license") or "NOASSERTION",
+                "copyrightText": "NOASSERTION",
+                "externalRefs": [
+                    {"referenceCategory": "PACKAGE-MANAGER", "referenceType": "purl", "referenceLocator": artifact_purl(artifact)}
+                ],
+            }
+            if artifact.get("author"):
+                package["supplier"] = f"Person: {artifact['author'][0]}"
+            yield 0, package
+            if artifact.get("direct"):
+                yield 1, {"spdxElementId": "SPDXRef-DOCUMENT", "relationshipType": "DESCRIBES", "relatedSpdxElement": spdx_id}
+            for dependency in artifact.get("dependencies") or []:
+                yield 1, {"spdxElementId": spdx_id, "relationshipType": "DEPENDS_ON", "relatedSpdxElement": _spdx_id(dependency)}
+
+    return _write_document(output, header, ["packages", "relationships"], entries())
+
+
+def _vulnerability(alert: dict) -> Optional[dict]:
+    props = alert.get("props") or {}
+    ids = [props.get("cveId"), props.get("ghsaId")]
+    ids = [value for value in ids if value]
+    if not ids:
+        return None
+    vulnerability = {"name": ids[0]}
+    if len(ids) > 1:
+        vulnerability["aliases"] = ids[1:]
+    if props.get("title"):
+        vulnerability["description"] = props["title"]
+    return vulnerability
+
+
+def write_openvex_bom(source: ArtifactSource, output: Output, query_params=None) -> int:
+    """
+    Write an OpenVEX document with one statement per vulnerability alert in ``source``
+    :param source: FullScans.stream() result, iterable of artifacts, or NDJSON path
+    :param output: Path or text file object to write the document to
+    :param query_params: Optional ExportQueryParams; author is recorded as the document author
+    :return: Number of statements written
+    """
+    header = {
+        "@context": OPENVEX_CONTEXT,
+        "@id": f"https://socket.dev/openvex/{uuid.uuid4()}",
+        "author": _param(query_params, "author") or "Socket",
+        "timestamp": _timestamp(),
+        "version": 1,
+        "tooling": f"{TOOL_NAME}/{__version__}",
+    }
+
+    def entries():
+        for artifact in iter_artifacts(source):
+            purl = None
+            for alert in artifact.get("alerts") or []:
+                vulnerability = _vulnerability(alert)
+                if vulnerability is None:
+                    continue
+                purl = purl or artifact_purl(artifact)
+                patched = (alert.get("props") or {}).get("firstPatchedVersionIdentifier")
+                yield 0, {
+                    "vulnerability": vulnerability,
+                    "products": [{"@id": purl}],
+                    "status": "affected",
+                    "action_statement": f"Upgrade to {patched}" if patched else "No fixed version is available",
+                }
+
+    return _write_document(output, header, ["statements"], entries())
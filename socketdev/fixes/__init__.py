@@ -1,5 +1,7 @@
 import logging
 from urllib.parse import urlencode
+from typing import Iterator, Optional
+from socketdev.core.pagination import Paginator
 
 log = logging.getLogger("socketdev")
 
@@ -31,3 +33,26 @@ class Fixes:
         log.error(f"Error getting fixes: {response.status_code}")
         log.error(response.text)
         return {}
+
+    def iter_fixes(
+        self,
+        org_slug: str,
+        page_size: Optional[int] = None,
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+        **query_params,
+    ) -> Iterator[dict]:
+        """
+        Iterate over available fixes, following pagination automatically.
+
+        Args:
+            org_slug: Organization slug
+            page_size: Fixes requested per page; the server default if None
+            max_items: Stop after this many fixes
+            prefetch: Fetch the next page in the background while the current one is consumed
+            **query_params: Additional query parameters for filtering
+
+        Returns:
+            Iterator over fixes
+        """
+        return iter(Paginator(lambda params: self.get(org_slug, **params), query_params, page_size, max_items, prefetch))
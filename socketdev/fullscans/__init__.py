@@ -1,10 +1,17 @@
 import json
 import logging
+import os
+import time
+import zlib
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 from dataclasses import dataclass, asdict, field
 import urllib.parse
+from ..core.cache import cache_key
 from ..core.dedupe import Dedupe
+from ..core.interning import ArtifactInterner
+from ..core.manifestcache import ManifestCacheEntry, ManifestFingerprintStore
+from ..core.pagination import Paginator
 from ..utils import IntegrationType, Utils
 
 log = logging.getLogger("socketdev")
@@ -784,9 +791,40 @@ class FullScanStreamResponse:
         )
 
 
+@dataclass
+class UploadStrategyDecision:
+    strategy: str
+    file_count: int
+    total_bytes: int
+    sampled_bytes: int
+    compression_ratio: float
+    estimated_post_seconds: float
+    estimated_archive_seconds: float
+    measure_seconds: float
+    upload_seconds: float = 0.0
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def to_dict(self):
+        return asdict(self)
+
+
 class FullScans:
+    # Cost model used by submit() to choose between post() and archive(). The
+    # compression ratio and compression speed are measured on a sample of the
+    # files; these constants describe the network and per-part server handling.
+    UPLOAD_BYTES_PER_SECOND = 10 * 1024 * 1024
+    MULTIPART_PART_OVERHEAD_BYTES = 256
+    MULTIPART_PART_SECONDS = 0.002
+    TAR_MEMBER_OVERHEAD_BYTES = 512
+    COMPRESSION_SAMPLE_BYTES = 1024 * 1024
+    COMPRESSION_SAMPLE_PER_FILE = 64 * 1024
+
     def __init__(self, api):
         self.api = api
+        # Shared by every stream() call when set; see ArtifactInterner.
+        self.interner: Optional[ArtifactInterner] = None
 
 
     def get(self, org_slug: str, params: dict, use_types: bool = False) -> Union[dict, GetFullScanMetadataResponse]:
@@ -817,6 +855,25 @@ class FullScans:
             )
         return {}
 
+    def iter_scans(
+        self,
+        org_slug: str,
+        params: Optional[dict] = None,
+        page_size: Optional[int] = 100,
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+    ) -> Iterator[dict]:
+        """
+        Iterate over the full scans of an organization, following nextPage automatically
+        :param org_slug: String - The slug of the organization
+        :param params: Optional[dict] - Query parameters such as repo or branch
+        :param page_size: Optional[int] - Scans requested per page
+        :param max_items: Optional[int] - Stop after this many scans
+        :param prefetch: bool - Fetch the next page in the background while the current one is consumed
+        :return: Iterator of full scan metadata dicts
+        """
+        return iter(Paginator(lambda query: self.get(org_slug, query), params, page_size, max_items, prefetch))
+
     def post(
             self,
             files: list,
@@ -826,7 +883,8 @@ class FullScans:
             workspace: Optional[str] = None,
             max_open_files: int = 100,
             base_path: Optional[str] = None,
-            base_paths: Optional[List[str]] = None
+            base_paths: Optional[List[str]] = None,
+            fingerprint_store: Optional[ManifestFingerprintStore] = None
         ) -> Union[dict, CreateFullScanResponse]:
         """
         Create a new full scan by uploading manifest files.
@@ -843,9 +901,16 @@ class FullScans:
                           lazy loading. Useful for systems with low ulimit values (default: 100)
             base_path: Optional base path to strip from key names for cleaner file organization
             base_paths: Optional list of base paths to strip from key names (takes precedence over base_path)
+            fingerprint_store: Optional ManifestFingerprintStore. When the manifests and the
+                             scan parameters (commit hash, commit message, pull request, ...) are
+                             unchanged since the last full scan recorded for params.repo/params.branch,
+                             that scan's response is returned and no new scan is created. Requires params.repo
         
         Returns:
             dict or CreateFullScanResponse: API response containing scan results
+
+        Raises:
+            ValueError: If fingerprint_store is given without params.repo
             
         Note:
             When use_lazy_loading=True, files are opened only when needed during upload,
@@ -854,24 +919,9 @@ class FullScans:
             
             For large file uploads (>100 files), it's recommended to set use_lazy_loading=True.
         """
-        Utils.validate_integration_type(params.integration_type if params.integration_type else "api")
-        org_slug = str(params.org_slug)
-        params_dict = params.to_dict()
-        params_dict.pop("org_slug")
-        # Remove pull_request param if it's None, 0, or not an integer
-        if hasattr(params, 'pull_request') and (
-            params.pull_request is None or 
-            not isinstance(params.pull_request, int) or 
-            params.pull_request == 0
-        ):
-            print("Removing pull_request param from FullScanParams as it is None, 0, or not an integer")
-            params_dict.pop("pull_request")
-
-        if hasattr(params, 'workspace') and params.workspace is None:
-            print("Removing workspace param from FullScanParams as it is None")
-            params_dict.pop("workspace")
-
-        params_arg = urllib.parse.urlencode(params_dict)
+        if fingerprint_store is not None and not params.repo:
+            raise ValueError("repo is required when using a fingerprint_store")
+        org_slug, params_arg = self._scan_query(params)
         path = "orgs/" + org_slug + "/full-scans?" + str(params_arg)
 
         # Use lazy loading if requested
@@ -880,10 +930,42 @@ class FullScans:
         else:
             prepared_files = files
 
+        fingerprint = None
+        if fingerprint_store is not None:
+            # A recorded scan is only reused for the same commit, pull request and options.
+            scan_params = cache_key(params_arg)
+            fingerprint_inputs = self._fingerprint_inputs(prepared_files)
+            if fingerprint_inputs is None:
+                log.debug("Manifest fingerprinting skipped: files are not backed by paths on disk")
+            else:
+                fingerprint, total_bytes = fingerprint_store.fingerprint(fingerprint_inputs)
+                cached = fingerprint_store.lookup(
+                    org_slug, params.repo, params.branch, fingerprint, require="full_scan", scan_params=scan_params
+                )
+                if cached is not None:
+                    if use_types:
+                        return CreateFullScanResponse.from_dict({"success": True, "status": 201, "data": cached.full_scan})
+                    return cached.full_scan
+
+        start_time = time.time()
         response = self.api.do_request(path=path, method="POST", files=prepared_files)
+        upload_seconds = time.time() - start_time
 
         if response.status_code == 201:
             result = response.json()
+            if fingerprint is not None:
+                fingerprint_store.record(
+                    org_slug,
+                    params.repo,
+                    params.branch,
+                    ManifestCacheEntry(
+                        fingerprint=fingerprint,
+                        bytes=total_bytes,
+                        upload_seconds=upload_seconds,
+                        full_scan=result,
+                        scan_params=scan_params,
+                    ),
+                )
             if use_types:
                 return CreateFullScanResponse.from_dict({"success": True, "status": 201, "data": result})
             return result
@@ -896,6 +978,168 @@ class FullScans:
             )
         return {}
 
+    def choose_upload_strategy(self, files: List[str]) -> UploadStrategyDecision:
+        """
+        Measure a set of manifest files and estimate whether post() or archive() is cheaper.
+
+        The file count and total size are taken from the filesystem, and a sample of
+        up to COMPRESSION_SAMPLE_BYTES (at most COMPRESSION_SAMPLE_PER_FILE from each
+        file) is gzip-compressed to measure the compression ratio and speed.
+
+        Args:
+            files: List of file paths
+
+        Returns:
+            UploadStrategyDecision with the chosen strategy ("post" or "archive") and estimates
+        """
+        start_time = time.time()
+        sizes = []
+        for file_path in files:
+            try:
+                if os.path.isfile(file_path):
+                    sizes.append((file_path, os.path.getsize(file_path)))
+            except OSError:
+                continue
+        file_count = len(sizes)
+        total_bytes = sum(size for _, size in sizes)
+
+        # Sample evenly across files so one big lockfile does not dominate
+        sample = bytearray()
+        per_file = min(self.COMPRESSION_SAMPLE_PER_FILE, max(1, self.COMPRESSION_SAMPLE_BYTES // max(1, file_count)))
+        for file_path, size in sizes:
+            if len(sample) >= self.COMPRESSION_SAMPLE_BYTES:
+                break
+            try:
+                with open(file_path, "rb") as f:
+                    sample += f.read(min(size, per_file))
+            except OSError:
+                continue
+        compress_start = time.time()
+        compressed_sample = zlib.compress(bytes(sample), 9) if sample else b""
+        compress_seconds = time.time() - compress_start
+        compression_ratio = len(compressed_sample) / len(sample) if sample else 1.0
+        compress_seconds_per_byte = compress_seconds / len(sample) if sample else 0.0
+
+        bandwidth = float(self.UPLOAD_BYTES_PER_SECOND)
+        estimated_post_seconds = (
+            (total_bytes + file_count * self.MULTIPART_PART_OVERHEAD_BYTES) / bandwidth
+            + file_count * self.MULTIPART_PART_SECONDS
+        )
+        estimated_archive_seconds = (
+            (total_bytes + file_count * self.TAR_MEMBER_OVERHEAD_BYTES) * compression_ratio / bandwidth
+            + total_bytes * compress_seconds_per_byte
+            + self.MULTIPART_PART_SECONDS
+        )
+        strategy = "archive" if estimated_archive_seconds < estimated_post_seconds else "post"
+
+        return UploadStrategyDecision(
+            strategy=strategy,
+            file_count=file_count,
+            total_bytes=total_bytes,
+            sampled_bytes=len(sample),
+            compression_ratio=compression_ratio,
+            estimated_post_seconds=estimated_post_seconds,
+            estimated_archive_seconds=estimated_archive_seconds,
+            measure_seconds=time.time() - start_time,
+        )
+
+    def submit(
+        self,
+        files: List[str],
+        params: FullScanParams,
+        workspace: Optional[str] = None,
+        strategy: Optional[str] = None,
+        max_open_files: int = 100,
+        base_path: Optional[str] = None,
+        base_paths: Optional[List[str]] = None,
+    ) -> Tuple[dict, UploadStrategyDecision]:
+        """
+        Create a full scan, picking the cheaper of post() (one multipart part per file)
+        and archive() (a single tar.gz) for this set of files.
+
+        Args:
+            files: List of manifest file paths
+            params: FullScanParams object containing scan configuration
+            workspace: Base directory path to make file paths relative to
+            strategy: Force "post" or "archive" instead of choosing automatically. The
+                      files are still measured so the decision can be compared.
+            max_open_files: Maximum number of files open at once for post() (default: 100)
+            base_path: Optional base path to strip from file names. Both strategies upload
+                       the same names
+            base_paths: Optional list of base paths to strip from file names (takes precedence over base_path)
+
+        Returns:
+            (full scan creation response, UploadStrategyDecision with timings)
+        """
+        if strategy not in (None, "post", "archive"):
+            raise ValueError(f"Invalid upload strategy: {strategy}")
+
+        decision = self.choose_upload_strategy(files)
+        if strategy is not None:
+            decision.strategy = strategy
+
+        start_time = time.time()
+        if decision.strategy == "archive":
+            result = self.archive(
+                files=files, workspace=workspace, params=params, base_path=base_path, base_paths=base_paths
+            )
+        else:
+            result = self.post(
+                files,
+                params,
+                use_lazy_loading=True,
+                workspace=workspace,
+                max_open_files=max_open_files,
+                base_path=base_path,
+                base_paths=base_paths,
+            )
+        decision.upload_seconds = time.time() - start_time
+
+        log.info(
+            f"Full scan submitted via {decision.strategy}: {decision.file_count} files, "
+            f"{decision.total_bytes} bytes, compression ratio {decision.compression_ratio:.2f}, "
+            f"measured in {decision.measure_seconds:.3f}s, uploaded in {decision.upload_seconds:.3f}s"
+        )
+        return result, decision
+
+    @staticmethod
+    def _scan_query(params: FullScanParams) -> Tuple[str, str]:
+        """Validate params and return the org slug and the query string shared by post() and archive()."""
+        Utils.validate_integration_type(params.integration_type if params.integration_type else "api")
+        org_slug = str(params.org_slug)
+        params_dict = params.to_dict()
+        params_dict.pop("org_slug")
+        # Remove pull_request param if it's None, 0, or not an integer
+        if hasattr(params, 'pull_request') and (
+            params.pull_request is None or 
+            not isinstance(params.pull_request, int) or 
+            params.pull_request == 0
+        ):
+            print("Removing pull_request param from FullScanParams as it is None, 0, or not an integer")
+            params_dict.pop("pull_request")
+
+        if hasattr(params, 'workspace') and params.workspace is None:
+            print("Removing workspace param from FullScanParams as it is None")
+            params_dict.pop("workspace")
+
+        return org_slug, urllib.parse.urlencode(params_dict)
+
+    @staticmethod
+    def _fingerprint_inputs(prepared_files: list) -> Optional[List[tuple]]:
+        """Return (key, path) pairs for multipart entries backed by files on disk, or None."""
+        inputs = []
+        for entry in prepared_files:
+            try:
+                key, file_tuple = entry
+                file_obj = file_tuple[1]
+            except (TypeError, ValueError, IndexError):
+                return None
+            path = getattr(file_obj, "file_path", None) or getattr(file_obj, "name", None)
+            if not isinstance(key, str) or not isinstance(path, str) or not os.path.isfile(path):
+                return None
+            inputs.append((key, path))
+        return inputs
+
     def delete(self, org_slug: str, full_scan_id: str) -> dict:
         path = "orgs/" + org_slug + "/full-scans/" + full_scan_id
 
@@ -939,7 +1183,15 @@ class FullScans:
             )
         return {}
 
-    def stream(self, org_slug: str, full_scan_id: str, use_types: bool = False) -> Union[dict, FullScanStreamResponse]:
+    def stream(
+        self,
+        org_slug: str,
+        full_scan_id: str,
+        use_types: bool = False,
+        interner: Optional[ArtifactInterner] = None,
+    ) -> Union[dict, FullScanStreamResponse]:
+        if interner is None:
+            interner = self.interner
         path = "orgs/" + org_slug + "/full-scans/" + full_scan_id
         response = self.api.do_request(path=path, method="GET")
 
@@ -959,7 +1211,7 @@ class FullScans:
                         artifact_id = batch["id"]
                         if not isinstance(artifact_id, str) or not artifact_id:
                             raise TypeError("artifact id must be a non-empty string")
-                        artifacts[artifact_id] = batch
+                        artifacts[artifact_id] = interner.intern(batch) if interner is not None else batch
                     except (KeyError, TypeError):
                         # A malformed artifact should not discard valid stream results
                         # before FullScanStreamResponse can parse them individually.
@@ -1051,7 +1303,7 @@ class FullScans:
             return True
         return False
 
-    def archive(self, tar_files: Optional[Union[str, List[str]]] = None, files: Optional[List[str]] = None, workspace: Optional[str] = None, use_lazy_loading: bool = True, params: Optional[FullScanParams] = None) -> dict:
+    def archive(self, tar_files: Optional[Union[str, List[str]]] = None, files: Optional[List[str]] = None, workspace: Optional[str] = None, use_lazy_loading: bool = True, params: Optional[FullScanParams] = None, use_mmap: bool = False, base_path: Optional[str] = None, base_paths: Optional[List[str]] = None) -> dict:
         """
         Create a full scan by uploading one or more archives.
         
@@ -1066,6 +1318,12 @@ class FullScans:
             params: FullScanParams object containing scan configuration (repo, org_slug, branch, 
                    commit_message, commit_hash, pull_request, committers, integration_type, 
                    integration_org_slug, make_default_branch, set_as_pending_head, tmp)
+            use_mmap: Memory-map tar_files and hand them to the transport as memoryview
+                     slices instead of copying them into bytes. Falls back to buffered
+                     reads where mmap is unavailable (default: False)
+            base_path: Optional base path to strip from the names of bundled files, as in post()
+            base_paths: Optional list of base paths to strip from the names of bundled files
+                       (takes precedence over base_path)
 
         Returns:
             dict with the full scan creation response
@@ -1083,18 +1341,14 @@ class FullScans:
         if params is None:
             raise ValueError("params argument is required")
         
-        Utils.validate_integration_type(params.integration_type if params.integration_type else "api")
-        org_slug = str(params.org_slug)
-        params_dict = params.to_dict()
-        params_dict.pop("org_slug")
-        params_arg = urllib.parse.urlencode(params_dict)
+        org_slug, params_arg = self._scan_query(params)
         path = f"orgs/{org_slug}/full-scans/archive?" + str(params_arg)
         
         # Prepare files for upload
         if tar_files:
             # Archive file(s) - use lazy loading to prepare them
-            if use_lazy_loading:
-                upload_files = Utils.prepare_archive_files_for_upload(tar_files)
+            if use_lazy_loading or use_mmap:
+                upload_files = Utils.prepare_archive_files_for_upload(tar_files, use_mmap=use_mmap)
             else:
                 # For backward compatibility, fall back to opening files directly
                 files_list = [tar_files] if isinstance(tar_files, str) else tar_files
@@ -1106,7 +1360,7 @@ class FullScans:
         else:
             # Multiple files - bundle into tar.gz
             log.debug(f"Creating tar.gz archive from {len(files)} files")
-            tar_buffer = Utils.create_tar_gz_from_files(files, workspace)
+            tar_buffer = Utils.create_tar_gz_from_files(files, workspace, base_path, base_paths)
             
             # Prepare the tar.gz for upload
             archive_name = "archive.tar.gz"
@@ -1,5 +1,7 @@
 import logging
 from urllib.parse import urlencode
+from typing import Iterator, Optional
+from socketdev.core.pagination import Paginator
 
 log = logging.getLogger("socketdev")
 
@@ -28,6 +30,25 @@ class Historical:
         log.error(response.text)
         return {}
 
+    def iter_alerts(
+        self,
+        org_slug: str,
+        query_params: dict = None,
+        page_size: Optional[int] = None,
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+    ) -> Iterator[dict]:
+        """Iterate over the historical alerts of an organization, following pagination automatically.
+
+        Args:
+            org_slug: Organization slug
+            query_params: Optional dictionary of query parameters
+            page_size: Alerts requested per page; the server default if None
+            max_items: Stop after this many alerts
+            prefetch: Fetch the next page in the background while the current one is consumed
+        """
+        return iter(Paginator(lambda params: self.list(org_slug, params), query_params, page_size, max_items, prefetch))
+
     def trend(self, org_slug: str, query_params: dict = None) -> dict:
         """Get historical alert trends data for an org.
 
@@ -1,10 +1,16 @@
 import json
+import threading
+import time
 import urllib.parse
 import warnings
-from typing import Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, asdict, field
+from typing import Iterator, List, Optional, Tuple
 from socketdev.log import log
 from socketdev.exceptions import APIPartialResponse
 from ..core.dedupe import Dedupe
+from ..core.packageurl import purl_key
+from ..core.purlcache import PurlResultCache
 
 
 def _encode_bool_query_value(value) -> str:
@@ -14,7 +20,33 @@ def _encode_bool_query_value(value) -> str:
     return str(value)
 
 
+STREAM_RECORD_TYPES = {"purlError", "summary"}
+PENDING_ALERT_TYPE = "pendingScan"
+
+
+@dataclass
+class PurlResolution:
+    rows: list
+    pending: List[str] = field(default_factory=list)
+    resolved_on_retry: List[str] = field(default_factory=list)
+    attempts: int = 0
+    elapsed_sec: float = 0.0
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def to_dict(self):
+        return asdict(self)
+
+    @property
+    def complete(self) -> bool:
+        return not self.pending
+
+
 class Purl:
+    DEFAULT_BATCH_SIZE = 1000
+    DEFAULT_MAX_WORKERS = 4
+
     def __init__(self, api):
         self.api = api
 
@@ -28,6 +60,7 @@ class Purl:
         alerts: Optional[bool] = None,
         purl_errors: Optional[bool] = None,
         strict: bool = False,
+        cache: Optional[PurlResultCache] = None,
         **kwargs,
     ) -> list:
         """POST a batch of purls to the Socket batch purl endpoint and return deduped rows.
@@ -55,15 +88,19 @@ class Purl:
                 error rows for malformed/unresolvable inputs. ``None`` omits the param.
                 For backward compatibility, legacy string values passed to the promoted
                 Boolean parameters are forwarded unchanged.
-            strict: client-side guard. When ``True``, compares the exact ``purl`` string
-                of each requested component against the returned ``inputPurl`` (or the
-                ``purl`` fallback). The API defines ``inputPurl`` as the original,
-                unmodified input before server normalization, so canonicalized ``purl``
-                values do not cause false omissions. Raises
+            strict: client-side guard. When ``True``, matches the ``purl`` of each
+                requested component against the returned ``inputPurl`` (or the ``purl``
+                fallback), first as an exact string and then in canonical form (see
+                :func:`~socketdev.core.packageurl.purl_key`), so spelling variants such
+                as ``%40`` escapes or pypi ``_``/``-`` do not cause false omissions. Raises
                 :class:`~socketdev.exceptions.APIPartialResponse` (with a ``missing``
                 list) if any requested purl is absent from the response. This surfaces
                 partial batches even without ``alerts=True``. Only components that carry
                 a ``purl`` string are checked.
+            cache: optional :class:`~socketdev.core.purlcache.PurlResultCache`. Purls with a
+                fresh cached result are answered locally and only the misses are sent;
+                the returned rows are then ordered by input purl. When every purl hits,
+                no request is made.
             **kwargs: forwarded verbatim into the query string (back-compat passthrough for
                 any params not yet promoted to first-class arguments).
 
@@ -84,11 +121,360 @@ class Purl:
                 DeprecationWarning,
                 stacklevel=2,
             )
-        path = f"orgs/{org_slug}/purl?" if org_slug else "purl?"
         if components is None:
             components = []
-        purls = {"components": components}
-        purls = json.dumps(purls)
+        path = self._build_path(org_slug, license, poll, timeout_sec, alerts, purl_errors, kwargs)
+        if cache is None:
+            purl_deduped = self._send(path, components)
+        else:
+            cached_rows, misses = self._lookup_cached(cache, org_slug, license, alerts, components)
+            purl_deduped = self._send(path, misses) if misses else []
+            if purl_deduped is not None:
+                self._store_cached(cache, org_slug, license, alerts, misses, purl_deduped)
+                purl_deduped = self._merge_batches(components, [cached_rows, purl_deduped])
+        if purl_deduped is None:
+            return []
+        if strict:
+            self._raise_on_missing(components, purl_deduped)
+        return purl_deduped
+
+    def bulk(
+        self,
+        components: list,
+        org_slug: str = None,
+        license: str = "false",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        poll: Optional[bool] = None,
+        timeout_sec: Optional[int] = None,
+        alerts: Optional[bool] = None,
+        purl_errors: Optional[bool] = None,
+        strict: bool = False,
+        cache: Optional[PurlResultCache] = None,
+        **kwargs,
+    ) -> list:
+        """POST a large list of purls as concurrent batches and merge the results.
+
+        Components are deduped by ``purl`` before sending (components without a ``purl``
+        string are sent as-is), split into batches of ``batch_size``, and posted with at
+        most ``max_workers`` requests in flight. Result rows are returned in the order
+        their input purls first appeared, followed by any unmatched rows, then the
+        ``purlError`` records and per-batch ``summary`` records.
+
+        A batch that gets a non-200 response is logged and contributes no rows, as with
+        :meth:`post`. With ``strict=True`` the missing-purl check runs once over the
+        merged results of every batch, so a failed or partial batch raises a single
+        :class:`~socketdev.exceptions.APIPartialResponse` listing all omissions.
+
+        Args:
+            components: list of component dicts, e.g. ``[{"purl": "pkg:npm/lodash@4.18.1"}]``.
+            org_slug: organization slug; ``None`` uses the deprecated ``POST /v0/purl``.
+            license: ``"true"``/``"false"`` — request license information.
+            batch_size: maximum number of components per request.
+            max_workers: maximum number of batches sent concurrently.
+            poll, timeout_sec, alerts, purl_errors, **kwargs: forwarded to every batch,
+                see :meth:`post`.
+            strict: raise if any requested purl is absent from the merged results.
+            cache: optional :class:`~socketdev.core.purlcache.PurlResultCache`; only the
+                cache misses are batched and sent.
+
+        Returns:
+            The merged list of result rows and stream records.
+
+        Raises:
+            ValueError: if ``batch_size`` or ``max_workers`` is less than 1.
+            APIPartialResponse: if ``strict=True`` and requested purls are missing.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if org_slug is None:
+            warnings.warn(
+                "Calling purl.bulk() without org_slug uses the deprecated POST /v0/purl endpoint. "
+                "Pass org_slug to migrate to POST /v0/orgs/{org_slug}/purl.",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+        unique = self._unique_components(components or [])
+        if not unique:
+            return []
+        path = self._build_path(org_slug, license, poll, timeout_sec, alerts, purl_errors, kwargs)
+        cached_rows, misses = [], unique
+        if cache is not None:
+            cached_rows, misses = self._lookup_cached(cache, org_slug, license, alerts, unique)
+
+        def send_batch(batch):
+            rows = self._send(path, batch)
+            if rows is not None and cache is not None:
+                self._store_cached(cache, org_slug, license, alerts, batch, rows)
+            return rows
+
+        batches = [misses[i : i + batch_size] for i in range(0, len(misses), batch_size)]
+        if len(batches) <= 1 or max_workers == 1:
+            batch_results = [send_batch(batch) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+                batch_results = list(executor.map(send_batch, batches))
+        merged = self._merge_batches(unique, [cached_rows] + [rows or [] for rows in batch_results])
+        if strict:
+            self._raise_on_missing(unique, merged)
+        return merged
+
+    def iter_post(
+        self,
+        components: list,
+        org_slug: str = None,
+        license: str = "false",
+        poll: Optional[bool] = None,
+        timeout_sec: Optional[int] = None,
+        alerts: Optional[bool] = None,
+        purl_errors: Optional[bool] = None,
+        dedupe: bool = False,
+        **kwargs,
+    ) -> Iterator[dict]:
+        """Stream a batch purl lookup, yielding each record as soon as it arrives.
+
+        Unlike :meth:`post`, the response body is never held in full: artifact rows,
+        ``purlError`` records and ``summary`` records are yielded in the order the server
+        sends them. Breaking out of the loop closes the connection, so a CI gate can stop
+        on the first malware hit without waiting for the rest of the batch.
+
+        Args:
+            components: list of component dicts, e.g. ``[{"purl": "pkg:npm/lodash@4.18.1"}]``.
+            org_slug: organization slug; ``None`` uses the deprecated ``POST /v0/purl``.
+            license, poll, timeout_sec, alerts, purl_errors, **kwargs: see :meth:`post`.
+            dedupe: when ``True``, artifact rows are normalized as :meth:`post` does
+                (``purl``, ``releases`` and consolidated alerts), repeated rows for the
+                same input purl and release are skipped, and alerts already yielded for
+                an input purl are dropped from later rows. Rows are not merged into one
+                per purl, since that would require the whole response.
+
+        Yields:
+            Result rows and stream records. On a non-200 response, logs the error and
+            yields nothing.
+        """
+        if org_slug is None:
+            warnings.warn(
+                "Calling purl.iter_post() without org_slug uses the deprecated POST /v0/purl endpoint. "
+                "Pass org_slug to migrate to POST /v0/orgs/{org_slug}/purl.",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+        path = self._build_path(org_slug, license, poll, timeout_sec, alerts, purl_errors, kwargs)
+        purls = json.dumps({"components": components or []})
+        response = self.api.do_request(path=path, payload=purls, method="POST", stream=True)
+        try:
+            if response.status_code != 200:
+                log.error(f"Error posting {components} to the Purl API: {response.status_code}")
+                log.error(response.text)
+                return
+            seen_rows = set()
+            seen_alerts = {}
+            first_line = True
+            for line in response.iter_lines(decode_unicode=True):
+                if isinstance(line, bytes):
+                    line = line.decode("utf-8")
+                line = line.strip()
+                if first_line and line:
+                    # The body may be wrapped in quotes; post() strips them from the whole text.
+                    line = line.lstrip('"').strip()
+                    first_line = False
+                if not line or line == '"':
+                    continue
+                try:
+                    item = json.loads(line)
+                except json.JSONDecodeError:
+                    # The closing quote of a wrapped body ends the last line.
+                    try:
+                        item = json.loads(line.rstrip('"'))
+                    except json.JSONDecodeError:
+                        continue
+                if not dedupe or not isinstance(item, dict) or item.get("_type") in STREAM_RECORD_TYPES:
+                    yield item
+                    continue
+                item = Dedupe.consolidate_and_merge_alerts([item])
+                item.pop("batchIndex", None)
+                input_purl = self._row_input_purl(item)
+                row_key = (input_purl, tuple(item["releases"]), item.get("id"))
+                if row_key in seen_rows:
+                    continue
+                seen_rows.add(row_key)
+                emitted = seen_alerts.setdefault(input_purl, set())
+                fresh_alerts = []
+                for alert in item["alerts"]:
+                    identity = Dedupe.alert_key(alert)
+                    if identity not in emitted:
+                        emitted.add(identity)
+                        fresh_alerts.append(alert)
+                item["alerts"] = fresh_alerts
+                yield item
+        finally:
+            response.close()
+
+    def post_until_resolved(
+        self,
+        components: list,
+        org_slug: str = None,
+        license: str = "false",
+        deadline_sec: float = 300,
+        initial_delay_sec: float = 2.0,
+        max_delay_sec: float = 30.0,
+        backoff: float = 2.0,
+        purl_errors: Optional[bool] = None,
+        strict: bool = False,
+        **kwargs,
+    ) -> PurlResolution:
+        """Look up purls with ``alerts=True`` and re-poll only the ones still pending.
+
+        The first request covers every component. Afterwards only the purls whose rows
+        carry a synthetic ``pendingScan`` alert are resubmitted, and their rows are
+        replaced as they resolve. The wait between rounds starts at ``initial_delay_sec``
+        and is multiplied by ``backoff`` (up to ``max_delay_sec``) after each round in
+        which nothing resolved; any progress resets it. Polling stops once nothing is
+        pending or ``deadline_sec`` has elapsed, and the purls still pending are listed
+        in the result and logged. A failed request resolves nothing: if the first one
+        fails, every purl is re-polled, and any still unanswered at the deadline are
+        reported as pending.
+
+        Args:
+            components: list of component dicts, e.g. ``[{"purl": "pkg:npm/lodash@4.18.1"}]``.
+            org_slug: organization slug; ``None`` uses the deprecated ``POST /v0/purl``.
+            license, purl_errors, **kwargs: see :meth:`post`.
+            deadline_sec: total time budget, including the first request.
+            initial_delay_sec: wait before the first re-poll.
+            max_delay_sec: upper bound for the wait between re-polls.
+            backoff: multiplier applied to the wait after a round with no progress.
+            strict: raise if a requested purl is absent from the final rows. Purls that
+                are still pending have a row and are not considered missing.
+
+        Returns:
+            A :class:`PurlResolution` with the merged rows in input order, the purls
+            still pending, the purls that resolved on a re-poll, the number of requests
+            made and the elapsed time.
+
+        Raises:
+            APIPartialResponse: if ``strict=True`` and requested purls are missing.
+        """
+        if org_slug is None:
+            warnings.warn(
+                "Calling purl.post_until_resolved() without org_slug uses the deprecated POST /v0/purl endpoint. "
+                "Pass org_slug to migrate to POST /v0/orgs/{org_slug}/purl.",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+        components = components or []
+        unique = self._unique_components(components)
+        start_time = time.monotonic()
+        path = self._build_path(org_slug, license, None, None, True, purl_errors, kwargs)
+        requested = [
+            component["purl"]
+            for component in unique
+            if isinstance(component, dict) and isinstance(component.get("purl"), str)
+        ]
+        first = self._send(path, unique)
+        # purlError records are kept per purl and emitted once, from the last round that reported them.
+        error_rows = {}
+        if first is None:
+            # Nothing is known about any purl yet, so all of them are re-polled like pending ones.
+            first = []
+            pending = set(requested)
+        else:
+            pending = self._pending_purls(first)
+        self._collect_purl_errors(first, error_rows)
+        results = [[row for row in first if not self._is_purl_error(row)]]
+        attempts = 1
+        initial_pending = set(pending)
+        delay = initial_delay_sec
+        while pending:
+            remaining = deadline_sec - (time.monotonic() - start_time)
+            if remaining <= 0:
+                break
+            time.sleep(min(delay, remaining))
+            retry = [
+                component
+                for component in unique
+                if isinstance(component, dict) and component.get("purl") in pending
+            ]
+            rows = self._send(path, retry)
+            attempts += 1
+            resolved = set()
+            if rows is not None:
+                returned = {
+                    self._row_input_purl(row)
+                    for row in rows
+                    if not (isinstance(row, dict) and row.get("_type") in STREAM_RECORD_TYPES)
+                }
+                resolved = (returned & pending) - self._pending_purls(rows)
+                results = [self._drop_purls(batch, resolved) for batch in results]
+                results.append([row for row in rows if self._row_input_purl(row) in resolved])
+                self._collect_purl_errors(rows, error_rows)
+            if resolved:
+                delay = initial_delay_sec
+            else:
+                delay = min(delay * backoff, max_delay_sec)
+            pending = pending - resolved
+
+        results.append(list(error_rows.values()))
+        merged = self._merge_batches(components, results)
+        resolution = PurlResolution(
+            rows=merged,
+            pending=[purl for purl in requested if purl in pending],
+            resolved_on_retry=[purl for purl in requested if purl in initial_pending and purl not in pending],
+            attempts=attempts,
+            elapsed_sec=time.monotonic() - start_time,
+        )
+        if resolution.pending:
+            log.warning(
+                f"{len(resolution.pending)} purls still pending after {attempts} requests "
+                f"and {resolution.elapsed_sec:.1f}s: {resolution.pending}"
+            )
+        if strict:
+            self._raise_on_missing(components, merged)
+        return resolution
+
+    @classmethod
+    def _pending_purls(cls, rows: list) -> set:
+        """Input purls whose rows carry a synthetic pendingScan alert."""
+        pending = set()
+        for row in rows:
+            if not isinstance(row, dict) or row.get("_type") in STREAM_RECORD_TYPES:
+                continue
+            alerts = row.get("alerts") or []
+            if any(isinstance(alert, dict) and alert.get("type") == PENDING_ALERT_TYPE for alert in alerts):
+                input_purl = cls._row_input_purl(row)
+                if input_purl is not None:
+                    pending.add(input_purl)
+        return pending
+
+    @staticmethod
+    def _is_purl_error(row) -> bool:
+        return isinstance(row, dict) and row.get("_type") == "purlError"
+
+    @classmethod
+    def _collect_purl_errors(cls, rows: list, error_rows: dict) -> None:
+        """Key the purlError records in ``rows`` by input purl, replacing earlier ones."""
+        for row in rows:
+            if not cls._is_purl_error(row):
+                continue
+            value = row.get("value")
+            input_purl = value.get("inputPurl") if isinstance(value, dict) else None
+            error_rows[input_purl if isinstance(input_purl, str) else json.dumps(row, sort_keys=True)] = row
+
+    @classmethod
+    def _drop_purls(cls, rows: list, purls: set) -> list:
+        """Remove the artifact rows for ``purls`` so re-polled rows can replace them."""
+        if not purls:
+            return rows
+        return [
+            row
+            for row in rows
+            if (isinstance(row, dict) and row.get("_type") in STREAM_RECORD_TYPES) or cls._row_input_purl(row) not in purls
+        ]
+
+    @staticmethod
+    def _build_path(org_slug, license, poll, timeout_sec, alerts, purl_errors, extra_args) -> str:
+        path = f"orgs/{org_slug}/purl?" if org_slug else "purl?"
         query_args = {
             "license": license,
         }
@@ -102,38 +488,140 @@ class Purl:
             query_args["alerts"] = _encode_bool_query_value(alerts)
         if purl_errors is not None:
             query_args["purlErrors"] = _encode_bool_query_value(purl_errors)
-        if kwargs:
-            query_args.update(kwargs)
-        params = urllib.parse.urlencode(query_args)
-        path += params
+        if extra_args:
+            query_args.update(extra_args)
+        return path + urllib.parse.urlencode(query_args)
+
+    def _send(self, path: str, components: list) -> Optional[list]:
+        """POST one batch and return its deduped rows, or None on a non-200 response."""
+        purls = json.dumps({"components": components})
         response = self.api.do_request(path=path, payload=purls, method="POST")
         if response.status_code == 200:
-            artifact_rows = []
-            stream_records = []
-            result = response.text
-            result = result.strip('"').strip()
-            for line in result.split("\n"):
-                if line and line != '"':
-                    try:
-                        item = json.loads(line)
-                        if isinstance(item, dict) and item.get("_type") in {
-                            "purlError",
-                            "summary",
-                        }:
-                            stream_records.append(item)
-                        else:
-                            artifact_rows.append(item)
-                    except json.JSONDecodeError:
-                        continue
+            artifact_rows, stream_records = self._parse_ndjson(response.text)
             purl_deduped = Dedupe.dedupe(artifact_rows, batched=True)
             purl_deduped.extend(stream_records)
-            if strict:
-                self._raise_on_missing(components, purl_deduped)
             return purl_deduped
 
         log.error(f"Error posting {components} to the Purl API: {response.status_code}")
         log.error(response.text)
-        return []
+        return None
+
+    @staticmethod
+    def _parse_ndjson(text: str) -> Tuple[list, list]:
+        """Split an NDJSON batch response into artifact rows and typed stream records."""
+        artifact_rows = []
+        stream_records = []
+        result = text.strip('"').strip()
+        for line in result.split("\n"):
+            if line and line != '"':
+                try:
+                    item = json.loads(line)
+                    if isinstance(item, dict) and item.get("_type") in STREAM_RECORD_TYPES:
+                        stream_records.append(item)
+                    else:
+                        artifact_rows.append(item)
+                except json.JSONDecodeError:
+                    continue
+        return artifact_rows, stream_records
+
+    @staticmethod
+    def _unique_components(components: list) -> list:
+        """Drop repeated purls, keeping the first component for each canonical purl."""
+        seen = set()
+        unique = []
+        for component in components:
+            purl = component.get("purl") if isinstance(component, dict) else None
+            if isinstance(purl, str):
+                key = purl_key(purl)
+                if key in seen:
+                    continue
+                seen.add(key)
+            unique.append(component)
+        return unique
+
+    @staticmethod
+    def _cache_flags(license, alerts) -> Tuple[str, str]:
+        return _encode_bool_query_value(license), "" if alerts is None else _encode_bool_query_value(alerts)
+
+    @classmethod
+    def _lookup_cached(cls, cache, org_slug, license, alerts, components: list) -> Tuple[list, list]:
+        """Split components into (rows answered from the cache, components still to send)."""
+        license_flag, alerts_flag = cls._cache_flags(license, alerts)
+        cached_rows = []
+        misses = []
+        for component in components:
+            purl = component.get("purl") if isinstance(component, dict) else None
+            rows = cache.get(org_slug, purl, license_flag, alerts_flag) if isinstance(purl, str) else None
+            if rows is None:
+                misses.append(component)
+                continue
+            # The entry may have been stored under another spelling of the same purl.
+            for row in rows:
+                if "inputPurl" in row:
+                    row["inputPurl"] = purl
+            cached_rows.extend(rows)
+        return cached_rows, misses
+
+    @classmethod
+    def _store_cached(cls, cache, org_slug, license, alerts, components: list, results: list) -> None:
+        """Cache the artifact rows returned for each requested purl."""
+        license_flag, alerts_flag = cls._cache_flags(license, alerts)
+        requested = {
+            component["purl"]
+            for component in components
+            if isinstance(component, dict) and isinstance(component.get("purl"), str)
+        }
+        rows_by_purl = {}
+        for row in results:
+            if isinstance(row, dict) and row.get("_type") in STREAM_RECORD_TYPES:
+                continue
+            input_purl = cls._row_input_purl(row)
+            if input_purl in requested:
+                rows_by_purl.setdefault(input_purl, []).append(row)
+        for purl, rows in rows_by_purl.items():
+            cache.put(org_slug, purl, license_flag, alerts_flag, rows)
+
+    @staticmethod
+    def _row_input_purl(row) -> Optional[str]:
+        if not isinstance(row, dict):
+            return None
+        for key in ("inputPurl", "purl"):
+            value = row.get(key)
+            if isinstance(value, str):
+                return value
+        return None
+
+    @classmethod
+    def _merge_batches(cls, components: list, batch_results: list) -> list:
+        """Merge per-batch results back into the order of ``components``."""
+        rows_by_purl = {}
+        unmatched = []
+        purl_errors = []
+        summaries = []
+        for rows in batch_results:
+            for row in rows:
+                record_type = row.get("_type") if isinstance(row, dict) else None
+                if record_type == "summary":
+                    summaries.append(row)
+                elif record_type == "purlError":
+                    purl_errors.append(row)
+                else:
+                    input_purl = cls._row_input_purl(row)
+                    if input_purl is None:
+                        unmatched.append(row)
+                    else:
+                        rows_by_purl.setdefault(purl_key(input_purl), []).append(row)
+        merged = []
+        for component in components:
+            purl = component.get("purl") if isinstance(component, dict) else None
+            if isinstance(purl, str):
+                merged.extend(rows_by_purl.pop(purl_key(purl), ()))
+        for rows in rows_by_purl.values():
+            merged.extend(rows)
+        merged.extend(unmatched)
+        merged.extend(purl_errors)
+        merged.extend(summaries)
+        return merged
 
     @staticmethod
     def _raise_on_missing(components: list, results: list) -> None:
@@ -143,7 +631,9 @@ class Purl:
         defines ``inputPurl`` as the original, unmodified input string before server-side
         normalization, so matching it exactly preserves the caller's identity even when
         the response's canonical ``purl`` differs. ``purl`` is retained as a fallback,
-        and typed ``purlError`` stream records carry ``inputPurl`` under ``value``.
+        and typed ``purlError`` stream records carry ``inputPurl`` under ``value``. A
+        requested purl without an exact match still counts as returned when its
+        canonical form matches one of those values.
         """
         requested = [
             c["purl"]
@@ -156,8 +646,8 @@ class Purl:
         for row in results:
             if not isinstance(row, dict):
                 continue
-            for field in ("inputPurl", "purl"):
-                value = row.get(field)
+            for key in ("inputPurl", "purl"):
+                value = row.get(key)
                 if isinstance(value, str):
                     returned.add(value)
             record_value = row.get("value")
@@ -166,6 +656,9 @@ class Purl:
                 if isinstance(input_purl, str):
                     returned.add(input_purl)
         missing = [purl for purl in requested if purl not in returned]
+        if missing:
+            canonical_returned = {purl_key(value) for value in returned}
+            missing = [purl for purl in missing if purl_key(purl) not in canonical_returned]
         if missing:
             raise APIPartialResponse(
                 "purl.post(strict=True): the batch response omitted "
@@ -174,3 +667,213 @@ class Purl:
                 f"{missing}",
                 missing=missing,
             )
+
+
+@dataclass
+class CoalescerStats:
+    lookups: int = 0
+    batches: int = 0
+    components: int = 0
+    sent: int = 0
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass
+class _PendingLookup:
+    components: list
+    keys: List[str]
+    strict: bool
+    future: Future
+    enqueued_at: float
+
+
+class PurlCoalescer:
+    """
+    Collect purl lookups from concurrent callers and send them as shared batches.
+
+    Each :meth:`submit` call queues its components and returns a future. A dispatcher
+    thread waits until ``max_batch_size`` purls are queued or the oldest lookup has
+    waited ``max_wait_ms``, then sends one :meth:`Purl.post` for the whole group with
+    purls deduped across callers (by canonical form), and resolves every caller's future
+    with the rows for its own components. Up to ``max_workers`` batches are in flight.
+
+    Use it as a context manager, or call :meth:`close` to flush what is queued and stop
+    the dispatcher.
+    """
+
+    def __init__(
+        self,
+        purl: Purl,
+        org_slug: str,
+        max_batch_size: int = 500,
+        max_wait_ms: float = 10,
+        max_workers: int = 4,
+        license: str = "false",
+        alerts: Optional[bool] = None,
+        purl_errors: Optional[bool] = None,
+        cache: Optional[PurlResultCache] = None,
+        **kwargs,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.purl = purl
+        self.org_slug = org_slug
+        self.max_batch_size = max_batch_size
+        self.max_wait_sec = max_wait_ms / 1000
+        self.post_kwargs = dict(license=license, alerts=alerts, purl_errors=purl_errors, cache=cache, **kwargs)
+        self.stats = CoalescerStats()
+        self._pending: List[_PendingLookup] = []
+        self._pending_count = 0
+        self._flush_requested = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._dispatcher: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def submit(self, components: list, strict: bool = False) -> Future:
+        """Queue a lookup and return a future for its rows.
+
+        Args:
+            components: component dicts, each carrying a ``purl`` string.
+            strict: resolve the future with
+                :class:`~socketdev.exceptions.APIPartialResponse` if any of these purls
+                is missing from the batch response.
+
+        Raises:
+            ValueError: if a component has no ``purl`` string.
+            RuntimeError: if the coalescer has been closed.
+        """
+        keys = []
+        for component in components:
+            purl = component.get("purl") if isinstance(component, dict) else None
+            if not isinstance(purl, str):
+                raise ValueError(f"Every component needs a purl string, got {component!r}")
+            keys.append(purl_key(purl))
+        future = Future()
+        if not components:
+            future.set_result([])
+            return future
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("PurlCoalescer is closed")
+            self._pending.append(_PendingLookup(list(components), keys, strict, future, time.monotonic()))
+            self._pending_count += len(components)
+            self.stats.lookups += 1
+            self.stats.components += len(components)
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._run, name="socketdev-purl-coalescer", daemon=True)
+                self._dispatcher.start()
+            self._cond.notify()
+        return future
+
+    def lookup(self, components: list, strict: bool = False, timeout: Optional[float] = None) -> list:
+        """Submit a lookup and block until its rows are available."""
+        return self.submit(components, strict=strict).result(timeout)
+
+    def flush(self) -> None:
+        """Dispatch everything queued now instead of waiting for the window to close."""
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify()
+
+    def close(self) -> None:
+        """Send any queued lookups, wait for in-flight batches and stop the dispatcher."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            dispatcher = self._dispatcher
+        if dispatcher is not None:
+            dispatcher.join()
+        self._executor.shutdown(wait=True)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                deadline = self._pending[0].enqueued_at + self.max_wait_sec
+                while (
+                    not self._closed
+                    and not self._flush_requested
+                    and self._pending_count < self.max_batch_size
+                ):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._take_batch()
+                if not self._pending:
+                    self._flush_requested = False
+            self._executor.submit(self._dispatch, batch)
+
+    def _take_batch(self) -> List[_PendingLookup]:
+        """Pop queued lookups until the batch would exceed ``max_batch_size`` unique purls."""
+        batch = []
+        keys = set()
+        while self._pending:
+            lookup = self._pending[0]
+            new_keys = keys.union(lookup.keys)
+            if batch and len(new_keys) > self.max_batch_size:
+                break
+            batch.append(self._pending.pop(0))
+            self._pending_count -= len(lookup.components)
+            keys = new_keys
+        return batch
+
+    def _dispatch(self, batch: List[_PendingLookup]) -> None:
+        unique = {}
+        for lookup in batch:
+            for key, component in zip(lookup.keys, lookup.components):
+                unique.setdefault(key, component)
+        with self._cond:
+            self.stats.batches += 1
+            self.stats.sent += len(unique)
+        try:
+            rows = self.purl.post(components=list(unique.values()), org_slug=self.org_slug, **self.post_kwargs)
+            self._resolve(batch, rows)
+        except Exception as error:
+            # Fail whatever is still unresolved so no caller blocks on its future forever.
+            for lookup in batch:
+                if not lookup.future.done():
+                    lookup.future.set_exception(error)
+
+    def _resolve(self, batch: List[_PendingLookup], rows: list) -> None:
+        """Fan the batch response out to each lookup's future."""
+        rows_by_key = {}
+        for row in rows:
+            if not isinstance(row, dict) or row.get("_type") == "summary":
+                continue
+            input_purl = self.purl._row_input_purl(row)
+            if input_purl is None and isinstance(row.get("value"), dict):
+                input_purl = row["value"].get("inputPurl")
+            if isinstance(input_purl, str):
+                rows_by_key.setdefault(purl_key(input_purl), []).append(row)
+
+        for lookup in batch:
+            result = []
+            for key, component in zip(lookup.keys, lookup.components):
+                for row in rows_by_key.get(key, ()):
+                    row = dict(row)
+                    if "inputPurl" in row:
+                        row["inputPurl"] = component["purl"]
+                    result.append(row)
+            try:
+                if lookup.strict:
+                    Purl._raise_on_missing(lookup.components, result)
+            except APIPartialResponse as error:
+                lookup.future.set_exception(error)
+            else:
+                lookup.future.set_result(result)
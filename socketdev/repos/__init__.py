@@ -1,7 +1,11 @@
 import json
 import logging
-from typing import Optional, Union
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterator, List, Optional, Union
 from dataclasses import dataclass, asdict
+from socketdev.core.pagination import Paginator
+from socketdev.exceptions import APIFailure
 
 log = logging.getLogger("socketdev")
 
@@ -98,6 +102,98 @@ class Repos:
         log.error(f"Error getting repositories: {response.status_code}, message: {error_message}")
         return {}
 
+    def iter_repos(
+        self, org_slug: str, page_size: int = 100, max_items: Optional[int] = None, prefetch: bool = True, **kwargs
+    ) -> Iterator[dict]:
+        """
+        Iterate over every repository in an organization, following nextPage automatically
+        :param org_slug: String - The slug of the organization
+        :param page_size: int - Repositories requested per page
+        :param max_items: Optional[int] - Stop after this many repositories
+        :param prefetch: bool - Fetch the next page in the background while the current one is consumed
+        :param kwargs: Additional query parameters such as sort or direction
+        :return: Iterator of repository dicts
+        """
+        return iter(Paginator(lambda params: self.get(org_slug, **params), kwargs, page_size, max_items, prefetch))
+
+    def list_all(
+        self, org_slug: str, concurrency: int = 8, per_page: int = 100, retries: int = 2, **kwargs
+    ) -> List[dict]:
+        """
+        List every repository in an organization, fetching pages in parallel
+        :param org_slug: String - The slug of the organization
+        :param concurrency: int - Number of page requests in flight at once
+        :param per_page: int - Repositories per page, up to 100
+        :param retries: int - Times a failed page is requested again before giving up
+        :param kwargs: Additional query parameters such as sort or direction
+        :return: List of repository dicts in page order, each repository once
+        :raises APIFailure: if a page still fails after ``retries`` retries, so a partial
+            listing is never returned as if it were complete
+        """
+        first = self._get_page(org_slug, 1, per_page, retries, kwargs)
+        pages = {1: first.get("results") or []}
+        # The listing has no total count, so pages past page 1 are requested speculatively,
+        # keeping ``concurrency`` in flight until one of them turns out to be the last.
+        last_page = None if self._has_more(first, per_page) else 1
+        if last_page is None:
+            with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+                in_flight = {}
+                next_page = 2
+                while True:
+                    while len(in_flight) < max(1, concurrency) and (last_page is None or next_page <= last_page):
+                        future = executor.submit(self._get_page, org_slug, next_page, per_page, retries, kwargs)
+                        in_flight[future] = next_page
+                        next_page += 1
+                    if not in_flight:
+                        break
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        page = in_flight.pop(future)
+                        result = future.result()
+                        pages[page] = result.get("results") or []
+                        if not self._has_more(result, per_page) and (last_page is None or page < last_page):
+                            last_page = page
+                    if last_page is not None:
+                        for future, page in list(in_flight.items()):
+                            if page > last_page and future.cancel():
+                                del in_flight[future]
+
+        # Repositories can shift between pages while they are being listed; keep the first copy.
+        repos = []
+        seen = set()
+        for page in sorted(pages):
+            if page > last_page:
+                break
+            for repo in pages[page]:
+                key = repo.get("id") or repo.get("name")
+                if key is not None:
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                repos.append(repo)
+        return repos
+
+    def _get_page(self, org_slug: str, page: int, per_page: int, retries: int, kwargs: dict) -> dict:
+        """Fetch one page of the listing, retrying error responses and transient failures."""
+        for attempt in range(max(0, retries) + 1):
+            if attempt:
+                time.sleep(min(0.5 * 2 ** (attempt - 1), 5))
+            try:
+                result = self.get(org_slug, per_page=per_page, page=page, **kwargs)
+            except APIFailure as error:
+                if not error.is_transient_error() or attempt >= retries:
+                    raise
+                continue
+            # Repos.get returns {} when the request fails.
+            if isinstance(result.get("results"), list):
+                return result
+        raise APIFailure(f"Failed to list repositories for {org_slug}: page {page} failed after {attempt + 1} attempts")
+
+    @staticmethod
+    def _has_more(result: dict, per_page: int) -> bool:
+        results = result.get("results") or []
+        return bool(result.get("nextPage")) and len(results) >= per_page
+
     def repo(self, org_slug: str, repo_name: str, use_types: bool = False) -> Union[dict, GetRepoResponse]:
         path = f"orgs/{org_slug}/repos/{repo_name}"
         response = self.api.do_request(path=path)
@@ -1,4 +1,5 @@
 import json
+from typing import Iterable, Iterator, Union
 from socketdev.core.classes import Package
 import logging
 
@@ -36,27 +37,52 @@ class Sbom:
             sbom_dict = {}
         return sbom_dict
 
-    def create_packages_dict(self, sbom: dict[str, dict]) -> dict[str, Package]:
+    def iter_view(self, report_id: str) -> Iterator[dict]:
+        """
+        Stream the SBOM artifacts of a report one at a time as they are received
+        :param report_id: str - ID of the SBOM report
+        :return: Iterator of artifact dicts; nothing is yielded if the request fails
+        """
+        path = f"sbom/view/{report_id}"
+        response = self.api.do_request(path=path, stream=True)
+        try:
+            if response.status_code != 200:
+                log.error(f"Error viewing SBOM: {response.status_code}")
+                log.error(response.text)
+                return
+            for line in response.iter_lines(decode_unicode=True):
+                if isinstance(line, bytes):
+                    line = line.decode("utf-8")
+                line = line.strip()
+                if line and line != '"':
+                    yield json.loads(line)
+        finally:
+            response.close()
+
+    def create_packages_dict(self, sbom: Union[dict[str, dict], Iterable[dict]]) -> dict[str, Package]:
         """
         Converts the SBOM Artifacts from the FulLScan into a Dictionary for parsing
-        :param sbom: list - Raw artifacts for the SBOM
+        :param sbom: dict or iterable - Raw artifacts for the SBOM, as returned by view() or iter_view()
         :return:
         """
         packages = {}
+        # Number of packages seen so far under each top-level ancestor. Counts are
+        # applied as they change, or when the ancestor itself is reached, so the
+        # artifacts are only walked once.
         top_level_count = {}
-        for package_id in sbom:
-            item = sbom[package_id]
+        items = sbom.values() if isinstance(sbom, dict) else sbom
+        for item in items:
             package = Package(**item)
             if package.id in packages:
-                log.error(f"Duplicate package_id: {package_id}")
-            else:
-                packages[package.id] = package
-                for top_id in package.topLevelAncestors:
-                    if top_id not in top_level_count:
-                        top_level_count[top_id] = 1
-                    else:
-                        top_level_count[top_id] += 1
-        if len(top_level_count) > 0:
-            for package_id in top_level_count:
-                packages[package_id].transitives = top_level_count[package_id]
+                log.error(f"Duplicate package_id: {package.id}")
+                continue
+            packages[package.id] = package
+            if package.id in top_level_count:
+                package.transitives = top_level_count[package.id]
+            for top_id in package.topLevelAncestors:
+                count = top_level_count.get(top_id, 0) + 1
+                top_level_count[top_id] = count
+                ancestor = packages.get(top_id)
+                if ancestor is not None:
+                    ancestor.transitives = count
         return packages
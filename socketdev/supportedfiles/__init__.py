@@ -1,4 +1,7 @@
 import logging
+import os
+from typing import Optional
+from ..core.cache import cache_key, default_cache_dir, read_json, write_json
 
 log = logging.getLogger("socketdev")
 
@@ -7,23 +10,41 @@ class SupportedFiles:
     def __init__(self, api):
         self.api = api
 
-    def get(self, org_slug: str) -> dict:
+    def get(self, org_slug: str, cache_ttl: Optional[int] = None, cache_dir: Optional[str] = None) -> dict:
         """
         Get list of supported manifest file types.
 
         Args:
             org_slug: Organization slug
+            cache_ttl: When set, reuse a response cached on disk for up to this many
+                       seconds, so repeated runs skip the round trip (default: None, no caching)
+            cache_dir: Directory for the on-disk cache (default: the SDK cache directory)
 
         Returns:
             dict containing list of supported file types
         """
+        cache_path = None
+        if cache_ttl is not None:
+            cache_path = os.path.join(
+                cache_dir or default_cache_dir(),
+                "supported-files",
+                f"{cache_key(self.api.api_url, org_slug)}.json",
+            )
+            cached = read_json(cache_path, max_age=cache_ttl)
+            if cached is not None:
+                log.debug(f"Using cached supported files for {org_slug}")
+                return cached
+
         path = f"orgs/{org_slug}/supported-files"
-        
+
         response = self.api.do_request(path=path)
-        
+
         if response.status_code == 200:
-            return response.json()
-        
+            result = response.json()
+            if cache_path is not None and result:
+                write_json(cache_path, result)
+            return result
+
         log.error(f"Error getting supported files: {response.status_code}")
         log.error(response.text)
         return {}
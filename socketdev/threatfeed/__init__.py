@@ -1,5 +1,8 @@
 import logging
 from urllib.parse import urlencode
+from typing import Iterator, Optional
+from socketdev.core.pagination import Paginator
+from socketdev.exceptions import APIFailure
 
 log = logging.getLogger("socketdev")
 
@@ -19,19 +22,66 @@ class ThreatFeed:
         Returns:
             dict: API response containing threat feed items
         """
+        response = self._request(org_slug, kwargs)
+        if response.status_code == 200:
+            return response.json()
+        log.error(f"Error getting threat feed: {response.status_code}")
+        log.error(response.text)
+        return {"results": [], "nextPage": None}
+
+    def get_page(self, org_slug: str = None, **kwargs) -> dict:
+        """
+        Get one page of threat feed items, raising instead of returning an empty page on error.
+
+        Args:
+            org_slug: Organization slug (required for the new endpoint)
+            **kwargs: Query parameters like per_page, page_cursor, sort, etc.
+
+        Returns:
+            dict: API response containing threat feed items
+
+        Raises:
+            APIFailure: if the response is not a 200
+        """
+        response = self._request(org_slug, kwargs)
+        if response.status_code != 200:
+            raise APIFailure(
+                f"Error getting threat feed: {response.status_code} {response.text}", status_code=response.status_code
+            )
+        return response.json()
+
+    def _request(self, org_slug: Optional[str], kwargs: dict):
         if org_slug:
             # Use the new org-scoped endpoint
             path = f"orgs/{org_slug}/threat-feed"
         else:
             # Use the deprecated global endpoint
             path = "threat-feed"
-            
+
         if kwargs:
             path += "?" + urlencode(kwargs)
-            
-        response = self.api.do_request(path=path)
-        if response.status_code == 200:
-            return response.json()
-        log.error(f"Error getting threat feed: {response.status_code}")
-        log.error(response.text)
-        return {"results": [], "nextPage": None}
+
+        return self.api.do_request(path=path)
+
+    def iter_items(
+        self,
+        org_slug: str = None,
+        page_size: Optional[int] = None,
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+        **kwargs,
+    ) -> Iterator[dict]:
+        """
+        Iterate over threat feed items, following the page cursor automatically.
+
+        Args:
+            org_slug: Organization slug (required for the new endpoint)
+            page_size: Items requested per page; the server default if None
+            max_items: Stop after this many items
+            prefetch: Fetch the next page in the background while the current one is consumed
+            **kwargs: Additional query parameters like sort
+
+        Returns:
+            Iterator over threat feed items
+        """
+        return iter(Paginator(lambda params: self.get(org_slug, **params), kwargs, page_size, max_items, prefetch))
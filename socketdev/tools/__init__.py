@@ -1,17 +1,273 @@
-import glob
-import sys
+import os
+import re
 import platform
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator, List, Optional, Pattern, Tuple
+from socketdev.log import log
 
+# Directories that never contain manifests worth uploading. Hidden directories
+# (.git, .venv, ...) are skipped as well, matching glob's "**" semantics.
+DEFAULT_IGNORED_DIRS = frozenset({"node_modules", "__pycache__"})
 
-def find_package_files(folder: str, file_types: list) -> list:
+
+def _translate_glob(pattern: str, match_hidden: bool = False) -> str:
+    """Translate a glob pattern into a regex where ``*`` does not cross ``/``.
+
+    ``**`` spans directories. Like glob, a wildcard at the start of a path
+    component does not match a leading dot unless ``match_hidden`` is set.
+    """
+    out = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        at_component_start = not match_hidden and (i == 0 or pattern[i - 1] == "/")
+        if pattern.startswith("**/", i):
+            out.append("(?:[^/]*/)*")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("(?!\\.)[^/]*" if at_component_start else "[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("(?!\\.)[^/]" if at_component_start else "[^/]")
+            i += 1
+        elif c == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                out.append("\\[")
+                i += 1
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end + 1
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
+
+
+def compile_file_patterns(patterns: Iterable[str]) -> Pattern:
+    """Compile manifest glob patterns into a single regex matched against relative paths.
+
+    Patterns without a ``/`` match the file name in any directory, the same as
+    ``glob(f"{folder}/**/{pattern}", recursive=True)``.
+    """
+    alternatives = []
+    for pattern in dict.fromkeys(patterns):
+        if not pattern:
+            continue
+        pattern = pattern.replace("\\", "/").lstrip("/")
+        if pattern.startswith("**/"):
+            pattern = pattern[3:]
+        alternatives.append(_translate_glob(pattern))
+    if not alternatives:
+        # Matches nothing
+        return re.compile(r"(?!)")
+    return re.compile("^(?:[^/]*/)*(?:" + "|".join(alternatives) + ")$")
+
+
+def supported_file_patterns(supported_files: dict) -> List[str]:
+    """Flatten a SupportedFiles.get() response into a list of glob patterns.
+
+    The response maps ecosystem -> file kind -> {"pattern": ...}.
+    """
+    patterns = []
+    for ecosystem in supported_files.values():
+        if not isinstance(ecosystem, dict):
+            continue
+        for entry in ecosystem.values():
+            if isinstance(entry, dict) and isinstance(entry.get("pattern"), str):
+                patterns.append(entry["pattern"])
+    return list(dict.fromkeys(patterns))
+
+
+class GitIgnore:
+    """A compiled, inheritable set of .gitignore rules.
+
+    Supports the commonly used subset of gitignore syntax: comments, negation
+    with ``!``, directory-only rules with a trailing ``/``, anchored rules
+    containing a ``/`` and ``**``. The last matching rule wins.
+    """
+
+    def __init__(self, rules: Optional[List[Tuple[str, Pattern, bool, bool]]] = None):
+        self.rules = rules or []
+
+    def extend(self, base: str, lines: Iterable[str]) -> "GitIgnore":
+        """Return a new GitIgnore with rules from a .gitignore located at ``base`` appended."""
+        rules = list(self.rules)
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            elif line.startswith("\\"):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            if "/" in line:
+                regex = "^" + _translate_glob(line.lstrip("/"), match_hidden=True) + "$"
+            else:
+                regex = "^(?:.*/)?" + _translate_glob(line, match_hidden=True) + "$"
+            rules.append((base, re.compile(regex), negate, dir_only))
+        return GitIgnore(rules)
+
+    def is_ignored(self, rel_path: str, is_dir: bool) -> bool:
+        ignored = False
+        for base, regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if base:
+                if not rel_path.startswith(base + "/"):
+                    continue
+                candidate = rel_path[len(base) + 1:]
+            else:
+                candidate = rel_path
+            if regex.match(candidate):
+                ignored = not negate
+        return ignored
+
+
+def _load_gitignore(directory: str, rel_dir: str, parent: GitIgnore) -> GitIgnore:
+    try:
+        with open(f"{directory}/.gitignore", "r", encoding="utf-8", errors="replace") as f:
+            return parent.extend(rel_dir, f)
+    except OSError:
+        return parent
+
+
+def _scan_directory(
+    directory: str,
+    rel_dir: str,
+    matcher: Pattern,
+    gitignore: Optional[GitIgnore],
+    ignored_dirs: frozenset,
+    ancestors: Optional[frozenset] = None,
+) -> Tuple[List[str], List[Tuple[str, str, Optional[GitIgnore], Optional[frozenset]]]]:
+    """Scan one directory and return (matching files, subdirectories to descend into).
+
+    ``ancestors`` holds the ``(st_dev, st_ino)`` of every directory above this one when
+    symlinked directories are followed, so a link back to an ancestor is not walked
+    again. It is None when symlinks are not followed.
+    """
+    if gitignore is not None:
+        gitignore = _load_gitignore(directory, rel_dir, gitignore)
     files = []
-    for file_type in file_types:
-        search_pattern = f"{folder}/**/{file_type}"
-        result = glob.glob(search_pattern, recursive=True)
-        if sys.platform.lower() == "win32":
-            result = fix_file_path(result)
-        files.extend(result)
-    return files
+    subdirs = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name
+                rel_path = f"{rel_dir}/{name}" if rel_dir else name
+                try:
+                    if entry.is_dir(follow_symlinks=False) or (
+                        ancestors is not None and entry.is_symlink() and entry.is_dir()
+                    ):
+                        if name.startswith(".") or name in ignored_dirs:
+                            continue
+                        if gitignore is not None and gitignore.is_ignored(rel_path, True):
+                            continue
+                        child_ancestors = None
+                        if ancestors is not None:
+                            stat = entry.stat()
+                            identity = (stat.st_dev, stat.st_ino)
+                            if identity in ancestors:
+                                continue
+                            child_ancestors = ancestors | {identity}
+                        subdirs.append((f"{directory}/{name}", rel_path, gitignore, child_ancestors))
+                    elif matcher.match(rel_path) and entry.is_file():
+                        if gitignore is not None and gitignore.is_ignored(rel_path, False):
+                            continue
+                        files.append(f"{directory}/{name}")
+                except OSError:
+                    continue
+    except OSError as error:
+        log.debug(f"Skipping unreadable directory {directory}: {error}")
+    return files, subdirs
+
+
+def iter_package_files(
+    folder: str,
+    patterns: Iterable[str],
+    ignored_dirs: Iterable[str] = DEFAULT_IGNORED_DIRS,
+    use_gitignore: bool = True,
+    max_workers: int = 8,
+    follow_symlinks: bool = False,
+) -> Iterator[str]:
+    """Walk ``folder`` once and yield every file matching any of ``patterns``.
+
+    All patterns are compiled into one matcher and directories are scanned in
+    parallel with ``os.scandir``, so the cost is a single walk of the tree no
+    matter how many patterns are supported. Results are yielded as soon as each
+    directory is scanned (in no particular order), so they can be streamed
+    straight into ``Utils.load_files_for_sending_lazy``.
+
+    Args:
+        folder: Root directory to search
+        patterns: Glob patterns, e.g. from ``supported_file_patterns(sdk.supportedfiles.get(org))``
+        ignored_dirs: Directory names never descended into (default: node_modules, __pycache__)
+        use_gitignore: Honor .gitignore files found while walking (default: True)
+        max_workers: Number of directories scanned concurrently (default: 8)
+        follow_symlinks: Descend into symlinked directories, skipping links back to
+            a directory already on the current path (default: False)
+
+    Yields:
+        Paths of matching files, prefixed with ``folder`` and using ``/`` separators
+    """
+    matcher = compile_file_patterns(patterns)
+    ignored_dirs = frozenset(ignored_dirs)
+    root = folder.replace("\\", "/")
+    if len(root) > 1:
+        root = root.rstrip("/")
+    gitignore = GitIgnore() if use_gitignore else None
+    ancestors = None
+    if follow_symlinks:
+        try:
+            stat = os.stat(root)
+            ancestors = frozenset({(stat.st_dev, stat.st_ino)})
+        except OSError:
+            ancestors = frozenset()
+
+    pool = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    pending = {pool.submit(_scan_directory, root, "", matcher, gitignore, ignored_dirs, ancestors)}
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                for directory, rel_dir, dir_gitignore, dir_ancestors in subdirs:
+                    pending.add(
+                        pool.submit(
+                            _scan_directory, directory, rel_dir, matcher, dir_gitignore, ignored_dirs, dir_ancestors
+                        )
+                    )
+                yield from files
+    finally:
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=True)
+
+
+def find_package_files(folder: str, file_types: list) -> list:
+    """Return every file under ``folder`` matching one of ``file_types``.
+
+    Uses a single walk for all file types. Like the previous per-type recursive
+    glob, ignore rules are not applied and symlinked directories are followed; a
+    link back to one of its own parent directories is skipped instead of being
+    walked until the path is too long. Unlike the glob, a file matched by several
+    file types is returned once, and results are in no particular order.
+    """
+    return list(
+        iter_package_files(folder, file_types, ignored_dirs=(), use_gitignore=False, follow_symlinks=True)
+    )
 
 
 def fix_file_path(files) -> list:
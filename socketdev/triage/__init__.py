@@ -1,5 +1,7 @@
 import logging
 from urllib.parse import urlencode
+from typing import Iterator, Optional
+from socketdev.core.pagination import Paginator
 
 log = logging.getLogger("socketdev")
 
@@ -28,6 +30,34 @@ class Triage:
         log.error(f"Error getting alert triage list: {response.status_code}, message: {error_message}")
         return {}
 
+    def iter_alert_triage(
+        self,
+        org_slug: str,
+        query_params: dict = None,
+        page_size: Optional[int] = None,
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+    ) -> Iterator[dict]:
+        """Iterate over the triaged alerts of an organization, following pagination automatically.
+
+        Args:
+            org_slug: Organization slug
+            query_params: Optional dictionary of query parameters
+            page_size: Entries requested per page, sent as ``limit``; the server default if None
+            max_items: Stop after this many entries
+            prefetch: Fetch the next page in the background while the current one is consumed
+        """
+        return iter(
+            Paginator(
+                lambda params: self.list_alert_triage(org_slug, params),
+                query_params,
+                page_size,
+                max_items,
+                prefetch,
+                page_size_param="limit",
+            )
+        )
+
     def update_alert_triage(self, org_slug: str, body: dict) -> dict:
         """Update triaged alerts for an organization.
 
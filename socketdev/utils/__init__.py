@@ -1,12 +1,17 @@
-from typing import Literal, List, Tuple, Optional, Union
+from typing import Iterable, Literal, List, Tuple, Optional, Union
 import logging
 import os
 import weakref
-from threading import Lock
+from threading import RLock
 import tarfile
 import tempfile
 import io
 
+try:
+    import mmap
+except ImportError:  # pragma: no cover - platforms without mmap (e.g. WASI)
+    mmap = None
+
 log = logging.getLogger("socketdev")
 
 IntegrationType = Literal["api", "github", "gitlab", "bitbucket", "azure"]
@@ -19,7 +24,8 @@ class FileDescriptorManager:
     Automatically closes least recently used files when limit is reached.
     """
     _instance = None
-    _lock = Lock()
+    # Reentrant: closing an evicted file unregisters it while the lock is held.
+    _lock = RLock()
     
     def __new__(cls):
         if cls._instance is None:
@@ -46,11 +52,10 @@ class FileDescriptorManager:
             while len(self.open_files) >= self.max_open_files:
                 self.open_files = [ref for ref in self.open_files if ref() is not None]
                 if len(self.open_files) >= self.max_open_files and self.open_files:
-                    oldest_ref = self.open_files.pop(0)
-                    oldest_file = oldest_ref()
-                    if oldest_file is not None and oldest_file._file is not None:
-                        oldest_file.close()
-                        log.debug(f"Auto-closed file due to new descriptor limit: {oldest_file.file_path}")
+                    oldest_file = self._close_oldest()
+                    if oldest_file is None:
+                        break
+                    log.debug(f"Auto-closed file due to new descriptor limit: {oldest_file.file_path}")
                 else:
                     break
     
@@ -62,14 +67,37 @@ class FileDescriptorManager:
             
             # If we're at the limit, close the oldest file
             if len(self.open_files) >= self.max_open_files:
-                oldest_ref = self.open_files.pop(0)
-                oldest_file = oldest_ref()
-                if oldest_file is not None and oldest_file._file is not None:
-                    oldest_file.close()
+                oldest_file = self._close_oldest()
+                if oldest_file is not None:
                     log.debug(f"Auto-closed file due to descriptor limit: {oldest_file.file_path}")
+                else:
+                    log.warning(
+                        f"All {len(self.open_files)} tracked descriptors are held by memory-mapped data "
+                        f"that is still referenced; exceeding max_open_files={self.max_open_files}"
+                    )
             
             # Add the new file to the end of the list
             self.open_files.append(weakref.ref(lazy_file_loader))
+
+    def hold_until_released(self, resource):
+        """
+        Count a descriptor that cannot be closed yet until ``resource`` is garbage collected.
+
+        Used for an mmap whose memoryview slices are still referenced: the mapping keeps
+        its own duplicate descriptor open until the last slice is released.
+        """
+        with self._lock:
+            self.open_files.append(weakref.ref(resource))
+
+    def _close_oldest(self):
+        """Close the least recently opened file that can be closed, and return it."""
+        for index, ref in enumerate(self.open_files):
+            candidate = ref()
+            if isinstance(candidate, LazyFileLoader) and candidate._file is not None:
+                del self.open_files[index]
+                candidate.close()
+                return candidate
+        return None
     
     def unregister_file(self, lazy_file_loader):
         """Remove a file from the tracking list when it's closed."""
@@ -231,6 +259,183 @@ class LazyFileLoader:
         return True
 
 
+class MmapFileLoader(LazyFileLoader):
+    """
+    A LazyFileLoader that memory-maps the file and hands out memoryview slices
+    instead of copying the data into new bytes objects on every read.
+
+    The file is opened and mapped lazily on first use and goes through the same
+    FileDescriptorManager accounting as LazyFileLoader. If mmap is unavailable on
+    the platform, or the file cannot be mapped (empty files, pipes, special files),
+    reads transparently fall back to buffered reads from the open file.
+    """
+
+    def __init__(self, file_path: str, name: str):
+        super().__init__(file_path, name)
+        self._mmap = None
+        self._mmap_failed = mmap is None
+
+    def _ensure_open(self):
+        """Ensure the file is open and mapped, falling back to buffered reads if mapping fails."""
+        super()._ensure_open()
+        if self._mmap is None and not self._mmap_failed:
+            try:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                log.debug(f"Memory-mapped file for reading: {self.file_path}")
+            except (ValueError, OSError) as e:
+                self._mmap_failed = True
+                log.debug(f"Falling back to buffered reads for {self.file_path}: {e}")
+
+    def read(self, size: int = -1):
+        """Return a memoryview slice of the mapped file, or bytes when mapping is unavailable."""
+        self._ensure_open()
+        if self._mmap is None:
+            return super().read(size)
+
+        total = len(self._mmap)
+        start = min(self._position, total)
+        end = total if size is None or size < 0 else min(start + size, total)
+        data = memoryview(self._mmap)[start:end]
+        self._position = end
+
+        # Same contract as LazyFileLoader: release the descriptor once fully read
+        if size is None or size < 0 or end - start < size:
+            self.close()
+
+        return data
+
+    def readline(self, size: int = -1):
+        """Read a line from the file."""
+        self._ensure_open()
+        if self._mmap is None:
+            return super().readline(size)
+        self._mmap.seek(self._position)
+        data = self._mmap.readline(size) if size is not None and size >= 0 else self._mmap.readline()
+        self._position = self._mmap.tell()
+        return data
+
+    def seek(self, offset: int, whence: int = 0):
+        """Seek to a position in the file."""
+        if whence == 2 and self._mmap is not None:
+            self._position = len(self._mmap) + offset
+            return self._position
+        return super().seek(offset, whence)
+
+    def tell(self):
+        """Return current file position."""
+        if self._mmap is not None:
+            if self._closed:
+                raise ValueError("I/O operation on closed file.")
+            return self._position
+        return super().tell()
+
+    def close(self):
+        """Unmap and close the file if it was opened."""
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Slices handed to the caller are still alive; the mapping, and the
+                # descriptor it holds, are released when the last of them is garbage
+                # collected. Until then it keeps counting against max_open_files.
+                _fd_manager.hold_until_released(self._mmap)
+                log.debug(f"Deferring unmap until slices are released: {self.file_path}")
+            self._mmap = None
+        super().close()
+
+
+class UploadKeyBuilder:
+    """
+    Computes the multipart key names used when uploading manifest files.
+
+    The base paths are precompiled once into a trie keyed by path segment, so the
+    cost of stripping a base path is proportional to the depth of each file path
+    instead of the number of base paths. When several base paths match, the first
+    one in list order wins, and a file falls back to the workspace when no base
+    path matches. Relative prefixes, leading slashes and Windows drive letters
+    are then removed from the key.
+    """
+
+    def __init__(self, workspace: Optional[str] = None, base_path: Optional[str] = None, base_paths: Optional[List[str]] = None):
+        if workspace and "\\" in workspace:
+            workspace = workspace.replace("\\", "/")
+        self.workspace = workspace
+
+        if base_paths:
+            candidates = [bp.replace("\\", "/") if "\\" in bp else bp for bp in base_paths]
+        elif base_path:
+            candidates = [base_path.replace("\\", "/") if "\\" in base_path else base_path]
+        else:
+            candidates = []
+
+        # Each trie node is a dict of segment -> child node. A matched base path is
+        # stored on its last node under the None key as (index, stripped, prefix).
+        self._trie = {}
+        for index, bp in enumerate(candidates):
+            stripped = bp.rstrip("/")
+            prefix = bp if bp.endswith("/") else stripped + "/"
+            node = self._trie
+            for segment in stripped.split("/"):
+                node = node.setdefault(segment, {})
+            if None not in node:
+                node[None] = (index, stripped, prefix)
+
+    def _strip_base_path(self, file_path: str) -> Optional[str]:
+        """Return file_path with the first matching base path removed, or None."""
+        node = self._trie
+        if not node:
+            return None
+        best = None
+        for segment in file_path.split("/"):
+            node = node.get(segment)
+            if node is None:
+                break
+            match = node.get(None)
+            if match is not None and (best is None or match[0] < best[0]):
+                # A base path matches if the file lives under it, or is the base path itself
+                best = match
+        if best is None:
+            return None
+        _, stripped, prefix = best
+        if file_path.startswith(prefix):
+            return file_path[len(prefix):]
+        return file_path[len(stripped):].lstrip("/")
+
+    def key(self, file_path: str) -> str:
+        """Compute the upload key for a single file path."""
+        if "\\" in file_path:
+            file_path = file_path.replace("\\", "/")
+
+        key = self._strip_base_path(file_path)
+
+        # If workspace is provided and no base paths matched, fall back to workspace logic
+        if key is None:
+            workspace = self.workspace
+            if workspace and file_path.startswith(workspace):
+                key = file_path[len(workspace):].lstrip("/")
+            else:
+                key = file_path
+
+        # Clean up relative path prefixes, but preserve filename dots
+        while key.startswith("./"):
+            key = key[2:]
+        while key.startswith("../"):
+            key = key[3:]
+        # Remove any remaining leading slashes (for absolute paths)
+        key = key.lstrip("/")
+
+        # Remove Windows drive letter if present (C:/...)
+        if len(key) > 2 and key[1] == ':' and (key[2] == '/' or key[2] == '\\'):
+            key = key[2:].lstrip("/")
+
+        return key
+
+    def keys(self, file_paths: Iterable[str]) -> List[str]:
+        """Compute upload keys for many file paths at once."""
+        key = self.key
+        return [key(file_path) for file_path in file_paths]
+
+
 class Utils:
     @staticmethod
     def validate_integration_type(integration_type: str) -> IntegrationType:
@@ -239,7 +444,7 @@ class Utils:
         return integration_type  # type: ignore
     
     @staticmethod
-    def load_files_for_sending_lazy(files: List[str], workspace: Optional[str] = None, max_open_files: int = 100, base_path: Optional[str] = None, base_paths: Optional[List[str]] = None) -> List[Tuple[str, Tuple[str, LazyFileLoader]]]:
+    def load_files_for_sending_lazy(files: Iterable[str], workspace: Optional[str] = None, max_open_files: int = 100, base_path: Optional[str] = None, base_paths: Optional[List[str]] = None, use_mmap: bool = False) -> List[Tuple[str, Tuple[str, LazyFileLoader]]]:
         """
         Prepares files for sending to the Socket API using lazy loading.
         
@@ -249,11 +454,14 @@ class Utils:
         of manifest files.
 
         Args:
-            files: List of file paths from find_files()
+            files: File paths from find_files(), or an iterator such as
+                   socketdev.tools.iter_package_files() to consume results as they are found
             workspace: Base directory path to make paths relative to
             max_open_files: Maximum number of files to keep open simultaneously (default: 100)
             base_path: Optional base path to strip from key names for cleaner file organization
             base_paths: Optional list of base paths to strip from key names (takes precedence over base_path)
+            use_mmap: Use MmapFileLoader so file contents are handed to the transport as
+                      memoryview slices of a read-only mapping instead of copied bytes (default: False)
 
         Returns:
             List of tuples formatted for requests multipart upload:
@@ -261,15 +469,11 @@ class Utils:
         """
         # Configure the file descriptor manager with the specified limit
         _fd_manager.set_max_open_files(max_open_files)
+        loader_class = MmapFileLoader if use_mmap else LazyFileLoader
         
-        send_files = []
-        if workspace and "\\" in workspace:
-            workspace = workspace.replace("\\", "/")
-        if base_path and "\\" in base_path:
-            base_path = base_path.replace("\\", "/")
-        if base_paths:
-            base_paths = [bp.replace("\\", "/") if "\\" in bp else bp for bp in base_paths]
+        key_builder = UploadKeyBuilder(workspace=workspace, base_path=base_path, base_paths=base_paths)
         
+        send_files = []
         for file_path in files:
             # Normalize file path
             if "\\" in file_path:
@@ -279,68 +483,11 @@ class Utils:
             if os.path.isdir(file_path):
                 continue
 
-            # Handle file path splitting safely
-            if "/" in file_path:
-                _, name = file_path.rsplit("/", 1)
-            else:
-                name = file_path
-
             # Calculate the key name for the form data
-            key = file_path
-            path_stripped = False
-
-            # If base_paths is provided, try to strip one of the paths from the file path
-            if base_paths:
-                for bp in base_paths:
-                    normalized_base_path = bp.rstrip("/") + "/" if not bp.endswith("/") else bp
-                    if key.startswith(normalized_base_path):
-                        key = key[len(normalized_base_path):]
-                        path_stripped = True
-                        break
-                    elif key.startswith(bp.rstrip("/")):
-                        stripped_base = bp.rstrip("/")
-                        if key.startswith(stripped_base + "/") or key == stripped_base:
-                            key = key[len(stripped_base):]
-                            key = key.lstrip("/")
-                            path_stripped = True
-                            break
-            elif base_path:
-                normalized_base_path = base_path.rstrip("/") + "/" if not base_path.endswith("/") else base_path
-                if key.startswith(normalized_base_path):
-                    key = key[len(normalized_base_path):]
-                    path_stripped = True
-                elif key.startswith(base_path.rstrip("/")):
-                    stripped_base = base_path.rstrip("/")
-                    if key.startswith(stripped_base + "/") or key == stripped_base:
-                        key = key[len(stripped_base):]
-                        key = key.lstrip("/")
-                        path_stripped = True
-
-            # If workspace is provided and no base paths matched, fall back to workspace logic
-            if not path_stripped and workspace and file_path.startswith(workspace):
-                key = file_path[len(workspace):]
-                # Remove all leading slashes (for absolute paths)
-                while key.startswith("/"):
-                    key = key[1:]
-                path_stripped = True
-
-            # Clean up relative path prefixes, but preserve filename dots
-            while key.startswith("./"):
-                key = key[2:]
-            while key.startswith("../"):
-                key = key[3:]
-            # Remove any remaining leading slashes (for absolute paths)
-            while key.startswith("/"):
-                key = key[1:]
-
-            # Remove Windows drive letter if present (C:/...)
-            if len(key) > 2 and key[1] == ':' and (key[2] == '/' or key[2] == '\\'):
-                key = key[2:]
-                while key.startswith("/"):
-                    key = key[1:]
+            key = key_builder.key(file_path)
 
             # Create lazy file loader instead of opening file immediately
-            lazy_file = LazyFileLoader(file_path, key)
+            lazy_file = loader_class(file_path, key)
             payload = (key, (key, lazy_file))
             send_files.append(payload)
 
@@ -348,24 +495,23 @@ class Utils:
         return send_files
     
     @staticmethod
-    def create_tar_gz_from_files(files: List[str], workspace: Optional[str] = None) -> io.BytesIO:
+    def create_tar_gz_from_files(files: List[str], workspace: Optional[str] = None, base_path: Optional[str] = None, base_paths: Optional[List[str]] = None) -> io.BytesIO:
         """
         Create a tar.gz archive from a list of files.
+
+        Files are named in the archive with the same keys load_files_for_sending_lazy uses.
         
         Args:
             files: List of file paths to include in the archive
             workspace: Base directory path to make paths relative to
+            base_path: Optional base path to strip from archive names
+            base_paths: Optional list of base paths to strip from archive names (takes precedence over base_path)
             
         Returns:
             io.BytesIO: In-memory tar.gz archive
         """
         tar_buffer = io.BytesIO()
-        
-        # Normalize workspace path
-        if workspace and "\\" in workspace:
-            workspace = workspace.replace("\\", "/")
-        if workspace:
-            workspace = workspace.rstrip("/")
+        key_builder = UploadKeyBuilder(workspace=workspace, base_path=base_path, base_paths=base_paths)
         
         with tarfile.open(fileobj=tar_buffer, mode='w:gz') as tar:
             for file_path in files:
@@ -383,24 +529,7 @@ class Utils:
                     continue
                 
                 # Calculate arcname (the name in the archive)
-                arcname = normalized_path
-                if workspace:
-                    workspace_with_slash = workspace + "/"
-                    if normalized_path.startswith(workspace_with_slash):
-                        arcname = normalized_path[len(workspace_with_slash):]
-                    elif normalized_path.startswith(workspace):
-                        arcname = normalized_path[len(workspace):].lstrip("/")
-                
-                # Clean up relative path prefixes
-                while arcname.startswith("./"):
-                    arcname = arcname[2:]
-                while arcname.startswith("../"):
-                    arcname = arcname[3:]
-                arcname = arcname.lstrip("/")
-                
-                # Remove Windows drive letter if present
-                if len(arcname) > 2 and arcname[1] == ':' and (arcname[2] == '/' or arcname[2] == '\\'):
-                    arcname = arcname[2:].lstrip("/")
+                arcname = key_builder.key(normalized_path)
                 
                 log.debug(f"Adding to archive: {normalized_path} as {arcname}")
                 tar.add(normalized_path, arcname=arcname)
@@ -411,17 +540,20 @@ class Utils:
         return tar_buffer
     
     @staticmethod
-    def prepare_archive_files_for_upload(tar_files: Union[str, List[str]]) -> List[Tuple[str, Tuple[str, LazyFileLoader]]]:
+    def prepare_archive_files_for_upload(tar_files: Union[str, List[str]], use_mmap: bool = False) -> List[Tuple[str, Tuple[str, LazyFileLoader]]]:
         """
         Prepare archive files for upload to the API.
         
         Args:
             tar_files: Path or list of paths to archive files (.tar, .tar.gz, .tgz, .zip)
+            use_mmap: Use MmapFileLoader to avoid copying archive contents into bytes
+                      objects (default: False)
             
         Returns:
             List of tuples formatted for requests multipart upload
         """
         files_list = [tar_files] if isinstance(tar_files, str) else tar_files
+        loader_class = MmapFileLoader if use_mmap else LazyFileLoader
         prepared_files = []
         
         for file_path in files_list:
@@ -435,7 +567,7 @@ class Utils:
                 filename = normalized_path
             
             # Create lazy file loader
-            lazy_file = LazyFileLoader(normalized_path, filename)
+            lazy_file = loader_class(normalized_path, filename)
             prepared_files.append(("file", (filename, lazy_file)))
         
         log.debug(f"Prepared {len(prepared_files)} archive files for upload")
@@ -1,6 +1,8 @@
 import logging
 import json
 from urllib.parse import urlencode
+from typing import Iterator, Optional
+from socketdev.core.pagination import Paginator
 
 log = logging.getLogger("socketdev")
 
@@ -33,6 +35,38 @@ class Webhooks:
         log.error(response.text)
         return {}
 
+    def iter_webhooks(
+        self,
+        org_slug: str,
+        page_size: Optional[int] = None,
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+        **query_params,
+    ) -> Iterator[dict]:
+        """
+        Iterate over the webhooks of an organization, following pagination automatically.
+
+        Args:
+            org_slug: Organization slug
+            page_size: Webhooks requested per page, sent as ``limit``; the server default if None
+            max_items: Stop after this many webhooks
+            prefetch: Fetch the next page in the background while the current one is consumed
+            **query_params: Additional query parameters
+
+        Returns:
+            Iterator over webhooks
+        """
+        return iter(
+            Paginator(
+                lambda params: self.list(org_slug, **params),
+                query_params,
+                page_size,
+                max_items,
+                prefetch,
+                page_size_param="limit",
+            )
+        )
+
     def create(self, org_slug: str, **kwargs) -> dict:
         """
         Create a new webhook.
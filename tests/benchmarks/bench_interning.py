@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark ArtifactInterner memory savings for org-wide analysis.
+
+Builds --scans scans of --artifacts artifacts drawn from --packages unique packages,
+parsing each artifact from its own JSON line like FullScans.stream does. Each scan puts
+packages under different top-level ancestors. Reports the memory retained when holding
+every scan, with and without a shared interner.
+
+Usage:
+    python tests/benchmarks/bench_interning.py [--scans 200] [--artifacts 1000] [--packages 5000]
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from socketdev.core.interning import ArtifactInterner  # noqa: E402
+
+
+def make_package(i):
+    return {
+        "id": str(i),
+        "type": "npm",
+        "name": f"package-{i}",
+        "version": "1.0.0",
+        "license": "MIT",
+        "author": ["someone", "someone-else"],
+        "size": 12345,
+        "score": {"supplyChain": 0.9, "quality": 0.8, "maintenance": 0.7, "vulnerability": 1.0, "license": 1.0, "overall": 0.8},
+        "alerts": [
+            {"key": f"k{i}", "type": "envVars", "severity": "low", "category": "supplyChainRisk", "file": "index.js", "props": {"envVars": ["HOME", "PATH"]}, "action": "ignore"}
+        ],
+        "licenseDetails": [{"spdxDisj": [[{"licenseId": "MIT"}]], "provenance": "license-file", "filepath": "LICENSE", "match_strength": 100, "authors": [], "errorData": ""}],
+        "licenseAttrib": [{"attribText": "MIT License\n\nCopyright (c) someone\n\n" + "Permission is hereby granted... " * 20, "attribData": []}],
+    }
+
+
+def build_scans(lines_per_scan, interner):
+    scans = []
+    for scan in lines_per_scan:
+        artifacts = {}
+        for line in scan:
+            artifact = json.loads(line)
+            artifacts[artifact["id"]] = interner.intern(artifact) if interner is not None else artifact
+        scans.append(artifacts)
+    return scans
+
+
+def measure(lines_per_scan, interner):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    scans = build_scans(lines_per_scan, interner)
+    seconds = time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del scans
+    return retained, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scans", type=int, default=200)
+    parser.add_argument("--artifacts", type=int, default=1000)
+    parser.add_argument("--packages", type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    packages = [make_package(i) for i in range(args.packages)]
+    lines_per_scan = []
+    for scan in range(args.scans):
+        roots = [f"root-{scan}-{r}" for r in range(5)]
+        lines = []
+        for package in rng.sample(packages, args.artifacts):
+            artifact = dict(package, topLevelAncestors=[rng.choice(roots)], direct=False, manifestFiles=[{"file": "package-lock.json"}])
+            lines.append(json.dumps(artifact))
+        lines_per_scan.append(lines)
+
+    plain, plain_seconds = measure(lines_per_scan, None)
+    interner = ArtifactInterner()
+    interned, interned_seconds = measure(lines_per_scan, interner)
+    total = args.scans * args.artifacts
+    print(f"{total} artifact occurrences, {len(interner)} unique packages")
+    print(f"without interner: {plain / 1e6:7.1f} MB retained ({plain_seconds:.1f}s traced)")
+    print(f"with interner:    {interned / 1e6:7.1f} MB retained ({interned_seconds:.1f}s traced)")
+    print(f"{plain / interned:.1f}x less memory; {interner.stats.to_dict()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark the local CycloneDX/SPDX/OpenVEX exporters on a synthetic full scan.
+
+Writes a cached NDJSON stream of --components artifacts, then times each local
+exporter reading it and writing the document to disk, then records peak traced
+memory in a separate run. For comparison it also times loading the same document as one JSON value,
+which is what handling an API export response costs before any network time.
+
+Usage:
+    python tests/benchmarks/bench_local_export.py [--components 100000]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from socketdev.export.local import write_cdx_bom, write_openvex_bom, write_spdx_bom  # noqa: E402
+
+
+def make_artifact(i, rng, count):
+    alerts = []
+    if rng.random() < 0.05:
+        alerts.append(
+            {
+                "key": f"alert-{i}",
+                "type": "criticalCVE",
+                "severity": "critical",
+                "category": "vulnerability",
+                "props": {"cveId": f"CVE-2024-{i}", "ghsaId": f"GHSA-{i}", "title": "Prototype pollution"},
+            }
+        )
+    return {
+        "id": f"id-{i}",
+        "type": "npm",
+        "name": f"package-{i}",
+        "version": f"1.{i % 50}.0",
+        "direct": i < 100,
+        "topLevelAncestors": [f"id-{rng.randrange(100)}"],
+        "dependencies": [f"id-{rng.randrange(count)}" for _ in range(rng.randint(0, 4))],
+        "license": "MIT",
+        "author": ["someone"],
+        "alerts": alerts,
+    }
+
+
+def measure(fn):
+    # Timed without tracemalloc, which slows allocation-heavy code several times over.
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--components", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "scan.ndjson")
+        with open(source, "w", encoding="utf-8") as f:
+            for i in range(args.components):
+                f.write(json.dumps(make_artifact(i, rng, args.components)) + "\n")
+
+        for name, writer in (("cyclonedx", write_cdx_bom), ("spdx", write_spdx_bom), ("openvex", write_openvex_bom)):
+            target = os.path.join(tmp, f"{name}.json")
+            count, seconds, peak = measure(lambda: writer(source, target))
+            size = os.path.getsize(target)
+            print(f"{name:10s} {count:7d} entries  {seconds:5.2f}s  {size / 1e6:6.1f} MB written  peak {peak / 1e6:5.1f} MB")
+            if name == "cyclonedx":
+                cdx_target = target
+
+        with open(cdx_target, "r", encoding="utf-8") as f:
+            body = f.read()
+        _, seconds, peak = measure(lambda: json.loads(body))
+        print(f"parsing the CycloneDX document as one response body: {seconds:.2f}s  peak {peak / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
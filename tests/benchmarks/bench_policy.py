@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark local security-policy evaluation.
+
+Compiles a policy covering --types alert types and evaluates N alerts drawn from
+them, as a flat alert list and as streamed artifacts, then with stop_on_error set
+and a single error alert in the middle of the input.
+
+Usage:
+    python tests/benchmarks/bench_policy.py [--alerts 1000000] [--types 100] [--warn-share 0.1]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from socketdev.core.policy import SecurityPolicy  # noqa: E402
+
+
+def best_of(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alerts", type=int, default=1_000_000)
+    parser.add_argument("--types", type=int, default=100)
+    parser.add_argument("--warn-share", type=float, default=0.1, help="Share of alert types with a warn rule")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    types = [f"alertType{i}" for i in range(args.types)]
+    warn_types = set(types[: int(len(types) * args.warn_share)])
+    rules = {
+        alert_type: {"action": "warn" if alert_type in warn_types else rng.choice(["ignore", "monitor", "defer"])}
+        for alert_type in types
+    }
+    rules["malware"] = {"action": "error"}
+    policy = SecurityPolicy.from_settings({"securityPolicyRules": rules})
+
+    alerts = [{"key": str(i), "type": rng.choice(types), "severity": "low"} for i in range(args.alerts)]
+    artifacts = {str(i): {"id": str(i), "alerts": alerts[i * 10 : i * 10 + 10]} for i in range(args.alerts // 10)}
+
+    seconds, result = best_of(lambda: policy.evaluate(alerts))
+    print(f"evaluate:           {args.alerts} alerts in {seconds * 1000:7.1f} ms, {len(result.violations)} violations")
+    seconds, result = best_of(lambda: policy.evaluate_artifacts(artifacts))
+    print(f"evaluate_artifacts: {result.evaluated} alerts in {seconds * 1000:7.1f} ms")
+
+    alerts[len(alerts) // 2] = {"key": "bad", "type": "malware", "severity": "critical"}
+    seconds, result = best_of(lambda: policy.evaluate(alerts, stop_on_error=True))
+    print(f"stop_on_error:      stopped after {result.evaluated} alerts in {seconds * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark purl parsing and canonicalization.
+
+Parses N purls drawn from a realistic mix of ecosystems, first with every input
+unique (cold cache) and then with a lockfile-like repeat rate (warm cache).
+
+Usage:
+    python tests/benchmarks/bench_purl_parse.py [--purls 1000000] [--unique 20000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from socketdev.core.packageurl import canonicalize_purl, clear_purl_cache, parse_purl  # noqa: E402
+
+TEMPLATES = [
+    "pkg:npm/lodash-{i}@4.17.{v}",
+    "pkg:npm/%40scope{i}/pkg@1.{v}.0",
+    "pkg:pypi/Django_Extension{i}@3.{v}",
+    "pkg:maven/org.apache.commons/commons-lang{i}@3.{v}?type=jar",
+    "pkg:golang/github.com/acme/mod{i}@v1.{v}.0",
+    "pkg:gem/rails{i}@7.0.{v}",
+]
+
+
+def make_purls(count, rng):
+    return [rng.choice(TEMPLATES).format(i=rng.randint(0, 10**9), v=rng.randint(0, 99)) for _ in range(count)]
+
+
+def rate(fn, purls):
+    start = time.perf_counter()
+    for purl in purls:
+        fn(purl)
+    seconds = time.perf_counter() - start
+    return len(purls) / seconds, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--purls", type=int, default=1_000_000)
+    parser.add_argument("--unique", type=int, default=20_000, help="Distinct purls in the warm-cache run")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    cold = make_purls(args.purls, rng)
+    pool = make_purls(args.unique, rng)
+    warm = [rng.choice(pool) for _ in range(args.purls)]
+
+    for label, fn in (("parse_purl", parse_purl), ("canonicalize_purl", canonicalize_purl)):
+        clear_purl_cache()
+        per_second, seconds = rate(fn, cold)
+        print(f"{label:<18} cold: {per_second:>12,.0f} purls/s ({seconds:.2f}s for {len(cold):,} unique)")
+        clear_purl_cache()
+        per_second, seconds = rate(fn, warm)
+        print(f"{label:<18} warm: {per_second:>12,.0f} purls/s ({seconds:.2f}s, {args.unique:,} distinct)")
+
+
+if __name__ == "__main__":
+    main()
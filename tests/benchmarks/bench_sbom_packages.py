@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark Sbom.create_packages_dict on a synthetic 100k-package SBOM.
+
+Compares one-pass transitive counting with lazily computed Package url/purl
+against the previous implementation (kept below as legacy_create_packages_dict
+and LegacyPackage) for time and retained memory, and checks that both report
+the same transitives.
+
+Usage:
+    python tests/benchmarks/bench_sbom_packages.py [--packages 100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from socketdev.core.classes import Package  # noqa: E402
+from socketdev.sbom import Sbom  # noqa: E402
+
+
+class LegacyPackage(Package):
+    """Package as it was before url and purl became lazy: both built eagerly, url twice."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.url = f"https://socket.dev/{self.type}/package/{self.name}/overview/{self.version}"
+        self.url = f"https://socket.dev/{self.type}/package/{self.name}/overview/{self.version}"
+        self.purl = f"{self.type}/{self.name}@{self.version}"
+
+
+def legacy_create_packages_dict(sbom):
+    packages = {}
+    top_level_count = {}
+    for package_id in sbom:
+        package = LegacyPackage(**sbom[package_id])
+        if package.id not in packages:
+            packages[package.id] = package
+            for top_id in package.topLevelAncestors:
+                top_level_count[top_id] = top_level_count.get(top_id, 0) + 1
+    for package_id in top_level_count:
+        packages[package_id].transitives = top_level_count[package_id]
+    return packages
+
+
+def make_sbom(count):
+    rng = random.Random(0)
+    roots = [f"root-{i}" for i in range(max(1, count // 100))]
+    sbom = {}
+    for i in range(count):
+        package_id = roots[i] if i < len(roots) else f"pkg-{i}"
+        ancestors = [package_id] if i < len(roots) else rng.sample(roots, k=min(len(roots), rng.randint(1, 3)))
+        sbom[package_id] = {
+            "id": package_id,
+            "type": "npm",
+            "name": f"package-{i}",
+            "namespace": None,
+            "version": f"1.{i % 50}.0",
+            "release": None,
+            "direct": i < len(roots),
+            "topLevelAncestors": ancestors,
+            "manifestFiles": [{"file": "package-lock.json"}],
+            "dependencies": [],
+            "author": ["someone"],
+            "size": 1024,
+            "license": "MIT",
+            "alerts": [],
+            "score": {"supplyChain": 0.9, "quality": 0.8, "maintenance": 0.7, "vulnerability": 1.0, "license": 1.0, "overall": 0.8},
+        }
+    return sbom
+
+
+def best_time(fn, sbom, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(sbom)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def retained_memory(fn, sbom):
+    tracemalloc.start()
+    packages = fn(sbom)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return packages, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--packages", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sbom = make_sbom(args.packages)
+    current_fn = Sbom(None).create_packages_dict
+
+    legacy, legacy_memory = retained_memory(legacy_create_packages_dict, sbom)
+    legacy_transitives = {package_id: package.transitives for package_id, package in legacy.items()}
+    del legacy
+    current, memory = retained_memory(current_fn, sbom)
+    assert {package_id: package.transitives for package_id, package in current.items()} == legacy_transitives
+    del current
+
+    legacy_seconds = best_time(legacy_create_packages_dict, sbom, args.repeat)
+    seconds = best_time(current_fn, sbom, args.repeat)
+    print(f"previous: {legacy_seconds:.2f}s, {legacy_memory / 1e6:.0f} MB retained")
+    print(f"current:  {seconds:.2f}s, {memory / 1e6:.0f} MB retained")
+    print(f"identical transitives; {legacy_seconds / seconds:.2f}x faster, {legacy_memory / memory:.2f}x less memory")
+
+
+if __name__ == "__main__":
+    main()
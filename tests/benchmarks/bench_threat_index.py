@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark threat feed membership checks.
+
+Builds a ThreatIndex over --threats feed entries, once as a hash set and once as a
+Bloom filter backed by a ThreatFeedStore, and screens --deps dependency purls of which
+--hits are known threats. Reports index build time, retained memory and check time.
+
+Usage:
+    python tests/benchmarks/bench_threat_index.py [--threats 500000] [--deps 100000] [--hits 20]
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from socketdev.core.threatindex import ThreatFeedStore  # noqa: E402
+
+
+class FakeFeed:
+    def __init__(self, items, per_page):
+        self.items = items
+        self.per_page = per_page
+        self.threatfeed = self
+
+    def get(self, org_slug=None, **params):
+        start = int(params.get("page_cursor") or 0)
+        end = start + self.per_page
+        return {"results": self.items[start:end], "nextPageCursor": str(end) if end < len(self.items) else None}
+
+
+def best_of(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best, result
+
+
+def retained(build):
+    gc.collect()
+    tracemalloc.start()
+    index = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return index, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threats", type=int, default=500_000)
+    parser.add_argument("--deps", type=int, default=100_000)
+    parser.add_argument("--hits", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    items = [
+        {"id": i, "purl": f"pkg:npm/malicious-{i}@1.0.{i % 7}", "threatType": "malware", "updatedAt": "2025-01-01"}
+        for i in range(args.threats)
+    ]
+    deps = [f"pkg:npm/%40scope{i % 500}/dep-{i}@1.{i % 40}.0" if i % 3 == 0 else f"pkg:npm/dep-{i}@2.{i % 9}.1" for i in range(args.deps)]
+    for position, item in zip(rng.sample(range(args.deps), args.hits), rng.sample(items, args.hits)):
+        deps[position] = item["purl"]
+
+    with tempfile.TemporaryDirectory() as tmp, ThreatFeedStore(os.path.join(tmp, "threat-feed.sqlite3")) as store:
+        start = time.perf_counter()
+        delta = store.sync(FakeFeed(items, 1000), "org", per_page=1000)
+        print(f"sync:  {delta.added} entries over {delta.pages} pages in {time.perf_counter() - start:.1f}s")
+
+        for bloom in (False, True):
+            label = "bloom" if bloom else "set  "
+            start = time.perf_counter()
+            index, size = retained(lambda: store.index("org", bloom=bloom))
+            build = time.perf_counter() - start
+            seconds, matches = best_of(lambda: index.check(deps))
+            print(
+                f"{label}: index {size / 1e6:6.1f} MB built in {build:.1f}s (traced); "
+                f"{args.deps} deps checked in {seconds * 1000:6.1f} ms, {len(matches)} matches"
+            )
+
+
+if __name__ == "__main__":
+    main()
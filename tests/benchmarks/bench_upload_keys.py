@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark upload key computation for 1M paths with many base paths.
+
+Compares UploadKeyBuilder against the previous per-file loop over every base
+path, and checks that both produce identical keys.
+
+Usage:
+    python tests/benchmarks/bench_upload_keys.py [--paths 1000000] [--base-paths 200]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "unit"))
+
+from socketdev.utils import UploadKeyBuilder  # noqa: E402
+from test_upload_keys import reference_key  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paths", type=int, default=1_000_000)
+    parser.add_argument("--base-paths", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    services = [f"/monorepo/services/svc{i}" for i in range(args.base_paths)]
+    base_paths = list(reversed(services))
+    paths = [
+        f"{rng.choice(services)}/pkg{rng.randint(0, 50)}/{rng.choice(['package.json', 'requirements.txt', 'go.mod'])}"
+        for _ in range(args.paths)
+    ]
+
+    start = time.perf_counter()
+    builder = UploadKeyBuilder(workspace="/monorepo", base_paths=base_paths)
+    keys = builder.keys(paths)
+    trie_seconds = time.perf_counter() - start
+    print(f"UploadKeyBuilder: {len(paths)} paths in {trie_seconds:.2f}s")
+
+    sample = paths[: max(1, len(paths) // 20)]
+    start = time.perf_counter()
+    reference = [reference_key(p, "/monorepo", None, base_paths) for p in sample]
+    reference_seconds = (time.perf_counter() - start) * len(paths) / len(sample)
+    print(f"previous loop:    {len(paths)} paths in ~{reference_seconds:.2f}s (extrapolated from {len(sample)})")
+
+    assert keys[: len(sample)] == reference, "key mismatch"
+    print(f"identical keys; speedup ~{reference_seconds / trie_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark FullScans.post vs FullScans.archive vs FullScans.submit against a
+local stand-in server.
+
+The stand-in accepts the full-scan upload routes, reads the whole request body
+and answers 201, so the numbers cover client-side preparation and transfer only.
+An optional --bandwidth throttles how fast the server reads the body to mimic a
+slower link.
+
+Usage:
+    python tests/benchmarks/bench_upload_strategy.py
+    python tests/benchmarks/bench_upload_strategy.py --bandwidth 5000000
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from socketdev import socketdev  # noqa: E402
+from socketdev.fullscans import FullScanParams  # noqa: E402
+
+
+def make_handler(bandwidth):
+    class StandInHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            remaining = int(self.headers.get("Content-Length", 0))
+            chunk_size = 64 * 1024
+            while remaining > 0:
+                chunk = self.rfile.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                if bandwidth:
+                    time.sleep(len(chunk) / bandwidth)
+            body = json.dumps({"id": "bench-scan"}).encode()
+            self.send_response(201)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return StandInHandler
+
+
+def build_workload(root, file_count, file_size, compressible):
+    rng = random.Random(file_count)
+    line = b'{"name": "left-pad", "version": "1.3.0", "resolved": "https://registry.npmjs.org/left-pad"},\n'
+    files = []
+    for i in range(file_count):
+        path = os.path.join(root, f"pkg{i}", "package-lock.json")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if compressible:
+            content = (line * (file_size // len(line) + 1))[:file_size]
+        else:
+            content = bytes(rng.getrandbits(8) for _ in range(file_size))
+        with open(path, "wb") as f:
+            f.write(content)
+        files.append(path)
+    return files
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bandwidth", type=float, default=0, help="Server read throttle in bytes/sec (0 = unthrottled)")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.bandwidth))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    sdk = socketdev(token="bench-token")
+    sdk.api.api_url = f"http://127.0.0.1:{server.server_address[1]}/v0"
+    params = FullScanParams(repo="bench", org_slug="bench-org")
+
+    workloads = [
+        ("10 small lockfiles", 10, 4 * 1024, True),
+        ("2000 small lockfiles", 2000, 4 * 1024, True),
+        ("20 large lockfiles", 20, 2 * 1024 * 1024, True),
+        ("20 incompressible files", 20, 256 * 1024, False),
+    ]
+
+    print(f"{'workload':<26}{'post':>10}{'archive':>10}{'submit':>10}  choice")
+    for name, count, size, compressible in workloads:
+        root = tempfile.mkdtemp()
+        try:
+            files = build_workload(root, count, size, compressible)
+            post_time, _ = timed(lambda: sdk.fullscans.post(files, params, use_lazy_loading=True, workspace=root))
+            archive_time, _ = timed(lambda: sdk.fullscans.archive(files=files, workspace=root, params=params))
+            submit_time, (_, decision) = timed(lambda: sdk.fullscans.submit(files, params, workspace=root))
+            print(f"{name:<26}{post_time:>9.3f}s{archive_time:>9.3f}s{submit_time:>9.3f}s  {decision.strategy}")
+        finally:
+            shutil.rmtree(root)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark ScanWarehouse ingestion and queries on a synthetic organization.
+
+Ingests --scans full scans of --artifacts artifacts each, drawn from a shared pool of
+--packages package versions (so most packages appear in many repositories), then
+times "which repos use X@version" and "all critical alerts across the org".
+
+Usage:
+    python tests/benchmarks/bench_warehouse.py [--scans 300] [--artifacts 1000] [--packages 20000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from socketdev.core.warehouse import ScanWarehouse  # noqa: E402
+
+
+def make_pool(count, rng):
+    pool = []
+    for i in range(count):
+        alerts = []
+        if rng.random() < 0.02:
+            alerts.append({"key": f"k{i}", "type": "criticalCVE", "severity": "critical", "category": "vulnerability", "action": "error", "props": {"cveId": f"CVE-2024-{i}"}})
+        if rng.random() < 0.2:
+            alerts.append({"key": f"e{i}", "type": "envVars", "severity": "low", "category": "supplyChainRisk", "action": "ignore"})
+        pool.append(
+            {
+                "id": str(i),
+                "type": "npm",
+                "name": f"package-{i // 3}",
+                "version": f"1.0.{i % 3}",
+                "license": rng.choice(["MIT", "ISC", "Apache-2.0", "MIT OR Apache-2.0"]),
+                "direct": False,
+                "manifestFiles": [{"file": "package-lock.json"}],
+                "alerts": alerts,
+            }
+        )
+    return pool
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scans", type=int, default=300)
+    parser.add_argument("--artifacts", type=int, default=1000)
+    parser.add_argument("--packages", type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    pool = make_pool(args.packages, rng)
+    with tempfile.TemporaryDirectory() as tmp:
+        with ScanWarehouse(os.path.join(tmp, "warehouse.sqlite3")) as warehouse:
+            start = time.perf_counter()
+            for scan in range(args.scans):
+                artifacts = rng.sample(pool, args.artifacts)
+                warehouse.ingest("org", f"scan-{scan}", artifacts, repo=f"repo-{scan}")
+            ingest = time.perf_counter() - start
+            rows = args.scans * args.artifacts
+            print(f"ingest: {args.scans} scans, {rows} artifact rows in {ingest:.1f}s ({rows / ingest:,.0f} rows/s)")
+
+            target = pool[0]
+            repos, seconds = timed(lambda: warehouse.repos_using(target["name"], target["version"]))
+            print(f"repos_using {target['name']}@{target['version']}: {len(repos)} repos in {seconds * 1000:.1f} ms")
+            critical, seconds = timed(lambda: warehouse.alerts(severity="critical"))
+            print(f"alerts(severity='critical'): {len(critical)} rows in {seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
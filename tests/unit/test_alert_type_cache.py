@@ -0,0 +1,99 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from socketdev.core.alerttypecache import AlertTypeCache
+
+
+def _client(known=("malware", "envVars")):
+    client = Mock()
+    client.get.side_effect = lambda types, language="en-US": {
+        alert_type: {"title": f"{alert_type} ({language})"} for alert_type in types if alert_type in known
+    }
+    return client
+
+
+class TestAlertTypeCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "alert-types.sqlite3")
+
+    def test_fetches_only_missing_types_and_persists(self):
+        client = _client()
+        with AlertTypeCache(client, self.path) as cache:
+            self.assertEqual(cache.get("malware"), {"title": "malware (en-US)"})
+            result = cache.get_many(["malware", "envVars", "madeUp", "envVars"])
+            self.assertEqual(list(result), ["malware", "envVars", "madeUp"])
+            self.assertIsNone(result["madeUp"])
+            self.assertEqual([call.args[0] for call in client.get.call_args_list], [["malware"], ["envVars", "madeUp"]])
+            cache.get_many(["malware", "envVars", "madeUp"])
+            self.assertEqual(client.get.call_count, 2)
+            cache.get("malware", language="de-DE")
+            self.assertEqual(client.get.call_count, 3)
+
+        other = _client()
+        with AlertTypeCache(other, self.path) as reopened:
+            self.assertEqual(reopened.get("envVars"), {"title": "envVars (en-US)"})
+            self.assertIsNone(reopened.get("madeUp"))
+            self.assertEqual(reopened.stats.disk_hits, 2)
+        other.get.assert_not_called()
+
+    def test_expired_entries_are_refetched(self):
+        client = _client()
+        with AlertTypeCache(client, self.path, ttl=60, negative_ttl=10) as cache:
+            cache.get_many(["malware", "madeUp"])
+            later = time.time() + 30
+            with patch("socketdev.core.alerttypecache.time.time", return_value=later):
+                cache.get_many(["malware", "madeUp"])
+            self.assertEqual(client.get.call_args.args[0], ["madeUp"])
+
+    def test_failed_requests_are_not_cached(self):
+        client = Mock()
+        client.get.side_effect = [{}, {"alertTypes": [{"type": "malware", "title": "Known malware"}]}]
+        with AlertTypeCache(client, self.path) as cache:
+            self.assertIsNone(cache.get("malware"))
+            self.assertEqual(cache.get("malware")["title"], "Known malware")
+
+    def test_titles_render_from_one_lookup(self):
+        client = _client(known=("malware",))
+        alerts = [{"type": "malware"}, {"type": "envVars"}, {"type": "brandNew"}] * 50000
+        with AlertTypeCache(client, self.path) as cache:
+            titles = cache.titles(alerts)
+        self.assertEqual(len(titles), 150000)
+        self.assertEqual(titles[:3], ["malware (en-US)", "Environment variable access", "brandNew"])
+        self.assertEqual(client.get.call_count, 1)
+
+    def test_concurrent_lookups_share_one_request(self):
+        release = threading.Event()
+        client = Mock()
+
+        def slow_get(types, language="en-US"):
+            release.wait(5)
+            return {alert_type: {"title": alert_type} for alert_type in types}
+
+        client.get.side_effect = slow_get
+        with AlertTypeCache(client, self.path) as cache:
+            threads = [threading.Thread(target=cache.get_many, args=(["malware", "envVars"],)) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            time.sleep(0.05)
+            release.set()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(client.get.call_count, 1)
+
+    def test_other_schema_versions_are_discarded(self):
+        conn = sqlite3.connect(self.path)
+        conn.executescript("CREATE TABLE alert_types (legacy TEXT); PRAGMA user_version=99;")
+        conn.close()
+        with AlertTypeCache(_client(), self.path) as cache:
+            self.assertEqual(cache.get("malware"), {"title": "malware (en-US)"})
+
+
+if __name__ == "__main__":
+    unittest.main()
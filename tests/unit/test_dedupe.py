@@ -187,6 +187,12 @@ class TestDedupe(unittest.TestCase):
         for pkg in result_batched_true + result_batched_false:
             self.assertNotIn("batchIndex", pkg)
 
+    def test_constructed_purl_is_percent_encoded(self):
+        """Test that a purl built from components escapes the npm scope"""
+        package = {"id": "1", "type": "npm", "namespace": "@babel", "name": "core", "version": "7.0.0", "alerts": []}
+        result = Dedupe.consolidate_and_merge_alerts([package])
+        self.assertEqual(result["purl"], "pkg:npm/%40babel/core@7.0.0")
+
 
 if __name__ == '__main__':
     unittest.main()
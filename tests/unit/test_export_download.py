@@ -0,0 +1,74 @@
+import io
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import Mock
+
+from socketdev.exceptions import APIResourceNotFound
+from socketdev.export import Export, ExportQueryParams
+
+
+class FakeExportApi:
+    def __init__(self, body=b'{"bomFormat":"CycloneDX","name":"caf\xc3\xa9"}', status_code=200, missing=()):
+        self.body = body
+        self.status_code = status_code
+        self.missing = set(missing)
+        self.paths = []
+        self.lock = threading.Lock()
+
+    def do_request(self, path, stream=False, **kwargs):
+        with self.lock:
+            self.paths.append((path, stream))
+        if any(f"/{missing}" in path for missing in self.missing):
+            raise APIResourceNotFound(status_code=404)
+        response = Mock(status_code=self.status_code, text="error")
+        # Split inside the multi-byte character to exercise incremental decoding.
+        response.iter_content.side_effect = lambda chunk_size: iter([self.body[:-4], b"", self.body[-4:]])
+        return response
+
+
+class TestExportDownload(unittest.TestCase):
+    def test_streams_raw_bytes_to_binary_file(self):
+        api = FakeExportApi()
+        out = io.BytesIO()
+        written = Export(api).download("cdx", "org", "scan-1", out, ExportQueryParams(project_name="p"))
+        self.assertEqual(out.getvalue(), api.body)
+        self.assertEqual(written, len(api.body))
+        self.assertEqual(api.paths, [("orgs/org/export/cdx/scan-1?project_name=p", True)])
+
+    def test_text_file_gets_decoded_body(self):
+        out = io.StringIO()
+        Export(FakeExportApi()).download("spdx", "org", "scan-1", out)
+        self.assertEqual(out.getvalue(), '{"bomFormat":"CycloneDX","name":"café"}')
+
+    def test_error_status_writes_nothing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            target = os.path.join(tmp, "bom.json")
+            self.assertEqual(Export(FakeExportApi(status_code=204)).download("cdx", "org", "scan-1", target), 0)
+            self.assertEqual(os.listdir(tmp), [])
+
+    def test_rejects_unknown_format(self):
+        with self.assertRaises(ValueError):
+            Export(FakeExportApi()).download("xml", "org", "scan-1", io.BytesIO())
+
+    def test_download_many(self):
+        api = FakeExportApi(missing={"scan-2"})
+        with tempfile.TemporaryDirectory() as tmp:
+            results = Export(api).download_many("openvex", "org", ["scan-1", "scan-2", "scan-3", "scan-1"], tmp, max_workers=3)
+            self.assertEqual(
+                results,
+                {
+                    "scan-1": os.path.join(tmp, "scan-1.openvex.json"),
+                    "scan-2": None,
+                    "scan-3": os.path.join(tmp, "scan-3.openvex.json"),
+                },
+            )
+            self.assertEqual(sorted(os.listdir(tmp)), ["scan-1.openvex.json", "scan-3.openvex.json"])
+            with open(results["scan-3"], "rb") as f:
+                self.assertEqual(f.read(), api.body)
+        self.assertEqual(len(api.paths), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
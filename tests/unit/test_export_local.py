@@ -0,0 +1,125 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from socketdev.export import Export, ExportQueryParams
+from socketdev.export.local import iter_artifacts
+from socketdev.fullscans import FullScanStreamResponse
+
+
+def _artifacts():
+    return {
+        "a1": {
+            "id": "a1",
+            "type": "npm",
+            "namespace": "@babel",
+            "name": "core",
+            "version": "7.0.0",
+            "direct": True,
+            "topLevelAncestors": [],
+            "dependencies": ["b2"],
+            "license": "MIT",
+            "author": ["someone"],
+            "alerts": [],
+        },
+        "b2": {
+            "id": "b2",
+            "type": "pypi",
+            "name": "requests",
+            "version": "2.0.0",
+            "topLevelAncestors": ["a1"],
+            "alerts": [
+                {
+                    "key": "k",
+                    "type": "criticalCVE",
+                    "severity": "critical",
+                    "category": "vulnerability",
+                    "props": {"cveId": "CVE-2024-1", "ghsaId": "GHSA-x", "title": "Bad", "firstPatchedVersionIdentifier": "2.1.0"},
+                },
+                {"key": "k2", "type": "envVars", "severity": "low", "category": "supplyChainRisk", "props": {}},
+            ],
+        },
+    }
+
+
+class TestLocalExport(unittest.TestCase):
+    def setUp(self):
+        self.export = Export(Mock())
+
+    def _render(self, method, source, query_params=None):
+        out = io.StringIO()
+        count = method(source, out, query_params)
+        return count, json.loads(out.getvalue())
+
+    def test_cdx(self):
+        params = ExportQueryParams(author="me", project_name="proj", project_version="1.0")
+        count, doc = self._render(self.export.cdx_bom_local, _artifacts(), params)
+        self.assertEqual(count, 2)
+        self.assertEqual((doc["bomFormat"], doc["specVersion"]), ("CycloneDX", "1.5"))
+        self.assertEqual(doc["metadata"]["component"], {"type": "application", "bom-ref": "project", "name": "proj", "version": "1.0"})
+        first = doc["components"][0]
+        self.assertEqual(first["purl"], "pkg:npm/%40babel/core@7.0.0")
+        self.assertEqual((first["group"], first["licenses"], first["author"]), ("@babel", [{"expression": "MIT"}], "someone"))
+        self.assertEqual(
+            doc["dependencies"],
+            [{"ref": "a1", "dependsOn": ["b2"]}, {"ref": "b2", "dependsOn": []}, {"ref": "project", "dependsOn": ["a1"]}],
+        )
+
+    def test_spdx(self):
+        count, doc = self._render(self.export.spdx_bom_local, _artifacts())
+        self.assertEqual(count, 2)
+        self.assertEqual(doc["spdxVersion"], "SPDX-2.3")
+        self.assertEqual([p["SPDXID"] for p in doc["packages"]], ["SPDXRef-Package-a1", "SPDXRef-Package-b2"])
+        self.assertEqual(doc["packages"][1]["licenseDeclared"], "NOASSERTION")
+        self.assertEqual(doc["packages"][1]["externalRefs"][0]["referenceLocator"], "pkg:pypi/requests@2.0.0")
+        self.assertEqual(
+            [(r["spdxElementId"], r["relationshipType"], r["relatedSpdxElement"]) for r in doc["relationships"]],
+            [("SPDXRef-DOCUMENT", "DESCRIBES", "SPDXRef-Package-a1"), ("SPDXRef-Package-a1", "DEPENDS_ON", "SPDXRef-Package-b2")],
+        )
+
+    def test_openvex(self):
+        count, doc = self._render(self.export.openvex_bom_local, _artifacts())
+        self.assertEqual(count, 1)
+        self.assertEqual(
+            doc["statements"],
+            [
+                {
+                    "vulnerability": {"name": "CVE-2024-1", "aliases": ["GHSA-x"], "description": "Bad"},
+                    "products": [{"@id": "pkg:pypi/requests@2.0.0"}],
+                    "status": "affected",
+                    "action_statement": "Upgrade to 2.1.0",
+                }
+            ],
+        )
+
+    def test_empty_source_is_valid_json(self):
+        count, doc = self._render(self.export.cdx_bom_local, {})
+        self.assertEqual((count, doc["components"], doc["dependencies"]), (0, [], []))
+
+    def test_ndjson_file_and_path_output(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "scan.ndjson")
+            with open(source, "w") as f:
+                for artifact in list(_artifacts().values()) * 2:
+                    f.write(json.dumps(artifact) + "\n")
+                f.write('"\n')
+            target = os.path.join(tmp, "bom.json")
+            self.assertEqual(self.export.spdx_bom_local(source, target), 2)
+            with open(target) as f:
+                self.assertEqual(len(json.load(f)["packages"]), 2)
+            self.assertEqual(sorted(os.listdir(tmp)), ["bom.json", "scan.ndjson"])
+
+    def test_typed_stream_response(self):
+        response = FullScanStreamResponse.from_dict({"success": True, "status": 200, "artifacts": _artifacts()})
+        artifacts = list(iter_artifacts(response))
+        self.assertEqual([(a["id"], a["type"]) for a in artifacts], [("a1", "npm"), ("b2", "pypi")])
+        count, doc = self._render(self.export.openvex_bom_local, response)
+        self.assertEqual(count, 1)
+        self.assertEqual(doc["statements"][0]["products"], [{"@id": "pkg:pypi/requests@2.0.0"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
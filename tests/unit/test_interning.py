@@ -0,0 +1,80 @@
+import json
+import unittest
+from unittest.mock import Mock
+
+from socketdev.core.interning import ArtifactInterner
+from socketdev.fullscans import FullScans
+
+
+def _artifact(artifact_id="1", ancestors=("root",), version="4.17.21"):
+    return {
+        "id": artifact_id,
+        "type": "npm",
+        "name": "lodash",
+        "version": version,
+        "license": "MIT",
+        "topLevelAncestors": list(ancestors),
+        "alerts": [{"key": "k", "type": "envVars", "severity": "low", "props": {"envVars": ["HOME"]}}],
+        "licenseAttrib": [{"attribText": "Copyright (c) " + "x" * 100, "attribData": []}],
+    }
+
+
+def _copy(artifact):
+    return json.loads(json.dumps(artifact))
+
+
+class TestArtifactInterner(unittest.TestCase):
+    def test_identical_artifacts_share_one_dict(self):
+        interner = ArtifactInterner()
+        first = interner.intern(_copy(_artifact()))
+        second = interner.intern(_copy(_artifact()))
+        self.assertIs(first, second)
+        self.assertEqual(interner.stats.to_dict()["shared_artifacts"], 1)
+        self.assertEqual(len(interner), 1)
+
+    def test_scan_specific_fields_keep_own_dict_but_share_payload(self):
+        interner = ArtifactInterner()
+        first = interner.intern(_copy(_artifact(ancestors=["a"])))
+        second = interner.intern(_copy(_artifact(ancestors=["b"])))
+        self.assertIsNot(first, second)
+        self.assertEqual(second["topLevelAncestors"], ["b"])
+        self.assertIs(first["alerts"], second["alerts"])
+        self.assertIs(first["licenseAttrib"], second["licenseAttrib"])
+        self.assertIs(next(k for k in first if k == "alerts"), next(k for k in second if k == "alerts"))
+
+    def test_different_versions_and_changed_alerts_are_not_merged(self):
+        interner = ArtifactInterner()
+        first = interner.intern(_copy(_artifact()))
+        other_version = interner.intern(_copy(_artifact(version="4.17.20")))
+        changed = _copy(_artifact())
+        changed["alerts"] = []
+        changed = interner.intern(changed)
+        self.assertEqual(other_version["version"], "4.17.20")
+        self.assertEqual(changed["alerts"], [])
+        self.assertEqual(first["alerts"][0]["type"], "envVars")
+        self.assertEqual(interner.stats.unique, 2)
+
+    def test_stream_uses_shared_interner(self):
+        api = Mock()
+        response = api.do_request.return_value
+        response.status_code = 200
+        response.text = json.dumps(_artifact()) + "\n"
+        fullscans = FullScans(api)
+        fullscans.interner = ArtifactInterner()
+        first = fullscans.stream("org", "scan-1")
+        second = fullscans.stream("org", "scan-2")
+        self.assertIs(first["1"], second["1"])
+        self.assertEqual(fullscans.interner.stats.artifacts, 2)
+
+    def test_stream_accepts_empty_interner_argument(self):
+        api = Mock()
+        response = api.do_request.return_value
+        response.status_code = 200
+        response.text = json.dumps(_artifact()) + "\n"
+        interner = ArtifactInterner()
+        FullScans(api).stream("org", "scan-1", interner=interner)
+        self.assertEqual(len(interner), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
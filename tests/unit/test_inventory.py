@@ -0,0 +1,174 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from socketdev.core.inventory import InventoryStore
+from socketdev.core.warehouse import ScanWarehouse
+
+
+def _artifact(name, version, direct=False, manifests=(), ancestors=()):
+    artifact = {"id": f"{name}-{version}", "type": "npm", "name": name, "version": version, "direct": direct}
+    if manifests:
+        artifact["manifestFiles"] = [{"file": manifest} for manifest in manifests]
+    if ancestors:
+        artifact["topLevelAncestors"] = list(ancestors)
+    return artifact
+
+
+class FakeSdk:
+    def __init__(self, repos, scans):
+        self.listing = repos
+        self.scans = scans
+        self.streamed = []
+        self.lock = threading.Lock()
+        self.repos = self
+        self.fullscans = self
+
+    def list_all(self, org_slug, concurrency=8):
+        return [{"slug": name, "name": name, "head_full_scan_id": head} for name, head in self.listing.items()]
+
+    def stream(self, org_slug, full_scan_id):
+        with self.lock:
+            self.streamed.append(full_scan_id)
+        scan = self.scans[full_scan_id]
+        if isinstance(scan, Exception):
+            raise scan
+        return {artifact["id"]: artifact for artifact in scan}
+
+
+class TestInventoryStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "inventory.sqlite3")
+
+    def test_sync_streams_only_changed_heads_and_reports_delta(self):
+        scans = {
+            "a1": [_artifact("left-pad", "1.0.0", True), _artifact("lodash", "4.17.20")],
+            "b1": [_artifact("express", "4.0.0", True)],
+            "a2": [_artifact("left-pad", "1.0.0", True), _artifact("lodash", "4.17.21")],
+            "c1": [_artifact("react", "18.0.0")],
+        }
+        sdk = FakeSdk({"repo-a": "a1", "repo-b": "b1"}, scans)
+        with InventoryStore(self.path) as store:
+            first = store.sync(sdk, "org")
+            self.assertEqual([d.repo for d in first.repos], ["repo-a", "repo-b"])
+            self.assertEqual((first.added, first.removed, first.unchanged), (3, 0, 0))
+
+            sdk.listing = {"repo-a": "a2", "repo-c": "c1"}
+            sdk.streamed.clear()
+            second = store.sync(sdk, "org")
+
+        self.assertEqual(sorted(sdk.streamed), ["a2", "c1"])
+        deltas = {d.repo: d for d in second.repos}
+        self.assertEqual(deltas["repo-a"].to_dict(), {
+            "repo": "repo-a",
+            "previous_head": "a1",
+            "head": "a2",
+            "added": ["pkg:npm/lodash@4.17.21"],
+            "removed": ["pkg:npm/lodash@4.17.20"],
+        })
+        self.assertEqual((deltas["repo-b"].head, deltas["repo-b"].removed), (None, ["pkg:npm/express@4.0.0"]))
+        self.assertEqual(deltas["repo-c"].added, ["pkg:npm/react@18.0.0"])
+
+        with InventoryStore(self.path) as reopened:
+            self.assertEqual(reopened.heads("org"), {"repo-a": "a2", "repo-c": "c1"})
+            self.assertEqual(reopened.packages("org", "repo-a"), ["pkg:npm/left-pad@1.0.0", "pkg:npm/lodash@4.17.21"])
+            sdk.streamed.clear()
+            third = reopened.sync(sdk, "org")
+        self.assertEqual((sdk.streamed, third.repos, third.unchanged), ([], [], 2))
+
+    def test_failed_streams_are_retried_next_sync(self):
+        sdk = FakeSdk({"repo-a": "a1", "repo-b": "b1"}, {"a1": RuntimeError("boom"), "b1": []})
+        with InventoryStore(self.path) as store:
+            delta = store.sync(sdk, "org")
+            self.assertEqual((delta.failed, delta.repos), (["repo-a", "repo-b"], []))
+            sdk.scans = {"a1": [_artifact("x", "1")], "b1": [_artifact("y", "1")]}
+            self.assertEqual(store.sync(sdk, "org").added, 2)
+
+    def test_empty_listing_removes_nothing(self):
+        sdk = FakeSdk({"repo-a": "a1"}, {"a1": [_artifact("x", "1")]})
+        with InventoryStore(self.path) as store:
+            store.sync(sdk, "org")
+            sdk.listing = {}
+            with self.assertLogs("socketdev", level="WARNING"):
+                delta = store.sync(sdk, "org")
+            self.assertEqual(delta.repos, [])
+            self.assertEqual(store.heads("org"), {"repo-a": "a1"})
+
+
+    def test_who_uses_finds_repos_and_declaring_manifests(self):
+        scans = {
+            "a1": [
+                _artifact("express", "4.0.0", True, manifests=["package.json"]),
+                _artifact("lodash", "4.17.20", ancestors=["express-4.0.0"]),
+            ],
+            "b1": [
+                _artifact("lodash", "4.17.21", True, manifests=["web/package.json", "api/package.json"]),
+            ],
+        }
+        sdk = FakeSdk({"repo-a": "a1", "repo-b": "b1"}, scans)
+        with InventoryStore(self.path) as store:
+            store.sync(sdk, "org")
+            usages = store.who_uses("lodash")
+            self.assertEqual([(u.repo, u.version, u.direct) for u in usages], [
+                ("repo-a", "4.17.20", False),
+                ("repo-b", "4.17.21", True),
+            ])
+            self.assertEqual(usages[0].manifest_files, ["package.json"])
+            self.assertEqual(usages[1].manifest_files, ["api/package.json", "web/package.json"])
+            self.assertEqual(usages[1].head_full_scan_id, "b1")
+            self.assertEqual([u.repo for u in store.who_uses("pkg:npm/lodash@4.17.20")], ["repo-a"])
+            self.assertEqual(len(store.who_uses("pkg:npm/lodash")), 2)
+            self.assertEqual(store.who_uses("lodash", type="pypi"), [])
+
+            sdk.listing = {"repo-a": "a1"}
+            store.sync(sdk, "org")
+            self.assertEqual([u.repo for u in store.who_uses("lodash")], ["repo-a"])
+
+    def test_unknown_schema_version_is_rebuilt(self):
+        sdk = FakeSdk({"repo-a": "a1"}, {"a1": [_artifact("lodash", "4.17.21", True)]})
+        with InventoryStore(self.path) as store:
+            store.sync(sdk, "org")
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA user_version=99")
+        conn.close()
+        with InventoryStore(self.path) as store:
+            self.assertEqual(store.heads("org"), {})
+            delta = store.sync(sdk, "org")
+            self.assertEqual(delta.added, 1)
+            self.assertEqual(sdk.streamed, ["a1", "a1"])
+
+    def test_who_uses_matches_like_the_scan_warehouse(self):
+        artifacts = [
+            dict(_artifact("core", "7.0.0", True), namespace="@babel"),
+            _artifact("JSONStream", "1.3.5", True),
+            dict(_artifact("Django_Filter", "2.0", True), type="pypi"),
+        ]
+        sdk = FakeSdk({"repo-a": "a1"}, {"a1": artifacts})
+        queries = [
+            ("pkg:npm/%40babel/core@7.0.0", {}),
+            ("pkg:npm/core", {}),
+            ("core", {"namespace": "@babel"}),
+            ("pkg:npm/JSONStream", {}),
+            ("pkg:npm/jsonstream", {}),
+            ("pkg:pypi/django-filter@2.0", {}),
+            ("Django_Filter", {"type": "pypi"}),
+        ]
+        with InventoryStore(self.path) as store, ScanWarehouse(":memory:") as warehouse:
+            store.sync(sdk, "org")
+            warehouse.ingest("org", "a1", artifacts, repo="repo-a")
+            for package, filters in queries:
+                with self.subTest(package=package):
+                    self.assertEqual(
+                        [usage.purl for usage in store.who_uses(package, **filters)],
+                        [row["purl"] for row in warehouse.repos_using(package, **filters)],
+                    )
+            self.assertEqual(len(store.who_uses("pkg:npm/JSONStream")), 1)
+            self.assertEqual(store.who_uses("pkg:npm/jsonstream"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
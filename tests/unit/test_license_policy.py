@@ -0,0 +1,95 @@
+import unittest
+from unittest.mock import Mock
+
+from socketdev.core.licensepolicy import LicensePolicy, LicenseVerdict, artifact_license, parse_spdx
+
+
+def _artifact(name, license=None, **fields):
+    artifact = {"id": name, "type": "npm", "name": name, "version": "1.0.0", **fields}
+    if license is not None:
+        artifact["license"] = license
+    return artifact
+
+
+class TestParseSpdx(unittest.TestCase):
+    def test_precedence_and_exceptions(self):
+        self.assertEqual(
+            parse_spdx("MIT or Apache-2.0 AND GPL-2.0+ WITH Classpath-exception-2.0"),
+            ("or", (
+                ("license", "MIT", None),
+                ("and", (("license", "Apache-2.0", None), ("license", "GPL-2.0+", "Classpath-exception-2.0"))),
+            )),
+        )
+
+    def test_malformed_expressions_raise(self):
+        for expression in ("", "MIT OR", "(MIT", "MIT)", "AND MIT", "MIT WITH"):
+            with self.assertRaises(ValueError, msg=expression):
+                parse_spdx(expression)
+
+    def test_artifact_license_falls_back_to_license_details(self):
+        artifact = {"licenseDetails": [{"spdxDisj": [[{"licenseId": "MIT"}], [{"licenseId": "ISC"}, {"licenseId": "BSD-2-Clause"}]]}]}
+        self.assertEqual(artifact_license(artifact), "MIT OR (ISC AND BSD-2-Clause)")
+
+
+class TestLicensePolicy(unittest.TestCase):
+    def test_allow_list_semantics(self):
+        policy = LicensePolicy(allow=["mit", "Apache-2.0"], warn=["LGPL-3.0"], deny=["GPL-3.0"])
+        cases = {
+            "MIT": LicenseVerdict.ALLOW,
+            "MIT OR GPL-3.0": LicenseVerdict.ALLOW,
+            "MIT AND GPL-3.0": LicenseVerdict.DENY,
+            "LGPL-3.0": LicenseVerdict.WARN,
+            "BSD-3-Clause": LicenseVerdict.DENY,
+            "NOASSERTION": LicenseVerdict.UNKNOWN,
+            "MIT OR (": LicenseVerdict.UNKNOWN,
+        }
+        for expression, verdict in cases.items():
+            self.assertEqual(policy.evaluate_expression(expression), verdict, expression)
+        self.assertEqual(LicensePolicy(deny=["GPL-3.0"]).evaluate_expression("BSD-3-Clause"), LicenseVerdict.ALLOW)
+
+    def test_metadata_is_batched_cached_and_used_for_tags(self):
+        client = Mock()
+        client.post.side_effect = lambda ids: [{"licenseId": i, "osiApproved": i != "Custom-1"} for i in ids]
+        policy = LicensePolicy(allow=["osiApproved"], licensemetadata=client, batch_size=2)
+        scan = {
+            "a": _artifact("a", "MIT"),
+            "b": _artifact("b", "Apache-2.0 OR MIT"),
+            "c": _artifact("c", "Custom-1"),
+            "d": _artifact("d", "ISC"),
+            "e": _artifact("e"),
+        }
+        report = policy.evaluate_artifacts(scan)
+        self.assertEqual(report.counts, {"allow": 3, "warn": 0, "deny": 1, "unknown": 1})
+        self.assertEqual([v.artifact["name"] for v in report.violations], ["c", "e"])
+        self.assertEqual((report.evaluated, report.expressions), (5, 5))
+        self.assertFalse(report.passed)
+        requested = sorted(i for call in client.post.call_args_list for i in call.args[0])
+        self.assertEqual(requested, ["Apache-2.0", "Custom-1", "ISC", "MIT"])
+        self.assertEqual(client.post.call_count, 2)
+
+        client.post.reset_mock()
+        policy.evaluate_artifacts(scan)
+        policy.evaluate_expression("MIT AND ISC")
+        client.post.assert_not_called()
+
+    def test_failed_metadata_batches_are_retried_later(self):
+        client = Mock()
+        client.post.side_effect = [RuntimeError("boom"), [{"licenseId": "MIT", "osiApproved": True}]]
+        policy = LicensePolicy(allow=["osiApproved"], licensemetadata=client)
+        with self.assertLogs("socketdev", level="ERROR"):
+            self.assertEqual(policy.evaluate_artifacts([_artifact("a", "MIT")]).counts["deny"], 1)
+        self.assertEqual(policy.evaluate_expression("MIT"), LicenseVerdict.ALLOW)
+
+    def test_fetch_reads_license_policy_settings(self):
+        sdk = Mock()
+        sdk.settings.get_license_policy.return_value = {"license_policy": {"allow": {"MIT": True, "GPL-3.0": False}}}
+        policy = LicensePolicy.fetch(sdk, "org")
+        self.assertIs(policy.licensemetadata, sdk.licensemetadata)
+        self.assertEqual(policy.allow, frozenset({"mit"}))
+        sdk.settings.get_license_policy.return_value = {}
+        with self.assertLogs("socketdev", level="ERROR"):
+            self.assertIsNone(LicensePolicy.fetch(sdk, "org"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from socketdev.core.manifestcache import ManifestFingerprintStore, fingerprint_files
+from socketdev.fullscans import FullScanParams, FullScans
+from socketdev.uploadmanifests import UploadManifests
+
+
+class TestManifestFingerprintStore(unittest.TestCase):
+    def setUp(self):
+        self.workspace = tempfile.mkdtemp()
+        self.cache_dir = tempfile.mkdtemp()
+        self.files = []
+        for rel_path, content in [("package.json", '{"name": "a"}'), ("web/package.json", '{"name": "b"}')]:
+            path = os.path.join(self.workspace, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(content)
+            self.files.append(path)
+        self.store = ManifestFingerprintStore(cache_dir=self.cache_dir)
+        self.api = Mock()
+
+    def tearDown(self):
+        shutil.rmtree(self.workspace)
+        shutil.rmtree(self.cache_dir)
+
+    def _respond(self, status_code, data):
+        response = Mock()
+        response.status_code = status_code
+        response.json.return_value = data
+        self.api.do_request.return_value = response
+
+    def test_fingerprint_depends_on_content_and_key(self):
+        pairs = [("package.json", self.files[0]), ("web/package.json", self.files[1])]
+        fingerprint, total_bytes = fingerprint_files(pairs)
+        self.assertEqual(fingerprint, fingerprint_files(list(reversed(pairs)))[0])
+        self.assertEqual(total_bytes, 26)
+        renamed = [("other.json", self.files[0]), ("web/package.json", self.files[1])]
+        self.assertNotEqual(fingerprint, fingerprint_files(renamed)[0])
+
+    def test_upload_manifest_files_reuses_tar_hash_when_unchanged(self):
+        self._respond(200, {"tarHash": "hash-1"})
+        uploader = UploadManifests(self.api)
+        kwargs = dict(workspace=self.workspace, fingerprint_store=self.store, repo="repo", branch="main")
+
+        self.assertEqual(uploader.upload_manifest_files("org", self.files, **kwargs), "hash-1")
+        self.assertEqual(uploader.upload_manifest_files("org", self.files, **kwargs), "hash-1")
+
+        self.assertEqual(self.api.do_request.call_count, 1)
+        self.assertEqual(self.store.stats.hits, 1)
+        self.assertEqual(self.store.stats.misses, 1)
+        self.assertEqual(self.store.stats.bytes_saved, 26)
+
+    def test_upload_manifest_files_uploads_when_content_changes(self):
+        self._respond(200, {"tarHash": "hash-1"})
+        uploader = UploadManifests(self.api)
+        kwargs = dict(workspace=self.workspace, fingerprint_store=self.store, repo="repo", branch="main")
+        uploader.upload_manifest_files("org", self.files, **kwargs)
+
+        with open(self.files[1], "w") as f:
+            f.write('{"name": "changed"}')
+        self._respond(200, {"tarHash": "hash-2"})
+
+        self.assertEqual(uploader.upload_manifest_files("org", self.files, **kwargs), "hash-2")
+        self.assertEqual(self.api.do_request.call_count, 2)
+
+    def test_branches_are_tracked_separately(self):
+        self._respond(200, {"tarHash": "hash-1"})
+        uploader = UploadManifests(self.api)
+        uploader.upload_manifest_files("org", self.files, fingerprint_store=self.store, repo="repo", branch="main")
+        uploader.upload_manifest_files("org", self.files, fingerprint_store=self.store, repo="repo", branch="dev")
+        self.assertEqual(self.api.do_request.call_count, 2)
+
+    def test_repo_is_required(self):
+        uploader = UploadManifests(self.api)
+        with self.assertRaises(ValueError):
+            uploader.upload_manifest_files("org", self.files, fingerprint_store=self.store)
+
+    def test_full_scan_post_skips_unchanged_scan(self):
+        self._respond(201, {"id": "scan-1"})
+        fullscans = FullScans(self.api)
+        params = FullScanParams(repo="repo", org_slug="org", branch="main")
+
+        first = fullscans.post(self.files, params, use_lazy_loading=True, workspace=self.workspace, fingerprint_store=self.store)
+        second = fullscans.post(self.files, params, use_lazy_loading=True, workspace=self.workspace, fingerprint_store=self.store)
+
+        self.assertEqual(first, {"id": "scan-1"})
+        self.assertEqual(second, {"id": "scan-1"})
+        self.assertEqual(self.api.do_request.call_count, 1)
+
+    def test_full_scan_post_creates_scan_for_new_commit(self):
+        fullscans = FullScans(self.api)
+        kwargs = dict(use_lazy_loading=True, workspace=self.workspace, fingerprint_store=self.store)
+        self._respond(201, {"id": "scan-1"})
+        fullscans.post(self.files, FullScanParams(repo="repo", org_slug="org", branch="main", commit_hash="a1"), **kwargs)
+
+        self._respond(201, {"id": "scan-2"})
+        second = fullscans.post(
+            self.files, FullScanParams(repo="repo", org_slug="org", branch="main", commit_hash="b2"), **kwargs
+        )
+        third = fullscans.post(
+            self.files, FullScanParams(repo="repo", org_slug="org", branch="main", commit_hash="b2"), **kwargs
+        )
+
+        self.assertEqual(second, {"id": "scan-2"})
+        self.assertEqual(third, {"id": "scan-2"})
+        self.assertEqual(self.api.do_request.call_count, 2)
+
+    def test_full_scan_post_requires_repo(self):
+        params = FullScanParams(repo="", org_slug="org", branch="main")
+        with self.assertRaises(ValueError):
+            FullScans(self.api).post(self.files, params, fingerprint_store=self.store)
+        self.api.do_request.assert_not_called()
+
+    def test_tar_hash_and_full_scan_entries_coexist(self):
+        self._respond(200, {"tarHash": "hash-1"})
+        UploadManifests(self.api).upload_manifest_files(
+            "org", self.files, workspace=self.workspace, fingerprint_store=self.store, repo="repo", branch="main"
+        )
+        self._respond(201, {"id": "scan-1"})
+        params = FullScanParams(repo="repo", org_slug="org", branch="main")
+        FullScans(self.api).post(self.files, params, use_lazy_loading=True, workspace=self.workspace, fingerprint_store=self.store)
+
+        self._respond(500, {})
+        self.assertEqual(
+            UploadManifests(self.api).upload_manifest_files(
+                "org", self.files, workspace=self.workspace, fingerprint_store=self.store, repo="repo", branch="main"
+            ),
+            "hash-1",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+import socketdev.utils as utils_module
+from socketdev.fullscans import FullScanParams, FullScans
+from socketdev.utils import MmapFileLoader, Utils, _fd_manager
+
+
+class TestMmapFileLoader(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "archive.tar.gz")
+        self.content = b"0123456789" * 1000
+        with open(self.path, "wb") as f:
+            f.write(self.content)
+
+    def tearDown(self):
+        for name in os.listdir(self.temp_dir):
+            os.remove(os.path.join(self.temp_dir, name))
+        os.rmdir(self.temp_dir)
+
+    def test_read_returns_memoryview_slices(self):
+        loader = MmapFileLoader(self.path, "archive.tar.gz")
+        first = loader.read(10)
+        self.assertIsInstance(first, memoryview)
+        self.assertEqual(bytes(first), self.content[:10])
+        self.assertEqual(loader.tell(), 10)
+        rest = loader.read()
+        self.assertEqual(bytes(rest), self.content[10:])
+        self.assertTrue(loader.closed)
+
+    def test_close_with_live_slices_does_not_raise(self):
+        loader = MmapFileLoader(self.path, "archive.tar.gz")
+        data = loader.read()
+        # The loader closed itself while ``data`` still references the mapping.
+        self.assertTrue(loader.closed)
+        self.assertEqual(len(data), len(self.content))
+        self.assertEqual(bytes(data[-10:]), self.content[-10:])
+
+    def test_descriptor_accounting(self):
+        loader = MmapFileLoader(self.path, "archive.tar.gz")
+        loader.read(1)
+        tracked = [ref() for ref in _fd_manager.open_files]
+        self.assertIn(loader, tracked)
+        loader.close()
+        tracked = [ref() for ref in _fd_manager.open_files]
+        self.assertNotIn(loader, tracked)
+
+    def test_mapping_with_live_slices_keeps_its_descriptor_slot(self):
+        _fd_manager.set_max_open_files(2)
+        self.addCleanup(_fd_manager.set_max_open_files, 100)
+        data = MmapFileLoader(self.path, "archive.tar.gz").read()
+        self.assertEqual(len([ref for ref in _fd_manager.open_files if ref() is not None]), 1)
+
+        other = os.path.join(self.temp_dir, "other.tar")
+        with open(other, "wb") as f:
+            f.write(self.content)
+        first, second = MmapFileLoader(other, "a"), MmapFileLoader(other, "b")
+        first.read(1)
+        second.read(1)
+        # The open loader is evicted; the mapping still referenced by ``data`` is not.
+        self.assertIsNone(first._file)
+        self.assertEqual(len(_fd_manager.open_files), 2)
+
+        del data
+        second.close()
+        self.assertEqual([ref for ref in _fd_manager.open_files if ref() is not None], [])
+
+    def test_seek_and_len(self):
+        loader = MmapFileLoader(self.path, "archive.tar.gz")
+        self.assertEqual(len(loader), len(self.content))
+        loader.seek(-5, 2)
+        self.assertEqual(bytes(loader.read()), self.content[-5:])
+
+    def test_empty_file_falls_back_to_buffered_reads(self):
+        empty = os.path.join(self.temp_dir, "empty.tar")
+        open(empty, "wb").close()
+        loader = MmapFileLoader(empty, "empty.tar")
+        self.assertEqual(loader.read(), b"")
+
+    def test_falls_back_when_mmap_is_unavailable(self):
+        with patch.object(utils_module, "mmap", None):
+            loader = MmapFileLoader(self.path, "archive.tar.gz")
+            data = loader.read(10)
+        self.assertIsInstance(data, bytes)
+        self.assertEqual(data, self.content[:10])
+        loader.close()
+
+    def test_prepare_archive_files_for_upload_with_mmap(self):
+        prepared = Utils.prepare_archive_files_for_upload(self.path, use_mmap=True)
+        field, (filename, loader) = prepared[0]
+        self.assertEqual(field, "file")
+        self.assertEqual(filename, "archive.tar.gz")
+        self.assertIsInstance(loader, MmapFileLoader)
+
+    def test_load_files_for_sending_lazy_with_mmap(self):
+        prepared = Utils.load_files_for_sending_lazy([self.path], workspace=self.temp_dir, use_mmap=True)
+        key, (_, loader) = prepared[0]
+        self.assertEqual(key, "archive.tar.gz")
+        self.assertIsInstance(loader, MmapFileLoader)
+
+    @patch("socketdev.core.api.requests")
+    def test_archive_upload_uses_mmap_body(self, mock_requests):
+        mock_response = Mock()
+        mock_response.status_code = 201
+        mock_response.json.return_value = {"id": "scan-id"}
+        mock_response.headers = {}
+        mock_response.text = json.dumps({"id": "scan-id"})
+        mock_requests.request.return_value = mock_response
+
+        from socketdev.core.api import API
+        api = API()
+        api.encode_key("test-token:")
+        result = FullScans(api).archive(
+            tar_files=self.path,
+            params=FullScanParams(repo="repo", org_slug="org"),
+            use_lazy_loading=False,
+            use_mmap=True,
+        )
+
+        self.assertEqual(result, {"id": "scan-id"})
+        files = mock_requests.request.call_args[1]["files"]
+        self.assertIsInstance(files[0][1][1], MmapFileLoader)
+
+
+if __name__ == "__main__":
+    unittest.main()
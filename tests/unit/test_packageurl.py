@@ -0,0 +1,130 @@
+import random
+import unittest
+
+from socketdev.core.packageurl import (
+    PackageURL,
+    _parse_full,
+    _parse_simple,
+    build_purl,
+    canonicalize_purl,
+    package_filter,
+    package_identity,
+    parse_purl,
+    purl_key,
+)
+from socketdev.core.purlcache import PurlResultCache
+from socketdev.exceptions import APIPartialResponse
+from socketdev.purl import Purl
+
+from .test_purl_bulk import FakePurlApi
+
+
+class TestParsePurl(unittest.TestCase):
+    def test_components(self):
+        self.assertEqual(
+            parse_purl("pkg:maven/org.apache.commons/commons-lang3@3.12.0?type=jar&classifier=sources#src/main"),
+            PackageURL(
+                type="maven",
+                namespace="org.apache.commons",
+                name="commons-lang3",
+                version="3.12.0",
+                qualifiers=(("classifier", "sources"), ("type", "jar")),
+                subpath="src/main",
+            ),
+        )
+
+    def test_npm_scope_with_and_without_escape(self):
+        escaped = parse_purl("pkg:npm/%40babel/core@7.23.0")
+        self.assertEqual(escaped, parse_purl("pkg:npm/@babel/core@7.23.0"))
+        self.assertEqual((escaped.namespace, escaped.name, escaped.version), ("@babel", "core", "7.23.0"))
+        self.assertIsNone(parse_purl("pkg:npm/@babel/core").version)
+
+    def test_canonical_form(self):
+        cases = {
+            "PKG:PyPI/Django_REST@3.0": "pkg:pypi/django-rest@3.0",
+            "pkg://npm/Left-Pad@1.3.0": "pkg:npm/Left-Pad@1.3.0",
+            "pkg:golang/github.com/Foo/Bar@v1.0.0": "pkg:golang/github.com/Foo/Bar@v1.0.0",
+            "pkg:maven/g/a@1?B=2&a=1&c=": "pkg:maven/g/a@1?a=1&b=2",
+            "pkg:github/x/y#./dir//../file": "pkg:github/x/y#dir/file",
+            "pkg:generic/name%20with%20space@1.0": "pkg:generic/name%20with%20space@1.0",
+        }
+        for raw, canonical in cases.items():
+            with self.subTest(raw=raw):
+                self.assertEqual(canonicalize_purl(raw), canonical)
+                self.assertEqual(canonicalize_purl(canonical), canonical)
+
+    def test_npm_names_keep_their_case(self):
+        self.assertNotEqual(purl_key("pkg:npm/JSONStream@1.3.5"), purl_key("pkg:npm/jsonstream@1.3.5"))
+
+    def test_invalid(self):
+        for raw in ["", "npm/lodash", "pkg:", "pkg:npm", "pkg:npm/", "http://example.com"]:
+            with self.subTest(raw=raw):
+                with self.assertRaises(ValueError):
+                    parse_purl(raw)
+        self.assertEqual(purl_key("not a purl"), "not a purl")
+
+    def test_package_filter(self):
+        self.assertEqual(package_filter("pkg:PyPI/Django_Filter@2.0?release=r1"), {
+            "type": "pypi", "namespace": "", "name": "django-filter", "version": "2.0"
+        })
+        self.assertEqual(package_filter("pkg:npm/%40babel/core"), {"type": "npm", "namespace": "@babel", "name": "core"})
+        self.assertEqual(package_filter("Django_Filter", "2.0", "PyPI"), {"type": "pypi", "name": "django-filter", "version": "2.0"})
+        self.assertEqual(package_filter("JSONStream", purl_type="npm", namespace=""), {"type": "npm", "namespace": "", "name": "JSONStream"})
+        self.assertEqual(package_filter("lodash"), {"name": "lodash"})
+        self.assertEqual(package_identity({"type": "pypi", "name": "Django_Filter", "version": "2.0"}), ("pypi", "", "django-filter", "2.0"))
+
+    def test_build_purl_encodes_components(self):
+        self.assertEqual(build_purl("npm", "core", namespace="@babel", version="7.0.0"), "pkg:npm/%40babel/core@7.0.0")
+        self.assertEqual(build_purl("pypi", "requests", qualifiers={"extension": "whl", "empty": ""}), "pkg:pypi/requests?extension=whl")
+
+    def test_fast_path_matches_full_parser(self):
+        rng = random.Random(7)
+        segments = ["", "a", "B_c", "%40scope", "@scope", "x%2Fy", "1.0", "."]
+
+        def random_purl():
+            purl = rng.choice(["pkg:", "pkg:", "PKG:", "pkg:/"]) + rng.choice(["npm", "pypi", "maven", "PyPI", ""]) + "/"
+            purl += rng.choice(["/", "//"]).join(rng.choice(segments) for _ in range(rng.randint(1, 3)))
+            if rng.random() < 0.5:
+                purl += "@" + rng.choice(["1.0", "", "%40beta", "v1/2"])
+            if rng.random() < 0.4:
+                purl += "?" + "&".join(rng.choice(["A=1", "b=", "c=%2F", "=x", "d"]) for _ in range(rng.randint(1, 3)))
+            if rng.random() < 0.1:
+                purl += "#" + rng.choice(["src", "./a//b", ""])
+            return purl
+
+        checked = 0
+        for _ in range(5000):
+            raw = random_purl()
+            fast = _parse_simple(raw)
+            if fast is None:
+                continue
+            checked += 1
+            self.assertEqual(fast, _parse_full(raw), msg=f"purl={raw!r}")
+        self.assertGreater(checked, 500)
+
+
+class TestCanonicalPurlMatching(unittest.TestCase):
+    def test_strict_accepts_canonically_equal_input_purl(self):
+        Purl._raise_on_missing([{"purl": "pkg:PyPI/Django_REST@3.0"}], [{"inputPurl": "pkg:pypi/django-rest@3.0"}])
+
+    def test_strict_reports_npm_purl_differing_only_in_case(self):
+        with self.assertRaises(APIPartialResponse):
+            Purl._raise_on_missing([{"purl": "pkg:npm/JSONStream@1.3.5"}], [{"inputPurl": "pkg:npm/jsonstream@1.3.5"}])
+
+    def test_bulk_dedupes_spelling_variants(self):
+        api = FakePurlApi()
+        Purl(api).bulk([{"purl": "pkg:npm/%40babel/core@7.0.0"}, {"purl": "pkg:npm/@babel/core@7.0.0"}], org_slug="org")
+        self.assertEqual(api.batches, [["pkg:npm/%40babel/core@7.0.0"]])
+
+    def test_cache_shares_entries_across_spellings(self):
+        cache = PurlResultCache(persist=False)
+        api = FakePurlApi()
+        purl = Purl(api)
+        purl.post(components=[{"purl": "pkg:pypi/Django_REST@3.0"}], org_slug="org", cache=cache)
+        result = purl.post(components=[{"purl": "pkg:pypi/django-rest@3.0"}], org_slug="org", cache=cache, strict=True)
+        self.assertEqual(len(api.batches), 1)
+        self.assertEqual(result[0]["inputPurl"], "pkg:pypi/django-rest@3.0")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import threading
+import unittest
+from unittest.mock import Mock
+from urllib.parse import parse_qsl, urlparse
+
+from socketdev.alerts import Alerts
+from socketdev.auditlog import AuditLog
+from socketdev.core.pagination import Paginator
+from socketdev.exceptions import APIFailure
+from socketdev.fullscans import FullScans
+from socketdev.repos import Repos
+from socketdev.threatfeed import ThreatFeed
+from socketdev.triage import Triage
+from socketdev.webhooks import Webhooks
+
+
+class PagedApi:
+    """Serves ``total`` numbered items, ``per_page`` at a time, in the requested cursor style."""
+
+    def __init__(self, total, style="nextPage", default_per_page=3, size_param="per_page"):
+        self.total = total
+        self.style = style
+        self.size_param = size_param
+        self.default_per_page = default_per_page
+        self.queries = []
+
+    def do_request(self, path, **kwargs):
+        query = dict(parse_qsl(urlparse(path).query))
+        self.queries.append(query)
+        per_page = int(query.get(self.size_param, self.default_per_page))
+        token_param = {"nextPage": "page", "nextPageCursor": "page_cursor", "endCursor": "startAfterCursor"}[self.style]
+        start = int(query.get(token_param, 1 if self.style == "nextPage" else 0))
+        offset = (start - 1) * per_page if self.style == "nextPage" else start
+        items = [{"n": n} for n in range(offset, min(offset + per_page, self.total))]
+        end = offset + len(items)
+        if self.style == "nextPage":
+            token = start + 1 if end < self.total else 0
+            body = {"results": items, "nextPage": token}
+        elif self.style == "nextPageCursor":
+            body = {"results": items, "nextPageCursor": str(end) if end < self.total else None}
+        else:
+            body = {"items": items, "endCursor": str(end) if end < self.total else None}
+        response = Mock(status_code=200)
+        response.json.return_value = body
+        return response
+
+
+class TestPaginator(unittest.TestCase):
+    def test_endpoints_follow_their_cursor_style(self):
+        cases = [
+            (lambda api: Repos(api).iter_repos("org", page_size=4), "nextPage", "per_page"),
+            (lambda api: FullScans(api).iter_scans("org", {"repo": "r"}, page_size=4), "nextPage", "per_page"),
+            (lambda api: ThreatFeed(api).iter_items("org", page_size=4), "nextPageCursor", "per_page"),
+            (lambda api: Alerts(api).iter_alerts("org", page_size=4), "endCursor", "limit"),
+        ]
+        for make_iter, style, size_param in cases:
+            with self.subTest(style=style):
+                api = PagedApi(10, style, size_param=size_param)
+                self.assertEqual([item["n"] for item in make_iter(api)], list(range(10)))
+                self.assertEqual(len(api.queries), 3)
+                self.assertTrue(all(query[size_param] == "4" for query in api.queries))
+
+    def test_page_size_is_sent_as_each_endpoints_parameter(self):
+        cases = [
+            (lambda api: Repos(api).iter_repos("org", page_size=7), "orgs/org/repos", "per_page"),
+            (lambda api: FullScans(api).iter_scans("org", {}, page_size=7), "orgs/org/full-scans", "per_page"),
+            (lambda api: ThreatFeed(api).iter_items("org", page_size=7), "orgs/org/threat-feed", "per_page"),
+            (lambda api: AuditLog(api).iter_events("org", page_size=7), "orgs/org/audit-log", "limit"),
+            (lambda api: Alerts(api).iter_alerts("org", page_size=7), "orgs/org/alerts", "limit"),
+            (lambda api: Webhooks(api).iter_webhooks("org", page_size=7), "orgs/org/webhooks", "limit"),
+            (lambda api: Triage(api).iter_alert_triage("org", page_size=7), "orgs/org/triage/alerts", "limit"),
+        ]
+        for make_iter, endpoint, size_param in cases:
+            with self.subTest(endpoint=endpoint):
+                api = Mock()
+                api.do_request.return_value = Mock(status_code=200, json=Mock(return_value={"results": [], "nextPage": 0}))
+                list(make_iter(api))
+                path = api.do_request.call_args[1]["path"]
+                self.assertEqual(urlparse(path).path, endpoint)
+                self.assertEqual(dict(parse_qsl(urlparse(path).query)), {size_param: "7"})
+
+    def test_max_items_stops_requesting(self):
+        api = PagedApi(100)
+        items = list(Repos(api).iter_repos("org", page_size=10, max_items=15))
+        self.assertEqual(len(items), 15)
+        self.assertEqual(len(api.queries), 2)
+
+    def test_next_page_is_fetched_while_current_page_is_consumed(self):
+        second_page_requested = threading.Event()
+        pages = {None: {"results": [1, 2], "nextPage": 2}, 2: {"results": [3], "nextPage": 0}}
+
+        def fetch(params):
+            if params.get("page") == 2:
+                second_page_requested.set()
+            return pages[params.get("page")]
+
+        iterator = iter(Paginator(fetch))
+        self.assertEqual(next(iterator), 1)
+        self.assertTrue(second_page_requested.wait(5))
+        self.assertEqual(list(iterator), [2, 3])
+
+    def test_without_prefetch_pages_are_fetched_on_demand(self):
+        calls = []
+
+        def fetch(params):
+            calls.append(params.get("page"))
+            return {"results": [len(calls)], "nextPage": len(calls) + 1 if len(calls) < 3 else 0}
+
+        iterator = iter(Paginator(fetch, prefetch=False))
+        self.assertEqual(next(iterator), 1)
+        self.assertEqual(calls, [None])
+        self.assertEqual(list(iterator), [2, 3])
+
+    def test_repeated_cursor_and_error_pages_end_iteration(self):
+        repeated = Paginator(lambda params: {"items": [1], "endCursor": "same"}, {"startAfterCursor": "same"})
+        self.assertEqual(list(repeated), [1])
+        self.assertEqual(list(Paginator(lambda params: {})), [])
+
+    def test_fetch_errors_propagate(self):
+        def fetch(params):
+            if params.get("page"):
+                raise APIFailure("boom")
+            return {"results": [1], "nextPage": 2}
+
+        with self.assertRaises(APIFailure):
+            list(Paginator(fetch))
+
+    def test_rejects_invalid_limits(self):
+        with self.assertRaises(ValueError):
+            Paginator(lambda params: {}, page_size=0)
+        self.assertEqual(list(Paginator(lambda params: {"results": [1]}, max_items=0)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import Mock
+
+from socketdev.core.policy import SecurityPolicy
+from socketdev.fullscans import SocketAlert
+from socketdev.settings import OrgSecurityPolicyResponse, SecurityAction
+
+
+SETTINGS = {
+    "securityPolicyRules": {
+        "malware": {"action": "error"},
+        "envVars": {"action": "warn"},
+        "unmaintained": {"action": "monitor"},
+        "telemetry": {"action": "defer"},
+    }
+}
+
+
+class TestSecurityPolicy(unittest.TestCase):
+    def test_compiles_settings_dict_and_typed_response(self):
+        typed = OrgSecurityPolicyResponse.from_dict({"success": True, "status": 200, **SETTINGS})
+        for settings in (SETTINGS, typed):
+            policy = SecurityPolicy.from_settings(settings)
+            self.assertEqual(policy.action("malware"), SecurityAction.ERROR)
+            self.assertEqual(policy.action("telemetry"), SecurityAction.IGNORE)
+            self.assertEqual(policy.action("somethingNew"), SecurityAction.IGNORE)
+            self.assertEqual(len(policy), 3)
+
+    def test_evaluate_counts_actions_and_reports_violations(self):
+        policy = SecurityPolicy.from_settings(SETTINGS)
+        alerts = [{"type": "envVars"}, {"type": "unmaintained"}, {"type": "malware"}, {"type": "other"}]
+        result = policy.evaluate(alerts)
+        self.assertEqual(result.evaluated, 4)
+        self.assertEqual(result.counts, {"error": 1, "warn": 1, "monitor": 1, "ignore": 1})
+        self.assertEqual([v.type for v in result.violations], ["envVars", "malware"])
+        self.assertEqual([v.type for v in result.errors], ["malware"])
+        self.assertFalse(result.passed)
+        self.assertTrue(policy.evaluate(alerts[:2]).passed)
+
+    def test_stop_on_error_returns_at_first_error(self):
+        policy = SecurityPolicy({"malware": "error"})
+        result = policy.evaluate([{"type": "a"}, {"type": "malware"}, {"type": "malware"}], stop_on_error=True)
+        self.assertTrue(result.stopped_early)
+        self.assertEqual((result.evaluated, len(result.errors)), (2, 1))
+
+    def test_default_action_applies_to_unlisted_types(self):
+        policy = SecurityPolicy({"envVars": "ignore"}, default="error")
+        result = policy.evaluate([{"type": "envVars"}, {"type": "unknownType"}])
+        self.assertEqual([v.type for v in result.errors], ["unknownType"])
+        with self.assertRaises(ValueError):
+            SecurityPolicy(default="defer")
+
+    def test_evaluate_artifacts_accepts_stream_results_and_typed_alerts(self):
+        policy = SecurityPolicy.from_settings(SETTINGS)
+        alert = SocketAlert.from_dict({"key": "k", "type": "malware", "severity": "critical", "category": "supplyChainRisk"})
+        artifacts = {
+            "1": {"id": "1", "name": "evil", "alerts": [alert]},
+            "2": {"id": "2", "name": "fine"},
+        }
+        result = policy.evaluate_artifacts(artifacts)
+        self.assertEqual(result.errors[0].artifact["name"], "evil")
+        self.assertEqual(result.to_dict()["violations"][0]["alert"]["type"], "malware")
+
+    def test_fetch_uses_settings_and_returns_none_on_failure(self):
+        sdk = Mock()
+        sdk.settings.get.return_value = SETTINGS
+        self.assertEqual(SecurityPolicy.fetch(sdk, "org").action("envVars"), SecurityAction.WARN)
+        sdk.settings.get.return_value = {}
+        with self.assertLogs("socketdev", level="ERROR"):
+            self.assertIsNone(SecurityPolicy.fetch(sdk, "org"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import json
+import threading
+import time
+import unittest
+import urllib.parse
+from unittest.mock import Mock
+
+from socketdev.exceptions import APIPartialResponse
+from socketdev.purl import Purl
+
+
+def _row(purl, alerts=None):
+    return {"inputPurl": purl, "purl": purl, "type": "npm", "name": purl.split("/")[-1], "alerts": alerts or []}
+
+
+class FakePurlApi:
+    """Answers each batch with one row per requested purl, except those listed in ``omit``."""
+
+    def __init__(self, omit=(), fail_batches=(), delay=0.0, alerts=None):
+        self.omit = set(omit)
+        self.alerts = alerts or {}
+        self.fail_batches = set(fail_batches)
+        self.delay = delay
+        self.batches = []
+        self.paths = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def do_request(self, path, payload, method):
+        components = json.loads(payload)["components"]
+        with self._lock:
+            index = len(self.batches)
+            self.batches.append([c["purl"] for c in components])
+            self.paths.append(path)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            response = Mock()
+            if index in self.fail_batches:
+                response.status_code = 500
+                response.text = "error"
+                return response
+            lines = [json.dumps(_row(c["purl"], self.alerts.get(c["purl"]))) for c in components if c["purl"] not in self.omit]
+            lines.append(json.dumps({"_type": "summary", "batch": index}))
+            response.status_code = 200
+            response.text = "\n".join(lines)
+            return response
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class TestPurlBulk(unittest.TestCase):
+    def test_splits_dedupes_and_preserves_input_order(self):
+        api = FakePurlApi(delay=0.01)
+        purls = [f"pkg:npm/p{i}@1.0.0" for i in range(10)]
+        components = [{"purl": p} for p in purls] + [{"purl": purls[3]}]
+
+        result = Purl(api).bulk(components, org_slug="org", batch_size=3, max_workers=2, alerts=True)
+
+        self.assertEqual(len(api.batches), 4)
+        self.assertEqual(sorted(p for batch in api.batches for p in batch), sorted(purls))
+        self.assertLessEqual(api.max_in_flight, 2)
+        rows = [r for r in result if "_type" not in r]
+        self.assertEqual([r["inputPurl"] for r in rows], purls)
+        self.assertEqual(len([r for r in result if r.get("_type") == "summary"]), 4)
+        query = urllib.parse.parse_qs(api.paths[0].split("?", 1)[1])
+        self.assertEqual(query["alerts"], ["true"])
+        self.assertTrue(api.paths[0].startswith("orgs/org/purl?"))
+
+    def test_strict_raises_across_batches(self):
+        purls = [f"pkg:npm/p{i}@1.0.0" for i in range(6)]
+        api = FakePurlApi(omit={purls[1], purls[5]})
+
+        with self.assertRaises(APIPartialResponse) as ctx:
+            Purl(api).bulk([{"purl": p} for p in purls], org_slug="org", batch_size=2, strict=True)
+
+        self.assertEqual(ctx.exception.missing, [purls[1], purls[5]])
+
+    def test_failed_batch_is_reported_as_missing_in_strict_mode(self):
+        purls = [f"pkg:npm/p{i}@1.0.0" for i in range(4)]
+        api = FakePurlApi(fail_batches={0})
+        purl = Purl(api)
+
+        result = purl.bulk([{"purl": p} for p in purls], org_slug="org", batch_size=2, max_workers=1)
+        self.assertEqual([r["inputPurl"] for r in result if "_type" not in r], purls[2:])
+
+        api = FakePurlApi(fail_batches={0})
+        with self.assertRaises(APIPartialResponse) as ctx:
+            Purl(api).bulk([{"purl": p} for p in purls], org_slug="org", batch_size=2, max_workers=1, strict=True)
+        self.assertEqual(ctx.exception.missing, purls[:2])
+
+    def test_post_is_unchanged_single_request(self):
+        api = FakePurlApi()
+        components = [{"purl": f"pkg:npm/p{i}@1.0.0"} for i in range(5)]
+        Purl(api).post(components=components, org_slug="org")
+        self.assertEqual(len(api.batches), 1)
+
+    def test_rejects_invalid_tuning(self):
+        with self.assertRaises(ValueError):
+            Purl(FakePurlApi()).bulk([], org_slug="org", batch_size=0)
+        with self.assertRaises(ValueError):
+            Purl(FakePurlApi()).bulk([], org_slug="org", max_workers=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
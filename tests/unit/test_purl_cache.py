@@ -0,0 +1,110 @@
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from socketdev.core.purlcache import PurlResultCache
+from socketdev.purl import Purl
+
+from .test_purl_bulk import FakePurlApi
+
+LODASH = "pkg:npm/lodash@4.17.21"
+LEFTPAD = "pkg:npm/left-pad@1.3.0"
+MISSING = "pkg:npm/does-not-exist@0.0.1"
+PENDING = "pkg:npm/brand-new@0.0.1"
+
+
+class TestPurlResultCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = PurlResultCache(cache_dir=self.cache_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_post_sends_only_misses_and_merges_in_input_order(self):
+        api = FakePurlApi()
+        purl = Purl(api)
+        purl.post(components=[{"purl": LODASH}], org_slug="org", cache=self.cache)
+
+        result = purl.post(components=[{"purl": LEFTPAD}, {"purl": LODASH}], org_slug="org", cache=self.cache)
+
+        self.assertEqual(api.batches, [[LODASH], [LEFTPAD]])
+        self.assertEqual([r["inputPurl"] for r in result if "_type" not in r], [LEFTPAD, LODASH])
+        self.assertEqual(self.cache.stats.memory_hits, 1)
+        self.assertEqual(self.cache.stats.misses, 2)
+
+    def test_all_hits_make_no_request(self):
+        api = FakePurlApi()
+        purl = Purl(api)
+        purl.post(components=[{"purl": LODASH}], org_slug="org", cache=self.cache)
+        result = purl.post(components=[{"purl": LODASH}], org_slug="org", cache=self.cache, strict=True)
+        self.assertEqual(len(api.batches), 1)
+        self.assertEqual(result[0]["inputPurl"], LODASH)
+
+    def test_key_includes_org_and_flags(self):
+        api = FakePurlApi()
+        purl = Purl(api)
+        purl.post(components=[{"purl": LODASH}], org_slug="org", cache=self.cache)
+        purl.post(components=[{"purl": LODASH}], org_slug="other", cache=self.cache)
+        purl.post(license="true", components=[{"purl": LODASH}], org_slug="org", cache=self.cache)
+        purl.post(components=[{"purl": LODASH}], org_slug="org", alerts=True, cache=self.cache)
+        self.assertEqual(len(api.batches), 4)
+
+    def test_disk_tier_is_shared_across_instances(self):
+        Purl(FakePurlApi()).post(components=[{"purl": LODASH}], org_slug="org", cache=self.cache)
+        fresh = PurlResultCache(cache_dir=self.cache_dir)
+        api = FakePurlApi()
+        Purl(api).post(components=[{"purl": LODASH}], org_slug="org", cache=fresh)
+        self.assertEqual(api.batches, [])
+        self.assertEqual(fresh.stats.disk_hits, 1)
+
+    def test_negative_results_use_negative_ttl_and_pending_is_not_cached(self):
+        api = FakePurlApi(alerts={MISSING: [{"type": "notFound"}], PENDING: [{"type": "pendingScan"}]})
+        cache = PurlResultCache(ttl=3600, negative_ttl=10, persist=False)
+        purl = Purl(api)
+        components = [{"purl": MISSING}, {"purl": PENDING}]
+        purl.post(components=components, org_slug="org", alerts=True, cache=cache)
+        purl.post(components=components, org_slug="org", alerts=True, cache=cache)
+        self.assertEqual(api.batches, [[MISSING, PENDING], [PENDING]])
+        self.assertEqual(cache.stats.negative_hits, 1)
+
+        now = time.time()
+        with patch("socketdev.core.purlcache.time.time", return_value=now + 60):
+            purl.post(components=[{"purl": MISSING}], org_slug="org", alerts=True, cache=cache)
+        self.assertEqual(api.batches[-1], [MISSING])
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = PurlResultCache(max_entries=2, persist=False)
+        for purl in (LODASH, LEFTPAD, MISSING):
+            cache.put("org", purl, "false", "", [{"inputPurl": purl, "alerts": []}])
+        self.assertIsNone(cache.get("org", LODASH, "false", ""))
+        self.assertIsNotNone(cache.get("org", MISSING, "false", ""))
+        self.assertEqual(cache.stats.evictions, 1)
+
+    def test_callers_cannot_modify_cached_rows(self):
+        cache = PurlResultCache(persist=False)
+        rows = [{"inputPurl": LODASH, "alerts": [{"type": "envVars"}], "licenseDetails": []}]
+        cache.put("org", LODASH, "false", "", rows)
+        rows[0]["alerts"].append({"type": "malware"})
+        cached = cache.get("org", LODASH, "false", "")
+        cached[0]["alerts"].clear()
+        cached[0]["licenseDetails"].append({"spdxDisj": "MIT"})
+        self.assertEqual(
+            cache.get("org", LODASH, "false", ""),
+            [{"inputPurl": LODASH, "alerts": [{"type": "envVars"}], "licenseDetails": []}],
+        )
+
+    def test_bulk_uses_cache(self):
+        api = FakePurlApi()
+        purl = Purl(api)
+        purl.bulk([{"purl": LODASH}], org_slug="org", cache=self.cache)
+        result = purl.bulk([{"purl": LODASH}, {"purl": LEFTPAD}], org_slug="org", batch_size=1, cache=self.cache)
+        self.assertEqual(api.batches, [[LODASH], [LEFTPAD]])
+        self.assertEqual([r["inputPurl"] for r in result if "_type" not in r], [LODASH, LEFTPAD])
+        self.assertAlmostEqual(self.cache.stats.to_dict()["hit_rate"], 1 / 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
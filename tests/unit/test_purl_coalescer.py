@@ -0,0 +1,104 @@
+import threading
+import unittest
+from unittest import mock
+
+from socketdev.exceptions import APIPartialResponse
+from socketdev.purl import Purl, PurlCoalescer
+
+from .test_purl_bulk import FakePurlApi
+
+
+class TestPurlCoalescer(unittest.TestCase):
+    def test_concurrent_callers_share_batches_and_get_their_own_rows(self):
+        api = FakePurlApi(delay=0.01)
+        results = {}
+        barrier = threading.Barrier(50)
+
+        with PurlCoalescer(Purl(api), "org", max_batch_size=1000, max_wait_ms=200) as coalescer:
+
+            def caller(i):
+                components = [{"purl": f"pkg:npm/p{i}@1.0.0"}, {"purl": "pkg:npm/shared@1.0.0"}]
+                barrier.wait()
+                results[i] = coalescer.lookup(components, timeout=5)
+
+            threads = [threading.Thread(target=caller, args=(i,)) for i in range(50)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertLess(len(api.batches), 5)
+        self.assertEqual(sum(len(batch) for batch in api.batches), 50 + len(api.batches))
+        for i, rows in results.items():
+            self.assertEqual([r["inputPurl"] for r in rows], [f"pkg:npm/p{i}@1.0.0", "pkg:npm/shared@1.0.0"])
+        self.assertEqual(coalescer.stats.lookups, 50)
+        self.assertEqual(coalescer.stats.components, 100)
+
+    def test_batch_size_triggers_dispatch_before_window(self):
+        api = FakePurlApi()
+        coalescer = PurlCoalescer(Purl(api), "org", max_batch_size=2, max_wait_ms=60_000)
+        first = coalescer.submit([{"purl": "pkg:npm/a@1"}])
+        second = coalescer.submit([{"purl": "pkg:npm/b@1"}])
+        self.assertEqual(len(first.result(timeout=5)), 1)
+        self.assertEqual(len(second.result(timeout=5)), 1)
+        self.assertEqual(api.batches, [["pkg:npm/a@1", "pkg:npm/b@1"]])
+        coalescer.close()
+
+    def test_spelling_variants_are_merged_and_echoed_back(self):
+        api = FakePurlApi()
+        coalescer = PurlCoalescer(Purl(api), "org", max_wait_ms=60_000)
+        escaped = coalescer.submit([{"purl": "pkg:npm/%40scope/pkg@1.0.0"}])
+        plain = coalescer.submit([{"purl": "pkg:npm/@scope/pkg@1.0.0"}])
+        coalescer.close()
+        self.assertEqual(len(api.batches), 1)
+        self.assertEqual(len(api.batches[0]), 1)
+        self.assertEqual(plain.result()[0]["inputPurl"], "pkg:npm/@scope/pkg@1.0.0")
+        self.assertEqual(escaped.result()[0]["inputPurl"], "pkg:npm/%40scope/pkg@1.0.0")
+
+    def test_strict_only_fails_the_affected_caller(self):
+        api = FakePurlApi(omit={"pkg:npm/gone@1"})
+        coalescer = PurlCoalescer(Purl(api), "org", max_wait_ms=60_000)
+        ok = coalescer.submit([{"purl": "pkg:npm/a@1"}], strict=True)
+        missing = coalescer.submit([{"purl": "pkg:npm/gone@1"}], strict=True)
+        coalescer.flush()
+        self.assertEqual(len(ok.result(timeout=5)), 1)
+        with self.assertRaises(APIPartialResponse):
+            missing.result(timeout=5)
+        coalescer.close()
+
+    def test_request_errors_propagate_to_every_caller(self):
+        class FailingApi:
+            def do_request(self, **kwargs):
+                raise RuntimeError("boom")
+
+        coalescer = PurlCoalescer(Purl(FailingApi()), "org", max_wait_ms=1)
+        futures = [coalescer.submit([{"purl": f"pkg:npm/p{i}@1"}]) for i in range(3)]
+        for future in futures:
+            with self.assertRaises(RuntimeError):
+                future.result(timeout=5)
+        coalescer.close()
+
+    def test_fan_out_errors_fail_every_unresolved_caller(self):
+        api = FakePurlApi()
+        coalescer = PurlCoalescer(Purl(api), "org", max_wait_ms=60_000)
+        with mock.patch.object(Purl, "_raise_on_missing", side_effect=[None, RuntimeError("boom")]):
+            first = coalescer.submit([{"purl": "pkg:npm/a@1"}], strict=True)
+            second = coalescer.submit([{"purl": "pkg:npm/b@1"}], strict=True)
+            third = coalescer.submit([{"purl": "pkg:npm/c@1"}], strict=True)
+            coalescer.close()
+        self.assertEqual(len(first.result(timeout=5)), 1)
+        for future in (second, third):
+            with self.assertRaises(RuntimeError):
+                future.result(timeout=5)
+
+    def test_rejects_components_without_purl_and_closed_use(self):
+        coalescer = PurlCoalescer(Purl(FakePurlApi()), "org")
+        with self.assertRaises(ValueError):
+            coalescer.submit([{"name": "lodash"}])
+        coalescer.close()
+        with self.assertRaises(RuntimeError):
+            coalescer.submit([{"purl": "pkg:npm/a@1"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import json
+import unittest
+from unittest.mock import Mock, patch
+
+from socketdev import socketdev
+from socketdev.exceptions import APIFailure
+from socketdev.purl import Purl
+
+
+def _streamed_response(records, status_code=200):
+    response = Mock()
+    response.status_code = status_code
+    response.text = "error"
+    response.consumed = 0
+
+    def iter_lines(decode_unicode=False):
+        for record in records:
+            response.consumed += 1
+            yield record if isinstance(record, str) else json.dumps(record)
+
+    response.iter_lines = iter_lines
+    return response
+
+
+class TestPurlIterPost(unittest.TestCase):
+    def setUp(self):
+        self.api = Mock()
+
+    def test_yields_rows_and_records_in_arrival_order(self):
+        records = [
+            {"inputPurl": "pkg:npm/a@1.0.0", "type": "npm", "name": "a", "alerts": []},
+            "",
+            "not json",
+            {"_type": "purlError", "value": {"inputPurl": "pkg:npm/bad"}},
+            {"_type": "summary", "value": {"total": 2}},
+        ]
+        self.api.do_request.return_value = _streamed_response(records)
+
+        result = list(Purl(self.api).iter_post([{"purl": "pkg:npm/a@1.0.0"}], org_slug="org", alerts=True))
+
+        self.assertEqual([r.get("_type") for r in result], [None, "purlError", "summary"])
+        kwargs = self.api.do_request.call_args[1]
+        self.assertTrue(kwargs["stream"])
+        self.assertIn("alerts=true", kwargs["path"])
+        self.api.do_request.return_value.close.assert_called_once()
+
+    def test_early_exit_stops_reading_and_closes(self):
+        malware = {"inputPurl": "pkg:npm/evil@1.0.0", "alerts": [{"type": "malware", "severity": "critical"}]}
+        records = [malware] + [{"inputPurl": f"pkg:npm/p{i}@1.0.0", "alerts": []} for i in range(100)]
+        response = _streamed_response(records)
+        self.api.do_request.return_value = response
+
+        for row in Purl(self.api).iter_post([], org_slug="org"):
+            if any(alert["type"] == "malware" for alert in row["alerts"]):
+                break
+
+        self.assertEqual(response.consumed, 1)
+        response.close.assert_called_once()
+
+    def test_incremental_dedupe(self):
+        alert = {"type": "malware", "severity": "critical", "key": "k1"}
+        records = [
+            {"inputPurl": "pkg:npm/a@1.0.0", "type": "npm", "release": "r1", "alerts": [alert]},
+            {"inputPurl": "pkg:npm/a@1.0.0", "type": "npm", "release": "r1", "alerts": [alert]},
+            {"inputPurl": "pkg:npm/a@1.0.0", "type": "npm", "release": "r2", "alerts": [alert, {"type": "other"}]},
+        ]
+        self.api.do_request.return_value = _streamed_response(records)
+
+        result = list(Purl(self.api).iter_post([], org_slug="org", dedupe=True))
+
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result[0]["purl"], "pkg:npm/a@1.0.0")
+        self.assertEqual([a["type"] for a in result[0]["alerts"]], ["malware"])
+        self.assertEqual([a["type"] for a in result[1]["alerts"]], ["other"])
+
+    def test_quote_wrapped_body_matches_post(self):
+        first = {"inputPurl": "pkg:npm/a@1.0.0", "alerts": []}
+        last = {"inputPurl": "pkg:npm/b@1.0.0", "alerts": []}
+        records = ['"' + json.dumps(first), json.dumps(last) + '"']
+        self.api.do_request.return_value = _streamed_response(records)
+
+        result = list(Purl(self.api).iter_post([], org_slug="org"))
+
+        self.assertEqual([row["inputPurl"] for row in result], ["pkg:npm/a@1.0.0", "pkg:npm/b@1.0.0"])
+
+    def test_failed_read_closes_response(self):
+        response = _streamed_response([{"inputPurl": "pkg:npm/a@1.0.0", "alerts": []}])
+        lines = response.iter_lines
+
+        def interrupted(decode_unicode=False):
+            yield from lines(decode_unicode)
+            raise ConnectionError("connection reset")
+
+        response.iter_lines = interrupted
+        self.api.do_request.return_value = response
+        with self.assertRaises(ConnectionError):
+            list(Purl(self.api).iter_post([], org_slug="org"))
+        response.close.assert_called_once()
+
+    @patch("socketdev.core.api.requests")
+    def test_http_error_closes_streamed_response(self, mock_requests):
+        response = mock_requests.request.return_value
+        response.status_code = 500
+        response.headers = {}
+        response.json.return_value = {"error": {"message": "boom"}}
+        with self.assertRaises(APIFailure):
+            list(socketdev(token="test-token").purl.iter_post([{"purl": "pkg:npm/a@1.0.0"}], org_slug="org"))
+        self.assertTrue(mock_requests.request.call_args[1]["stream"])
+        response.close.assert_called_once()
+
+    def test_error_response_yields_nothing(self):
+        self.api.do_request.return_value = _streamed_response([], status_code=500)
+        self.assertEqual(list(Purl(self.api).iter_post([], org_slug="org")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
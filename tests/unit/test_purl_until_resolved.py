@@ -0,0 +1,123 @@
+import json
+import unittest
+from unittest.mock import Mock, patch
+
+from socketdev.purl import Purl
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class PendingPurlApi:
+    """Reports each purl as pendingScan until it has been requested ``ready_after[purl]`` times."""
+
+    def __init__(self, ready_after, errors=(), fail_requests=0):
+        self.ready_after = ready_after
+        self.errors = set(errors)
+        self.fail_requests = fail_requests
+        self.seen = {}
+        self.batches = []
+        self.paths = []
+
+    def do_request(self, path, payload, method):
+        self.paths.append(path)
+        self.batches.append([c["purl"] for c in json.loads(payload)["components"]])
+        response = Mock()
+        if len(self.batches) <= self.fail_requests:
+            response.status_code = 503
+            response.text = "unavailable"
+            return response
+        lines = []
+        for purl in self.batches[-1]:
+            self.seen[purl] = self.seen.get(purl, 0) + 1
+            pending = self.seen[purl] < self.ready_after.get(purl, 1)
+            alerts = [{"type": "pendingScan", "key": "k"}] if pending else [{"type": "envVars", "severity": "low"}]
+            lines.append(json.dumps({"inputPurl": purl, "type": "npm", "name": purl, "alerts": alerts}))
+            if purl in self.errors:
+                lines.append(json.dumps({"_type": "purlError", "value": {"inputPurl": purl, "error": "slow"}}))
+        lines.append(json.dumps({"_type": "summary", "value": {"count": len(self.batches[-1])}}))
+        response.status_code = 200
+        response.text = "\n".join(lines)
+        return response
+
+
+class TestPostUntilResolved(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = patch("socketdev.purl.time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_repolls_only_pending_purls_and_merges_in_order(self):
+        api = PendingPurlApi({"b": 2, "c": 3})
+        result = Purl(api).post_until_resolved(
+            [{"purl": "a"}, {"purl": "b"}, {"purl": "c"}], org_slug="org", initial_delay_sec=1
+        )
+
+        self.assertEqual(api.batches, [["a", "b", "c"], ["b", "c"], ["c"]])
+        self.assertTrue(result.complete)
+        self.assertEqual(result.resolved_on_retry, ["b", "c"])
+        self.assertEqual(result.attempts, 3)
+        rows = [r for r in result.rows if "_type" not in r]
+        self.assertEqual([r["inputPurl"] for r in rows], ["a", "b", "c"])
+        self.assertTrue(all(r["alerts"][0]["type"] == "envVars" for r in rows))
+        self.assertTrue(all("alerts=true" in path for path in api.paths))
+
+    def test_backoff_grows_without_progress_and_respects_deadline(self):
+        api = PendingPurlApi({"slow": 100})
+        result = Purl(api).post_until_resolved(
+            [{"purl": "slow"}], org_slug="org", deadline_sec=20, initial_delay_sec=1, max_delay_sec=8, backoff=2
+        )
+
+        self.assertEqual(self.clock.sleeps, [1, 2, 4, 8, 5])
+        self.assertFalse(result.complete)
+        self.assertEqual(result.pending, ["slow"])
+        rows = [r for r in result.rows if "_type" not in r]
+        self.assertEqual(rows[0]["alerts"][0]["type"], "pendingScan")
+
+    def test_repeated_purls_are_sent_once_and_errors_reported_once(self):
+        api = PendingPurlApi({"b": 3}, errors={"b"})
+        result = Purl(api).post_until_resolved(
+            [{"purl": "a"}, {"purl": "b"}, {"purl": "b"}], org_slug="org", initial_delay_sec=1
+        )
+
+        self.assertEqual(api.batches, [["a", "b"], ["b"], ["b"]])
+        errors = [r for r in result.rows if r.get("_type") == "purlError"]
+        self.assertEqual([e["value"]["inputPurl"] for e in errors], ["b"])
+
+    def test_failed_first_request_repolls_every_purl(self):
+        api = PendingPurlApi({}, fail_requests=1)
+        result = Purl(api).post_until_resolved([{"purl": "a"}, {"purl": "b"}], org_slug="org", initial_delay_sec=1)
+
+        self.assertEqual(api.batches, [["a", "b"], ["a", "b"]])
+        self.assertTrue(result.complete)
+        self.assertEqual(result.resolved_on_retry, ["a", "b"])
+
+    def test_unanswered_purls_are_reported_pending(self):
+        api = PendingPurlApi({}, fail_requests=100)
+        result = Purl(api).post_until_resolved([{"purl": "a"}], org_slug="org", deadline_sec=5, initial_delay_sec=1)
+
+        self.assertFalse(result.complete)
+        self.assertEqual(result.pending, ["a"])
+        self.assertEqual(result.rows, [])
+
+    def test_nothing_pending_makes_one_request(self):
+        api = PendingPurlApi({})
+        result = Purl(api).post_until_resolved([{"purl": "a"}], org_slug="org")
+        self.assertEqual(len(api.batches), 1)
+        self.assertEqual(self.clock.sleeps, [])
+        self.assertEqual(result.to_dict()["pending"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+from urllib.parse import parse_qsl, urlparse
+
+from socketdev.exceptions import APIFailure
+from socketdev.repos import Repos
+
+
+class PagedRepoApi:
+    def __init__(self, total, delay=0.0, shift_after_requests=None, failures=None):
+        self.repos = [{"id": f"r{n}", "name": f"repo-{n}"} for n in range(total)]
+        # page -> number of times that page answers with an error before it succeeds
+        self.failures = dict(failures or {})
+        self.delay = delay
+        self.shift_after_requests = shift_after_requests
+        self.pages = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def do_request(self, path, **kwargs):
+        query = dict(parse_qsl(urlparse(path).query))
+        page, per_page = int(query["page"]), int(query["per_page"])
+        with self.lock:
+            self.pages.append(page)
+            if self.failures.get(page):
+                self.failures[page] -= 1
+                response = Mock(status_code=500)
+                response.json.return_value = {"error": {"message": "boom"}}
+                return response
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            if self.shift_after_requests is not None and len(self.pages) > self.shift_after_requests:
+                # A repository created mid-listing pushes everything down one slot.
+                repos = [{"id": "new", "name": "new"}] + self.repos
+            else:
+                repos = self.repos
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        results = repos[(page - 1) * per_page : page * per_page]
+        response = Mock(status_code=200)
+        response.json.return_value = {"results": results, "nextPage": page + 1 if results else 0}
+        return response
+
+
+class TestReposListAll(unittest.TestCase):
+    def test_fetches_pages_concurrently_in_order(self):
+        api = PagedRepoApi(95, delay=0.02)
+        repos = Repos(api).list_all("org", concurrency=4, per_page=10)
+        self.assertEqual([repo["id"] for repo in repos], [f"r{n}" for n in range(95)])
+        self.assertGreater(api.max_active, 1)
+        self.assertLessEqual(api.max_active, 4)
+        self.assertEqual(sorted(set(api.pages))[:10], list(range(1, 11)))
+
+    def test_single_page(self):
+        api = PagedRepoApi(3)
+        self.assertEqual(len(Repos(api).list_all("org", per_page=10)), 3)
+        self.assertEqual(api.pages, [1])
+
+    def test_exact_multiple_of_page_size(self):
+        api = PagedRepoApi(20)
+        self.assertEqual(len(Repos(api).list_all("org", concurrency=2, per_page=10)), 20)
+
+    def test_repos_shifted_between_pages_are_deduplicated(self):
+        api = PagedRepoApi(30, shift_after_requests=1)
+        repos = Repos(api).list_all("org", concurrency=1, per_page=10)
+        ids = [repo["id"] for repo in repos]
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(ids[:10], [f"r{n}" for n in range(10)])
+        self.assertIn("r29", ids)
+
+    @patch("socketdev.repos.time.sleep")
+    def test_failed_page_is_retried(self, sleep):
+        api = PagedRepoApi(35, failures={2: 1})
+        repos = Repos(api).list_all("org", concurrency=2, per_page=10)
+        self.assertEqual([repo["id"] for repo in repos], [f"r{n}" for n in range(35)])
+        self.assertEqual(api.pages.count(2), 2)
+
+    @patch("socketdev.repos.time.sleep")
+    def test_failed_intermediate_page_raises_instead_of_truncating(self, sleep):
+        api = PagedRepoApi(35, failures={2: 3})
+        with self.assertRaises(APIFailure):
+            Repos(api).list_all("org", concurrency=1, per_page=10, retries=2)
+        self.assertEqual(api.pages.count(2), 3)
+
+    @patch("socketdev.repos.time.sleep")
+    def test_error_on_first_page_raises(self, sleep):
+        api = PagedRepoApi(5, failures={1: 5})
+        with self.assertRaises(APIFailure):
+            Repos(api).list_all("org", retries=1)
+        self.assertEqual(api.pages, [1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import json
+import unittest
+from unittest.mock import Mock
+
+from socketdev.core.classes import Package
+from socketdev.sbom import Sbom
+
+
+def _artifact(package_id, ancestors=(), **extra):
+    item = {"id": package_id, "type": "npm", "name": f"pkg-{package_id}", "version": "1.0.0", "topLevelAncestors": list(ancestors)}
+    item.update(extra)
+    return item
+
+
+class TestPackage(unittest.TestCase):
+    def test_defaults_and_derived_fields(self):
+        package = Package(**_artifact("a", direct="True", url="https://example.com", customField=1))
+        self.assertIs(package.direct, True)
+        self.assertEqual(package.url, "https://socket.dev/npm/package/pkg-a/overview/1.0.0")
+        self.assertEqual(package.purl, "npm/pkg-a@1.0.0")
+        self.assertEqual(package.customField, 1)
+        self.assertEqual((package.alerts, package.size, package.transitives, package.license), ([], 0, 0, "NoLicenseFound"))
+        self.assertEqual(package.alert_counts, {"critical": 0, "high": 0, "middle": 0, "low": 0})
+        self.assertFalse(hasattr(package, "scores"))
+
+    def test_url_and_purl_are_computed_on_first_access(self):
+        package = Package(**_artifact("a"))
+        self.assertNotIn("url", vars(package))
+        self.assertEqual(package.url, "https://socket.dev/npm/package/pkg-a/overview/1.0.0")
+        self.assertIn("url", vars(package))
+        package.purl = "npm/override@2.0.0"
+        self.assertEqual(package.purl, "npm/override@2.0.0")
+
+    def test_to_dict_serializes_attributes_with_url_and_purl(self):
+        package = Package(**_artifact("a", score={"overall": 0.8}))
+        self.assertEqual(package.scores.overall, 80)
+        data = json.loads(json.dumps(package.to_dict(), default=lambda value: value.__dict__))
+        self.assertEqual(data["id"], "a")
+        self.assertEqual(data["url"], "https://socket.dev/npm/package/pkg-a/overview/1.0.0")
+        self.assertEqual(data["purl"], "npm/pkg-a@1.0.0")
+
+
+class TestCreatePackagesDict(unittest.TestCase):
+    def test_transitives_regardless_of_ancestor_order(self):
+        sbom = [
+            _artifact("child-1", ["root-b"]),
+            _artifact("root-a", ["root-a"]),
+            _artifact("child-2", ["root-a", "root-b"]),
+            _artifact("root-b", ["root-b"]),
+            _artifact("child-3", ["missing-root"]),
+        ]
+        packages = Sbom(Mock()).create_packages_dict({item["id"]: item for item in sbom})
+        self.assertEqual(packages["root-a"].transitives, 2)
+        self.assertEqual(packages["root-b"].transitives, 3)
+        self.assertEqual(packages["child-1"].transitives, 0)
+
+    def test_accepts_iterables_and_skips_duplicates(self):
+        packages = Sbom(Mock()).create_packages_dict(iter([_artifact("a"), _artifact("a", version="2.0.0")]))
+        self.assertEqual(list(packages), ["a"])
+        self.assertEqual(packages["a"].version, "1.0.0")
+
+
+class TestIterView(unittest.TestCase):
+    def test_streams_artifacts(self):
+        api = Mock()
+        response = api.do_request.return_value
+        response.status_code = 200
+        response.iter_lines.return_value = iter([json.dumps(_artifact("a")), "", json.dumps(_artifact("b"))])
+
+        items = list(Sbom(api).iter_view("report-1"))
+
+        self.assertEqual([item["id"] for item in items], ["a", "b"])
+        self.assertEqual(api.do_request.call_args[1], {"path": "sbom/view/report-1", "stream": True})
+        response.close.assert_called_once()
+
+    def test_error_yields_nothing(self):
+        api = Mock()
+        api.do_request.return_value.status_code = 500
+        self.assertEqual(list(Sbom(api).iter_view("report-1")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
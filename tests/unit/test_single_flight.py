@@ -0,0 +1,106 @@
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from socketdev import socketdev
+from socketdev.exceptions import APIFailure
+
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("socketdev.core.api.requests")
+        self.mock_requests = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.sdk = socketdev(token="test-token")
+        self.sdk.api.set_single_flight(True)
+        self.release = threading.Event()
+        self.parses = 0
+
+        def request(method, url, **kwargs):
+            self.release.wait(5)
+            response = Mock()
+            response.status_code = 200
+            response.headers = {}
+
+            def parse():
+                self.parses += 1
+                return {"organizations": {"org-1": {"slug": "org"}}}
+
+            response.json.side_effect = parse
+            return response
+
+        self.mock_requests.request.side_effect = request
+
+    def _run_concurrently(self, fn, count):
+        results = [None] * count
+        errors = [None] * count
+
+        def worker(i):
+            try:
+                results[i] = fn()
+            except Exception as error:
+                errors[i] = error
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        deadline = time.time() + 5
+        while self.sdk.api.single_flight_stats.collapsed < count - 1 and time.time() < deadline:
+            time.sleep(0.005)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        return results, errors
+
+    def test_concurrent_identical_gets_share_one_request(self):
+        results, errors = self._run_concurrently(self.sdk.org.get, 20)
+
+        self.assertEqual(errors, [None] * 20)
+        self.assertEqual(self.mock_requests.request.call_count, 1)
+        self.assertEqual(self.sdk.api.single_flight_stats.to_dict(), {"requests": 1, "collapsed": 19})
+        # Every caller parses its own copy, so mutating one result cannot leak into another.
+        self.assertEqual(self.parses, 20)
+        self.assertEqual(results, [results[0]] * 20)
+        self.assertEqual(len({id(result) for result in results}), 20)
+
+    def test_errors_are_shared(self):
+        self.mock_requests.request.side_effect = None
+        failing = Mock(status_code=500, headers={}, text="boom")
+        failing.json.side_effect = ValueError
+
+        def request(method, url, **kwargs):
+            self.release.wait(5)
+            return failing
+
+        self.mock_requests.request.side_effect = request
+        _, errors = self._run_concurrently(lambda: self.sdk.api.do_request(path="organizations"), 5)
+        self.assertTrue(all(isinstance(error, APIFailure) for error in errors))
+        self.assertEqual(self.mock_requests.request.call_count, 1)
+
+    def test_sequential_and_non_get_requests_are_not_collapsed(self):
+        self.release.set()
+        self.sdk.org.get()
+        self.sdk.org.get()
+        self.sdk.api.do_request(path="organizations", method="POST", payload="{}")
+        self.assertEqual(self.mock_requests.request.call_count, 3)
+        self.assertEqual(self.sdk.api.single_flight_stats.collapsed, 0)
+        self.assertEqual(self.parses, 2)
+
+    def test_off_by_default(self):
+        self.assertFalse(socketdev(token="test-token").api.single_flight)
+
+    def test_can_be_disabled(self):
+        self.sdk.api.set_single_flight(False)
+        threads = [threading.Thread(target=self.sdk.org.get) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.mock_requests.request.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from socketdev.core.threatindex import BloomFilter, ThreatFeedStore, ThreatIndex, package_key
+from socketdev.exceptions import APIFailure
+from socketdev.threatfeed import ThreatFeed
+
+
+def _item(threat_id, purl, updated_at="2025-01-01", removed=False, threat_type="malware"):
+    return {
+        "id": threat_id,
+        "purl": purl,
+        "threatType": threat_type,
+        "updatedAt": updated_at,
+        "removedAt": "2025-02-01" if removed else None,
+    }
+
+
+class FakeFeed:
+    """Serves pages of items keyed by page_cursor, like ThreatFeed.get_page."""
+
+    def __init__(self, pages, failing=()):
+        self.pages = pages
+        self.failing = set(failing)
+        self.calls = []
+        self.threatfeed = self
+
+    def get_page(self, org_slug=None, **params):
+        self.calls.append(params)
+        cursor = params.get("page_cursor", "start")
+        if cursor in self.failing:
+            raise APIFailure("Error getting threat feed: 500", status_code=500)
+        items, next_cursor = self.pages.get(cursor, ([], None))
+        return {"results": items, "nextPageCursor": next_cursor}
+
+
+class TestPackageKey(unittest.TestCase):
+    def test_normalizes_without_parsing(self):
+        self.assertEqual(package_key("pkg:npm/%40Scope/Name@1.0.0?x=y#sub"), "pkg:npm/@scope/name")
+        self.assertEqual(package_key("pkg:pypi/Django_Foo@3.0"), "pkg:pypi/django-foo")
+        self.assertEqual(package_key("pkg:npm/@scope/name"), "pkg:npm/@scope/name")
+
+
+class TestThreatIndex(unittest.TestCase):
+    ROWS = [
+        ("1", "pkg:npm/evil@1.0.0", "malware"),
+        ("2", "pkg:npm/%40acme/typo", "typosquat"),
+        ("3", "pkg:pypi/bad_pkg@0.1", "malware"),
+    ]
+
+    def test_matches_versions_and_versionless_threats(self):
+        index = ThreatIndex.from_rows(self.ROWS)
+        deps = [
+            "pkg:npm/evil@1.0.0",
+            "pkg:npm/evil@1.0.1",
+            "pkg:npm/lodash@4.17.21",
+            "pkg:npm/@acme/typo@9.9.9",
+            "pkg:pypi/Bad-Pkg@0.1",
+        ]
+        matches = index.check(deps)
+        self.assertEqual([m.purl for m in matches], [deps[0], deps[3], deps[4]])
+        self.assertEqual(matches[1].threat_type, "typosquat")
+        self.assertIn("pkg:npm/evil@1.0.0", index)
+        self.assertNotIn("pkg:npm/evil@2.0.0", index)
+        self.assertEqual(len(index), 3)
+
+    def test_npm_names_differing_only_in_case_do_not_match(self):
+        index = ThreatIndex.from_rows([("1", "pkg:npm/EVIL@1.0.0", "malware")])
+        self.assertEqual(index.check(["pkg:npm/evil@1.0.0"]), [])
+        self.assertEqual(len(index.check(["pkg:npm/EVIL@1.0.0"])), 1)
+
+    def test_index_confirms_candidates_through_lookup(self):
+        lookup = Mock(side_effect=lambda keys: [row for row in self.ROWS if package_key(row[1]) in keys])
+        index = ThreatIndex({package_key(row[1]) for row in self.ROWS}, lookup, bloom=True)
+        self.assertEqual([m.id for m in index.check(["pkg:npm/evil@1.0.0", "pkg:npm/safe@1.0.0"])], ["1"])
+        self.assertEqual(lookup.call_count, 1)
+        self.assertEqual(index.check(["pkg:npm/safe@1.0.0"]), [])
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        bloom = BloomFilter(1000, 0.01)
+        keys = [f"pkg:npm/p{i}" for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in keys))
+        false_positives = sum(f"pkg:npm/other{i}" in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+class TestThreatFeedStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "threat-feed.sqlite3")
+
+    def test_sync_resumes_from_stored_cursor(self):
+        sdk = FakeFeed({
+            "start": ([_item(1, "pkg:npm/evil@1.0.0"), _item(2, "pkg:npm/bad@2.0.0")], "c1"),
+            "c1": ([_item(3, "pkg:npm/worse@1.0.0")], None),
+        })
+        with ThreatFeedStore(self.path) as store:
+            first = store.sync(sdk, "org", per_page=2)
+            self.assertEqual((first.added, first.pages, first.total), (3, 2, 3))
+            self.assertEqual(store.cursor("org"), {"page_cursor": "c1"})
+            self.assertEqual(sdk.calls[0], {"sort": "updated_at", "direction": "asc", "per_page": 2})
+
+            sdk.calls.clear()
+            sdk.pages["c1"] = ([_item(3, "pkg:npm/worse@1.0.0"), _item(1, "pkg:npm/evil@1.0.0", "2025-03-01", removed=True)], "c2")
+            sdk.pages["c2"] = ([_item(4, "pkg:npm/new@1.0.0")], None)
+            second = store.sync(sdk, "org", per_page=2)
+            self.assertEqual([call.get("page_cursor") for call in sdk.calls], ["c1", "c2"])
+            self.assertEqual((second.added, second.updated, second.removed, second.total), (1, 0, 1, 3))
+
+        with ThreatFeedStore(self.path) as reopened:
+            index = reopened.index("org")
+            deps = ["pkg:npm/evil@1.0.0", "pkg:npm/bad@2.0.0", "pkg:npm/new@1.0.0", "pkg:npm/fine@1.0.0"]
+            self.assertEqual([m.purl for m in index.check(deps)], deps[1:3])
+            self.assertEqual([m.purl for m in reopened.index("org", bloom=True).check(deps)], deps[1:3])
+            self.assertEqual(reopened.index("other-org").check(deps), [])
+
+    def test_failed_page_keeps_cursor_and_max_pages_stops_early(self):
+        sdk = FakeFeed({
+            "start": ([_item(1, "pkg:npm/a@1")], "c1"),
+            "c1": ([_item(2, "pkg:npm/b@1")], "c2"),
+            "c2": ([_item(3, "pkg:npm/c@1")], None),
+        })
+        with ThreatFeedStore(self.path) as store:
+            delta = store.sync(sdk, "org", max_pages=1)
+            self.assertEqual((delta.pages, delta.total), (1, 1))
+            self.assertEqual(store.cursor("org"), {"page_cursor": "c1"})
+            sdk.pages.pop("c1")
+            store.sync(sdk, "org")
+            self.assertEqual(store.cursor("org"), {"page_cursor": "c1"})
+            full = store.sync(sdk, "org", full=True, max_pages=1)
+            self.assertEqual((full.added, full.updated), (0, 0))
+
+    def test_failed_page_raises_and_is_retried_next_sync(self):
+        sdk = FakeFeed(
+            {"start": ([_item(1, "pkg:npm/a@1")], "c1"), "c1": ([_item(2, "pkg:npm/b@1")], None)}, failing={"c1"}
+        )
+        with ThreatFeedStore(self.path) as store:
+            with self.assertRaises(APIFailure):
+                store.sync(sdk, "org")
+            self.assertEqual(store.cursor("org"), {"page_cursor": "c1"})
+            sdk.failing.clear()
+            delta = store.sync(sdk, "org")
+            self.assertEqual((delta.added, delta.total), (1, 2))
+
+    def test_get_page_raises_on_error_response(self):
+        api = Mock()
+        api.do_request.return_value.status_code = 204
+        feed = ThreatFeed(api)
+        with self.assertRaises(APIFailure) as raised:
+            feed.get_page("org", per_page=10)
+        self.assertEqual(raised.exception.status_code, 204)
+        self.assertEqual(feed.get("org"), {"results": [], "nextPage": None})
+        self.assertEqual(api.do_request.call_args_list[0][1], {"path": "orgs/org/threat-feed?per_page=10"})
+
+
+if __name__ == "__main__":
+    unittest.main()
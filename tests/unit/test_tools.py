@@ -0,0 +1,149 @@
+import glob
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from socketdev.supportedfiles import SupportedFiles
+from socketdev.tools import (
+    compile_file_patterns,
+    find_package_files,
+    iter_package_files,
+    supported_file_patterns,
+)
+from socketdev.utils import Utils
+
+
+class TestManifestDiscovery(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        for rel_path in [
+            "package.json",
+            "frontend/package.json",
+            "frontend/package-lock.json",
+            "frontend/node_modules/lodash/package.json",
+            "backend/requirements.txt",
+            "backend/dev-requirements.txt",
+            "backend/.hidden-requirements.txt",
+            "backend/build/requirements.txt",
+            "backend/src/app.py",
+            ".git/package.json",
+            "vendor/keep/package.json",
+            "vendor/drop/package.json",
+        ]:
+            path = os.path.join(self.root, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write("{}")
+        with open(os.path.join(self.root, ".gitignore"), "w") as f:
+            f.write("# build output\nbuild/\nvendor/*\n!vendor/keep\n")
+        self.patterns = ["package.json", "package-lock.json", "*requirements.txt"]
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _rel(self, paths):
+        return sorted(os.path.relpath(p, self.root).replace("\\", "/") for p in paths)
+
+    def test_compile_file_patterns_matches_names_in_any_directory(self):
+        matcher = compile_file_patterns(self.patterns)
+        self.assertTrue(matcher.match("package.json"))
+        self.assertTrue(matcher.match("a/b/dev-requirements.txt"))
+        self.assertFalse(matcher.match("a/.hidden-requirements.txt"))
+        self.assertFalse(matcher.match("a/package.json.bak"))
+
+    def test_find_package_files_matches_recursive_glob(self):
+        expected = set()
+        for pattern in self.patterns:
+            expected.update(glob.glob(f"{self.root}/**/{pattern}", recursive=True))
+        self.assertEqual(self._rel(find_package_files(self.root, self.patterns)), self._rel(expected))
+
+    @unittest.skipUnless(hasattr(os, "symlink"), "symlinks not supported")
+    def test_find_package_files_follows_symlinked_directories(self):
+        linked = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, linked)
+        with open(os.path.join(linked, "package.json"), "w") as f:
+            f.write("{}")
+        try:
+            os.symlink(linked, os.path.join(self.root, "linked"), target_is_directory=True)
+            # A link back to the root must not be walked again.
+            os.symlink(self.root, os.path.join(self.root, "backend", "loop"), target_is_directory=True)
+        except OSError:
+            self.skipTest("symlinks not permitted")
+        expected = set(glob.glob(f"{self.root}/linked/**/package.json", recursive=True))
+        found = self._rel(find_package_files(self.root, ["package.json"]))
+        self.assertEqual(expected, {os.path.join(self.root, "linked/package.json")})
+        self.assertIn("linked/package.json", found)
+        self.assertFalse([path for path in found if path.startswith("backend/loop/")])
+        self.assertNotIn("linked/package.json", self._rel(iter_package_files(self.root, ["package.json"])))
+
+    def test_iter_package_files_honors_ignore_rules(self):
+        found = self._rel(iter_package_files(self.root, self.patterns))
+        self.assertEqual(
+            found,
+            [
+                "backend/dev-requirements.txt",
+                "backend/requirements.txt",
+                "frontend/package-lock.json",
+                "frontend/package.json",
+                "package.json",
+                "vendor/keep/package.json",
+            ],
+        )
+
+    def test_iter_package_files_streams_into_lazy_loader(self):
+        send_files = Utils.load_files_for_sending_lazy(
+            iter_package_files(self.root, ["package.json"]), workspace=self.root
+        )
+        keys = sorted(key for key, _ in send_files)
+        self.assertEqual(keys, ["frontend/package.json", "package.json", "vendor/keep/package.json"])
+
+    def test_supported_file_patterns(self):
+        supported = {
+            "npm": {"packagejson": {"pattern": "package.json"}, "packagelockjson": {"pattern": "package-lock.json"}},
+            "pypi": {"requirements": {"pattern": "*requirements.txt"}, "pipfile": {"pattern": "package.json"}},
+        }
+        self.assertEqual(supported_file_patterns(supported), self.patterns)
+
+
+class TestSupportedFilesCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.api = Mock()
+        self.api.api_url = "https://api.socket.dev/v0"
+        response = Mock()
+        response.status_code = 200
+        response.json.return_value = {"npm": {"packagejson": {"pattern": "package.json"}}}
+        self.api.do_request.return_value = response
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_cached_response_is_reused(self):
+        supported_files = SupportedFiles(self.api)
+        first = supported_files.get("org", cache_ttl=3600, cache_dir=self.cache_dir)
+        second = supported_files.get("org", cache_ttl=3600, cache_dir=self.cache_dir)
+        self.assertEqual(first, second)
+        self.assertEqual(self.api.do_request.call_count, 1)
+
+    def test_no_cache_by_default(self):
+        supported_files = SupportedFiles(self.api)
+        supported_files.get("org")
+        supported_files.get("org")
+        self.assertEqual(self.api.do_request.call_count, 2)
+
+    def test_expired_cache_is_refreshed(self):
+        supported_files = SupportedFiles(self.api)
+        supported_files.get("org", cache_ttl=3600, cache_dir=self.cache_dir)
+        cache_file = os.path.join(self.cache_dir, "supported-files", os.listdir(os.path.join(self.cache_dir, "supported-files"))[0])
+        os.utime(cache_file, (0, 0))
+        with open(cache_file) as f:
+            self.assertEqual(json.load(f), {"npm": {"packagejson": {"pattern": "package.json"}}})
+        supported_files.get("org", cache_ttl=3600, cache_dir=self.cache_dir)
+        self.assertEqual(self.api.do_request.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
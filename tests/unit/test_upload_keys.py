@@ -0,0 +1,117 @@
+import random
+import unittest
+
+from socketdev.utils import UploadKeyBuilder
+
+
+def reference_key(file_path, workspace=None, base_path=None, base_paths=None):
+    """The per-file key logic UploadKeyBuilder replaced, kept verbatim as an oracle."""
+    if "\\" in file_path:
+        file_path = file_path.replace("\\", "/")
+    if workspace and "\\" in workspace:
+        workspace = workspace.replace("\\", "/")
+    if base_path and "\\" in base_path:
+        base_path = base_path.replace("\\", "/")
+    if base_paths:
+        base_paths = [bp.replace("\\", "/") if "\\" in bp else bp for bp in base_paths]
+
+    key = file_path
+    path_stripped = False
+
+    if base_paths:
+        for bp in base_paths:
+            normalized_base_path = bp.rstrip("/") + "/" if not bp.endswith("/") else bp
+            if key.startswith(normalized_base_path):
+                key = key[len(normalized_base_path):]
+                path_stripped = True
+                break
+            elif key.startswith(bp.rstrip("/")):
+                stripped_base = bp.rstrip("/")
+                if key.startswith(stripped_base + "/") or key == stripped_base:
+                    key = key[len(stripped_base):]
+                    key = key.lstrip("/")
+                    path_stripped = True
+                    break
+    elif base_path:
+        normalized_base_path = base_path.rstrip("/") + "/" if not base_path.endswith("/") else base_path
+        if key.startswith(normalized_base_path):
+            key = key[len(normalized_base_path):]
+            path_stripped = True
+        elif key.startswith(base_path.rstrip("/")):
+            stripped_base = base_path.rstrip("/")
+            if key.startswith(stripped_base + "/") or key == stripped_base:
+                key = key[len(stripped_base):]
+                key = key.lstrip("/")
+                path_stripped = True
+
+    if not path_stripped and workspace and file_path.startswith(workspace):
+        key = file_path[len(workspace):]
+        while key.startswith("/"):
+            key = key[1:]
+        path_stripped = True
+
+    while key.startswith("./"):
+        key = key[2:]
+    while key.startswith("../"):
+        key = key[3:]
+    while key.startswith("/"):
+        key = key[1:]
+
+    if len(key) > 2 and key[1] == ':' and (key[2] == '/' or key[2] == '\\'):
+        key = key[2:]
+        while key.startswith("/"):
+            key = key[1:]
+
+    return key
+
+
+class TestUploadKeyBuilder(unittest.TestCase):
+    def test_strips_first_matching_base_path_in_list_order(self):
+        builder = UploadKeyBuilder(base_paths=["/project", "/project/frontend"])
+        self.assertEqual(builder.key("/project/frontend/package.json"), "frontend/package.json")
+        builder = UploadKeyBuilder(base_paths=["/project/frontend", "/project"])
+        self.assertEqual(builder.key("/project/frontend/package.json"), "package.json")
+
+    def test_base_path_must_end_on_segment_boundary(self):
+        builder = UploadKeyBuilder(base_path="/project")
+        self.assertEqual(builder.key("/projects/package.json"), "projects/package.json")
+
+    def test_workspace_fallback_and_windows_paths(self):
+        builder = UploadKeyBuilder(workspace="C:\\work", base_paths=["C:\\other"])
+        self.assertEqual(builder.key("C:\\work\\app\\package.json"), "app/package.json")
+        self.assertEqual(UploadKeyBuilder().key("C:/app/package.json"), "app/package.json")
+
+    def test_bulk_keys(self):
+        builder = UploadKeyBuilder(base_path="/repo")
+        self.assertEqual(builder.keys(["/repo/a/package.json", "./b/package.json"]), ["a/package.json", "b/package.json"])
+
+    def test_matches_reference_implementation(self):
+        rng = random.Random(1234)
+        segments = ["", ".", "..", "repo", "repos", "app", "web", "C:", "a b", "pkg"]
+        separators = ["/", "//", "\\"]
+
+        def random_path(max_depth):
+            parts = [rng.choice(segments) for _ in range(rng.randint(0, max_depth))]
+            path = ""
+            for part in parts:
+                path += part + rng.choice(separators)
+            if rng.random() < 0.3:
+                path = path.rstrip("/\\")
+            return path
+
+        for _ in range(1000):
+            base_paths = [random_path(3) for _ in range(rng.randint(0, 4))] or None
+            base_path = random_path(3) if rng.random() < 0.5 else None
+            workspace = random_path(3) if rng.random() < 0.5 else None
+            builder = UploadKeyBuilder(workspace=workspace, base_path=base_path, base_paths=base_paths)
+            for _ in range(10):
+                file_path = random_path(5) + rng.choice(["package.json", "", "requirements.txt"])
+                self.assertEqual(
+                    builder.key(file_path),
+                    reference_key(file_path, workspace, base_path, base_paths),
+                    msg=f"file_path={file_path!r} workspace={workspace!r} base_path={base_path!r} base_paths={base_paths!r}",
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
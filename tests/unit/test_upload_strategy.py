@@ -0,0 +1,91 @@
+import os
+import random
+import shutil
+import tarfile
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from socketdev.fullscans import FullScanParams, FullScans
+
+
+class TestUploadStrategy(unittest.TestCase):
+    def setUp(self):
+        self.workspace = tempfile.mkdtemp()
+        self.api = Mock()
+        response = Mock()
+        response.status_code = 201
+        response.json.return_value = {"id": "scan-id"}
+        self.api.do_request.return_value = response
+        self.fullscans = FullScans(self.api)
+        self.params = FullScanParams(repo="repo", org_slug="org")
+
+    def tearDown(self):
+        shutil.rmtree(self.workspace)
+
+    def _write(self, rel_path, content: bytes):
+        path = os.path.join(self.workspace, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_many_compressible_files_prefer_archive(self):
+        lock = b'{"name": "pkg", "version": "1.0.0", "resolved": "https://registry.npmjs.org/pkg"}\n' * 2000
+        files = [self._write(f"pkg{i}/package-lock.json", lock) for i in range(200)]
+        decision = self.fullscans.choose_upload_strategy(files)
+        self.assertEqual(decision.strategy, "archive")
+        self.assertEqual(decision.file_count, 200)
+        self.assertEqual(decision.total_bytes, 200 * len(lock))
+        self.assertLess(decision.compression_ratio, 0.2)
+
+    def test_single_incompressible_file_prefers_post(self):
+        rng = random.Random(0)
+        path = self._write("package.json", bytes(rng.getrandbits(8) for _ in range(4096)))
+        decision = self.fullscans.choose_upload_strategy([path])
+        self.assertEqual(decision.strategy, "post")
+        self.assertGreater(decision.compression_ratio, 0.9)
+
+    def test_submit_dispatches_to_archive(self):
+        lock = b'{"name": "pkg"}\n' * 5000
+        files = [self._write(f"pkg{i}/package-lock.json", lock) for i in range(50)]
+        result, decision = self.fullscans.submit(files, self.params, workspace=self.workspace)
+        self.assertEqual(result, {"id": "scan-id"})
+        self.assertEqual(decision.strategy, "archive")
+        self.assertIn("/full-scans/archive?", self.api.do_request.call_args[1]["path"])
+        self.assertGreaterEqual(decision.upload_seconds, 0)
+
+    def test_submit_respects_forced_strategy(self):
+        files = [self._write("package.json", b"{}")]
+        result, decision = self.fullscans.submit(files, self.params, workspace=self.workspace, strategy="post")
+        self.assertEqual(decision.strategy, "post")
+        self.assertNotIn("/archive", self.api.do_request.call_args[1]["path"])
+        key = self.api.do_request.call_args[1]["files"][0][0]
+        self.assertEqual(key, "package.json")
+
+    def test_both_strategies_send_the_same_query_and_names(self):
+        files = [self._write("services/api/package.json", b"{}"), self._write("services/web/package.json", b"{}")]
+        base_paths = [os.path.join(self.workspace, "services")]
+        uploads = {}
+        for strategy in ("post", "archive"):
+            self.fullscans.submit(files, self.params, workspace=self.workspace, strategy=strategy, base_paths=base_paths)
+            call = self.api.do_request.call_args[1]
+            if strategy == "post":
+                names = [key for key, _ in call["files"]]
+            else:
+                with tarfile.open(fileobj=call["files"][0][1][1], mode="r:gz") as tar:
+                    names = tar.getnames()
+            uploads[strategy] = (call["path"].split("?", 1)[1], sorted(names))
+        self.assertEqual(uploads["post"], uploads["archive"])
+        query, names = uploads["archive"]
+        self.assertEqual(names, ["api/package.json", "web/package.json"])
+        self.assertNotIn("pull_request=", query)
+        self.assertNotIn("workspace=", query)
+
+    def test_submit_rejects_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            self.fullscans.submit([], self.params, strategy="zip")
+
+
+if __name__ == "__main__":
+    unittest.main()
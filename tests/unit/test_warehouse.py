@@ -0,0 +1,111 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from socketdev.core.warehouse import ScanWarehouse
+
+
+def _artifact(artifact_id, name, version, alerts=(), license="MIT", direct=False, manifest="package-lock.json"):
+    return {
+        "id": artifact_id,
+        "type": "npm",
+        "name": name,
+        "version": version,
+        "license": license,
+        "direct": direct,
+        "manifestFiles": [{"file": manifest, "start": 1, "end": 2}],
+        "alerts": [
+            {"key": f"{artifact_id}-{kind}", "type": kind, "severity": severity, "category": "vulnerability", "action": "error", "props": {"cveId": "CVE-1"}}
+            for kind, severity in alerts
+        ],
+    }
+
+
+class TestScanWarehouse(unittest.TestCase):
+    def setUp(self):
+        self.warehouse = ScanWarehouse(":memory:")
+        self.addCleanup(self.warehouse.close)
+        lodash_old = _artifact("1", "lodash", "4.17.20", alerts=[("criticalCVE", "critical")], direct=True)
+        lodash_new = _artifact("2", "lodash", "4.17.21")
+        express = _artifact("3", "express", "4.0.0", alerts=[("envVars", "low")], license="MIT OR Apache-2.0")
+        self.warehouse.ingest("org", "scan-a1", [lodash_old, express], repo="repo-a", branch="main")
+        self.warehouse.ingest("org", "scan-b1", {"1": lodash_old}, repo="repo-b")
+        self.warehouse.ingest("org", "scan-a2", [lodash_new, express], repo="repo-a", branch="main")
+
+    def test_repos_using_package_in_latest_scans(self):
+        rows = self.warehouse.repos_using("lodash", "4.17.20")
+        self.assertEqual([(row["repo"], row["scan_id"], row["direct"]) for row in rows], [("repo-b", "scan-b1", 1)])
+        self.assertEqual(len(self.warehouse.repos_using("lodash", "4.17.20", latest_only=False)), 2)
+        self.assertEqual([row["repo"] for row in self.warehouse.repos_using("pkg:npm/express@4.0.0")], ["repo-a"])
+        self.assertEqual([row["version"] for row in self.warehouse.repos_using("lodash", type="npm")], ["4.17.21", "4.17.20"])
+
+    def test_repos_using_purl_matches_canonical_form(self):
+        scoped = dict(_artifact("4", "core", "7.0.0"), namespace="@babel")
+        django = dict(_artifact("5", "Django_Filter", "2.0"), type="pypi", release="r1")
+        self.warehouse.ingest("org", "scan-c1", [scoped, django], repo="repo-c")
+        for purl in ("pkg:npm/@babel/core@7.0.0", "pkg:NPM/%40babel/core@7.0.0", "pkg:pypi/django-filter@2.0?release=r1"):
+            with self.subTest(purl=purl):
+                self.assertEqual([row["repo"] for row in self.warehouse.repos_using(purl)], ["repo-c"])
+
+    def test_alert_queries(self):
+        critical = self.warehouse.alerts(severity="critical")
+        self.assertEqual([(row["repo"], row["purl"], row["props"]) for row in critical], [("repo-b", "pkg:npm/lodash@4.17.20", {"cveId": "CVE-1"})])
+        self.assertEqual(len(self.warehouse.alerts(severity="critical", latest_only=False)), 2)
+        self.assertEqual([row["type"] for row in self.warehouse.alerts(repo="repo-a")], ["envVars"])
+        self.assertEqual(len(self.warehouse.alerts(latest_only=False, limit=1)), 1)
+
+    def test_scan_packages_and_reingest(self):
+        packages = self.warehouse.scan_packages("scan-a2")
+        self.assertEqual([(p["purl"], p["license"], p["manifestFiles"]) for p in packages], [
+            ("pkg:npm/express@4.0.0", "MIT OR Apache-2.0", ["package-lock.json"]),
+            ("pkg:npm/lodash@4.17.21", "MIT", ["package-lock.json"]),
+        ])
+        self.assertEqual(self.warehouse.ingest("org", "scan-a2", [_artifact("3", "express", "4.0.0")], repo="repo-a"), 1)
+        self.assertEqual(len(self.warehouse.scan_packages("scan-a2")), 1)
+        self.assertEqual(self.warehouse.query("SELECT COUNT(*) AS n FROM manifest_refs WHERE scan_id = ?", ("scan-a2",)), [{"n": 1}])
+        self.warehouse.delete_scan("scan-b1")
+        self.assertEqual(self.warehouse.repos_using("lodash", "4.17.20"), [])
+        self.assertEqual(self.warehouse.query("SELECT COUNT(*) AS n FROM alerts WHERE scan_id = 'scan-b1'"), [{"n": 0}])
+
+    def test_ingest_from_api(self):
+        class FakeSdk:
+            def __init__(self):
+                self.fullscans = self
+
+            def metadata(self, org_slug, scan_id):
+                return {"repo": "repo-c", "branch": "dev", "commit_hash": "abc"}
+
+            def stream(self, org_slug, scan_id):
+                if scan_id == "broken":
+                    return {}
+                return {"9": _artifact("9", "react", "18.0.0")}
+
+        counts = self.warehouse.ingest_from_api(FakeSdk(), "org", ["scan-c1", "broken"])
+        self.assertEqual(counts, {"scan-c1": 1})
+        self.assertEqual(self.warehouse.query("SELECT repo, branch, commit_hash FROM scans WHERE scan_id = 'scan-c1'"), [
+            {"repo": "repo-c", "branch": "dev", "commit_hash": "abc"}
+        ])
+
+    def test_query_rejects_writes(self):
+        for sql in ("DELETE FROM alerts", "DROP TABLE scans"):
+            with self.subTest(sql=sql):
+                with self.assertRaises(sqlite3.OperationalError):
+                    self.warehouse.query(sql)
+        self.assertEqual(self.warehouse.query("SELECT COUNT(*) AS n FROM scans"), [{"n": 3}])
+        self.warehouse.ingest("org", "scan-c1", [_artifact("4", "chalk", "5.0.0")], repo="repo-c")
+        self.assertEqual(self.warehouse.query("SELECT COUNT(*) AS n FROM scans"), [{"n": 4}])
+
+    def test_unknown_schema_version_is_rejected(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "warehouse.sqlite3")
+            ScanWarehouse(path).close()
+            conn = sqlite3.connect(path)
+            conn.execute("PRAGMA user_version=99")
+            conn.close()
+            with self.assertRaises(ValueError):
+                ScanWarehouse(path)
+
+
+if __name__ == "__main__":
+    unittest.main()